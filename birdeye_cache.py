@@ -0,0 +1,233 @@
+# birdeye_cache.py - Kali Intelligence: Shared TTL Cache for Birdeye Responses
+import asyncio
+import threading
+import time
+from collections import Counter, OrderedDict
+import requests
+from termcolor import cprint
+import dontshare as d
+from config import *
+
+BIRDEYE_API_URL = "https://public-api.birdeye.so"
+
+
+class _InFlight:
+    """One outstanding sync fetch that other threads can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _AsyncInFlight:
+    """One outstanding async fetch and how many coroutines are awaiting it"""
+
+    def __init__(self, future):
+        self.future = future
+        self.waiters = 0
+
+
+class BirdeyeCache:
+    """
+    Process-wide response cache keyed by (endpoint, mint).
+
+    - Per-endpoint TTLs (prices go stale in seconds, security flags don't)
+    - Size-bounded LRU eviction
+    - In-flight coalescing: concurrent callers for the same key share one
+      request, both from threads (requests) and coroutines (aiohttp)
+    - Hit / miss / coalesced counters per endpoint
+    """
+
+    def __init__(self, max_entries=BIRDEYE_CACHE_MAX_ENTRIES, ttls=BIRDEYE_CACHE_TTLS, default_ttl=BIRDEYE_CACHE_DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttls = dict(ttls)
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # (endpoint, mint) -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> _InFlight
+        self._async_inflight = {}  # key -> _AsyncInFlight
+        self.hits = Counter()
+        self.misses = Counter()
+        self.coalesced = Counter()
+        self.evictions = 0
+
+    def _lookup(self, key, now):
+        """Fresh cached value or None (caller holds the lock)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, value, now):
+        """Insert with the endpoint's TTL, evicting least recently used (caller holds the lock)"""
+        ttl = self.ttls.get(key[0], self.default_ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_fetch(self, endpoint, mint, fetch, cacheable=None):
+        """
+        Blocking: return the cached value or call fetch() once for all
+        concurrent callers. Values failing cacheable(value) are returned but
+        not stored (e.g. error responses).
+        """
+        key = (endpoint, mint)
+        with self._lock:
+            entry = self._lookup(key, time.time())
+            if entry is not None:
+                self.hits[endpoint] += 1
+                return entry[1]
+            waiting = self._inflight.get(key)
+            if waiting is None:
+                waiting = self._inflight[key] = _InFlight()
+                leader = True
+                self.misses[endpoint] += 1
+            else:
+                leader = False
+                self.coalesced[endpoint] += 1
+
+        if not leader:
+            if not waiting.done.wait(BIRDEYE_CACHE_WAIT_TIMEOUT):
+                # Leader is stuck past the timeout - fetch on our own rather than return nothing
+                cprint(f"⚠️ Kali Intelligence: Birdeye {endpoint} for {str(mint)[-6:]} still in flight after "
+                       f"{BIRDEYE_CACHE_WAIT_TIMEOUT}s, fetching directly", 'yellow')
+                value = fetch()
+                if cacheable is None or cacheable(value):
+                    with self._lock:
+                        self._store(key, value, time.time())
+                return value
+            if waiting.error is not None:
+                raise waiting.error
+            return waiting.value
+
+        try:
+            waiting.value = fetch()
+            if cacheable is None or cacheable(waiting.value):
+                with self._lock:
+                    self._store(key, waiting.value, time.time())
+            return waiting.value
+        except Exception as e:
+            waiting.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiting.done.set()
+
+    async def get_or_fetch_async(self, endpoint, mint, fetch, cacheable=None):
+        """
+        Async variant: fetch is a coroutine function, concurrent awaiters
+        share one task. The result is cached when the task finishes, even if
+        every awaiter has gone; the task is cancelled once the last awaiter
+        is cancelled, so no fetch keeps retrying without an owner.
+        """
+        key = (endpoint, mint)
+        with self._lock:
+            entry = self._lookup(key, time.time())
+            if entry is not None:
+                self.hits[endpoint] += 1
+                return entry[1]
+            flight = self._async_inflight.get(key)
+            if flight is not None and flight.future.get_loop() is asyncio.get_running_loop():
+                self.coalesced[endpoint] += 1
+            else:
+                self.misses[endpoint] += 1
+                flight = self._async_inflight[key] = _AsyncInFlight(asyncio.ensure_future(fetch()))
+                flight.future.add_done_callback(lambda future: self._finish_async(key, flight, cacheable))
+            flight.waiters += 1
+
+        try:
+            return await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                flight.future.cancel()
+            raise
+
+    def _finish_async(self, key, flight, cacheable):
+        """Done callback of a shared async fetch: drop the in-flight entry, cache a good result"""
+        with self._lock:
+            if self._async_inflight.get(key) is flight:
+                del self._async_inflight[key]
+            future = flight.future
+            if future.cancelled() or future.exception() is not None:
+                return
+            value = future.result()
+            if cacheable is None or cacheable(value):
+                self._store(key, value, time.time())
+
+    def invalidate(self, endpoint, mint):
+        with self._lock:
+            self._entries.pop((endpoint, mint), None)
+
+    def stats(self):
+        """Per-endpoint hits / misses / coalesced and overall hit rate"""
+        endpoints = set(self.hits) | set(self.misses) | set(self.coalesced)
+        hits = sum(self.hits.values()) + sum(self.coalesced.values())
+        lookups = hits + sum(self.misses.values())
+        return {
+            'entries': len(self._entries),
+            'evictions': self.evictions,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'endpoints': {
+                endpoint: {
+                    'hits': self.hits[endpoint],
+                    'misses': self.misses[endpoint],
+                    'coalesced': self.coalesced[endpoint]
+                }
+                for endpoint in sorted(endpoints)
+            }
+        }
+
+    def summary(self):
+        """One-line hit-rate report for the console"""
+        s = self.stats()
+        saved = sum(e['hits'] + e['coalesced'] for e in s['endpoints'].values())
+        sent = sum(e['misses'] for e in s['endpoints'].values())
+        return f"Birdeye cache: {s['hit_rate']:.1%} hit rate ({saved} calls saved, {sent} sent, {s['entries']} entries)"
+
+
+# Shared cache for the whole process
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_birdeye_cache():
+    """Return the process-wide BirdeyeCache"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = BirdeyeCache()
+    return _shared_cache
+
+
+def _is_ok(response):
+    return response[0] == 200
+
+def birdeye_get(endpoint, address, timeout=10):
+    """
+    Cached blocking GET /defi/<endpoint>?address=<address>.
+    Returns (status_code, json_body); only 200 responses are cached.
+    """
+    def fetch():
+        response = requests.get(
+            f"{BIRDEYE_API_URL}/defi/{endpoint}",
+            params={"address": address},
+            headers={"X-API-KEY": d.birdeye},
+            timeout=timeout
+        )
+        body = response.json() if response.status_code == 200 else None
+        return response.status_code, body
+
+    if not BIRDEYE_CACHE_ENABLED:
+        return fetch()
+    return get_birdeye_cache().get_or_fetch(endpoint, address, fetch, cacheable=_is_ok)
@@ -0,0 +1,146 @@
+# birdeye_client.py - Kali Intelligence: Pooled Async Birdeye Client
+import asyncio
+import aiohttp
+from termcolor import cprint
+import dontshare as d
+from config import *
+from birdeye_cache import BIRDEYE_API_URL, get_birdeye_cache
+
+# Codes Birdeye returns while a very new token is not indexed yet - worth retrying
+RETRYABLE_STATUSES = (555, 404, 500, 502, 503)
+
+
+class BirdeyeFetchError(Exception):
+    """Failed Birdeye fetch; retryable means the token is probably just not indexed yet"""
+
+    def __init__(self, message, status=None, retryable=False):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+
+class AsyncBirdeyeClient:
+    """
+    Non-blocking Birdeye client on one pooled aiohttp session, so several
+    endpoints can be fetched for a token at the same time without stalling
+    the event loop. An optional limiter (anything with `async acquire()`,
+    e.g. scan_engine.TokenBucket) is awaited before every request sent.
+    """
+
+    def __init__(self, api_key=None, max_connections=BIRDEYE_MAX_CONNECTIONS, timeout=BIRDEYE_REQUEST_TIMEOUT, limiter=None):
+        self.api_key = api_key or d.birdeye
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.limiter = limiter
+        self._session = None
+        self._loop = None
+
+    async def _get_session(self):
+        """Create the pooled session lazily, once per event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"X-API-KEY": self.api_key},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+        return self._session
+
+    async def get(self, endpoint, address, label=None, max_retries=BIRDEYE_VETTING_MAX_RETRIES, retry_delay=BIRDEYE_VETTING_RETRY_DELAY, trace=None):
+        """
+        GET /defi/<endpoint>?address=<address> through the shared response
+        cache, retrying with backoff while the token is not indexed yet.
+        Returns (data, None) on success or (None, BirdeyeFetchError) on failure.
+        trace, if given, is a dict filled with the attempts made and the last
+        status (attempts stays 0 when the cache answered).
+        """
+        label = label or endpoint
+        if trace is not None:
+            trace['attempts'] = 0
+
+        async def fetch():
+            return await self._get_with_retries(endpoint, address, label, max_retries, retry_delay, trace)
+
+        if BIRDEYE_CACHE_ENABLED:
+            status, body = await get_birdeye_cache().get_or_fetch_async(endpoint, address, fetch, cacheable=lambda r: r[0] == 200)
+        else:
+            status, body = await fetch()
+
+        if status == 200:
+            return (body or {}).get('data') or {}, None
+        return None, body
+
+    async def _get_with_retries(self, endpoint, address, label, max_retries, retry_delay, trace=None):
+        """(200, json_body) on success, (status, BirdeyeFetchError) otherwise"""
+        session = await self._get_session()
+        url = f"{BIRDEYE_API_URL}/defi/{endpoint}"
+        status = None
+
+        for attempt in range(max_retries):
+            last_attempt = attempt == max_retries - 1
+            if trace is not None:
+                trace['attempts'] = attempt + 1
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            try:
+                async with session.get(url, params={"address": address}) as response:
+                    status = response.status
+                    if trace is not None:
+                        trace['status'] = status
+                    if status == 200:
+                        return status, await response.json(content_type=None)
+
+                if status not in RETRYABLE_STATUSES:
+                    # Rate limit, auth, etc. - fail immediately
+                    return status, BirdeyeFetchError(f"Birdeye {label} API error (Code: {status})", status)
+                if last_attempt:
+                    return status, BirdeyeFetchError(f"Birdeye {label} API error after {max_retries} attempts (Code: {status})", status, retryable=True)
+                cprint(f"   ⏳ {label.capitalize()} data not ready (Code: {status}), retrying in {retry_delay:.1f}s... (attempt {attempt + 1})", 'yellow')
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    return status, BirdeyeFetchError(f"Network error during {label} check after {max_retries} attempts: {e}", status, retryable=True)
+                cprint(f"   ⏳ Network error on {label}, retrying in {retry_delay:.1f}s... (attempt {attempt + 1}): {e}", 'yellow')
+
+            await asyncio.sleep(retry_delay)
+            retry_delay *= 1.5  # Exponential backoff
+
+        return status, BirdeyeFetchError(f"Birdeye {label} API error", status)
+
+    async def token_security(self, address, max_retries=BIRDEYE_VETTING_MAX_RETRIES, trace=None):
+        return await self.get("token_security", address, label="security", max_retries=max_retries, trace=trace)
+
+    async def token_overview(self, address, max_retries=BIRDEYE_VETTING_MAX_RETRIES, trace=None):
+        return await self.get("token_overview", address, label="overview", max_retries=max_retries, trace=trace)
+
+    async def close(self):
+        """Close the pooled session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+# Shared client for the whole speed engine process
+_shared_client = None
+
+def get_birdeye_client():
+    """Return the process-wide AsyncBirdeyeClient"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncBirdeyeClient()
+    return _shared_client
+
+async def close_birdeye_client():
+    """Close the process-wide AsyncBirdeyeClient if it was opened"""
+    if _shared_client is not None:
+        try:
+            await _shared_client.close()
+        except Exception as e:
+            cprint(f"⚠️ Kali Intelligence: Error closing Birdeye client: {e}", 'yellow')
@@ -0,0 +1,113 @@
+# candle_store.py - Kali Intelligence: Local Append-Only Candle Store
+import os
+import threading
+import numpy as np
+from termcolor import cprint
+from config import *
+
+# One candle per record, little-endian float64, written back to back:
+# CANDLE_STORE_DIR/<timeframe>/<mint>.bin
+CANDLE_DTYPE = np.dtype([('t', '<f8'), ('o', '<f8'), ('h', '<f8'), ('l', '<f8'), ('c', '<f8'), ('v', '<f8')])
+_EMPTY = np.zeros(0, dtype=CANDLE_DTYPE)
+
+
+def to_candles(items):
+    """Birdeye /defi/ohlcv items -> candle records sorted by time"""
+    candles = np.array(
+        [(item['unixTime'], item['o'], item['h'], item['l'], item['c'], item['v']) for item in items],
+        dtype=CANDLE_DTYPE
+    )
+    return np.sort(candles, order='t')
+
+
+class CandleStore:
+    """
+    OHLCV history per (mint, timeframe) on local disk, so repeat lookups
+    only ask Birdeye for bars after the last stored one.
+
+    Files only grow: new bars are appended and the last stored bar (the one
+    still forming when it was fetched) is rewritten in place when Birdeye
+    returns it again. read() memory-maps the file read-only, so column
+    access like candles['c'] is a view of the page cache, not a copy.
+    """
+
+    def __init__(self, root=CANDLE_STORE_DIR, timeframe=TIMEFRAME):
+        self.root = root
+        self.timeframe = timeframe
+        self._lock = threading.Lock()
+        self.appended = 0
+        self.rewritten = 0
+
+    def path(self, mint):
+        return os.path.join(self.root, self.timeframe, f"{mint}.bin")
+
+    def _count(self, path):
+        # Ignores a partial trailing record left by an interrupted write
+        try:
+            return os.path.getsize(path) // CANDLE_DTYPE.itemsize
+        except OSError:
+            return 0
+
+    def read(self, mint, since=None):
+        """Stored candles (read-only memmap), optionally only those at or after `since`"""
+        path = self.path(mint)
+        count = self._count(path)
+        if count == 0:
+            return _EMPTY
+        candles = np.memmap(path, dtype=CANDLE_DTYPE, mode='r', shape=(count,))
+        if since is not None:
+            candles = candles[np.searchsorted(candles['t'], since):]
+        return candles
+
+    def last_time(self, mint):
+        """Unix time of the newest stored candle, or None"""
+        candles = self.read(mint)
+        return float(candles['t'][-1]) if len(candles) else None
+
+    def append(self, mint, candles):
+        """Merge fetched candles (sorted by time); returns how many new bars were stored"""
+        if len(candles) == 0:
+            return 0
+        path = self.path(mint)
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                count = self._count(path)
+                last = self.read(mint)['t'][-1] if count else None
+                with open(path, 'r+b' if count else 'wb') as f:
+                    if last is not None:
+                        # Refresh the bar that was still open at the last fetch
+                        same = candles[candles['t'] == last]
+                        if len(same):
+                            f.seek((count - 1) * CANDLE_DTYPE.itemsize)
+                            f.write(same[-1:].tobytes())
+                            self.rewritten += 1
+                        candles = candles[candles['t'] > last]
+                    f.seek(count * CANDLE_DTYPE.itemsize)
+                    f.truncate()
+                    f.write(candles.tobytes())
+                self.appended += len(candles)
+            return len(candles)
+        except OSError as e:
+            cprint(f"⚠️ Kali Intelligence: Could not store candles for {mint[-6:]}: {e}", 'yellow')
+            return 0
+
+    def stats(self):
+        return {
+            'appended_bars': self.appended,
+            'rewritten_bars': self.rewritten
+        }
+
+
+# Shared store for the whole process
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_candle_store():
+    """Return the process-wide CandleStore"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = CandleStore()
+    return _shared_store
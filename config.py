@@ -57,10 +57,142 @@ SPEED_ENGINE_PRIORITY_FEE = 50000  # Higher priority fee for ultra-fast executio
 SPEED_ENGINE_SLIPPAGE = 3000  # 30% slippage for highly volatile new tokens (enhanced for 0x1788 error prevention)
 SPEED_ENGINE_TIMEOUT = 5  # Request timeout in seconds
 ENABLE_SPEED_ENGINE_LOGGING = True  # Log speed engine snipes to file
+SPEED_ENGINE_RPC_MAX_CONNECTIONS = 32  # Keep-alive connection pool size for the async RPC client
+SPEED_ENGINE_RPC_TIMEOUT = 15  # Per-request timeout for async RPC calls (seconds)
+
+# Dedup index for pool signatures and base mints (kept in memory, snapshotted to disk)
+DEDUP_STATE_FILE = './data/dedup_index.json'
+DEDUP_MAX_ENTRIES = 50000  # Max signatures / mints remembered (oldest evicted first)
+DEDUP_TTL_SECONDS = 6 * 3600  # Forget entries after 6 hours
+DEDUP_FLUSH_INTERVAL = 30  # Seconds between background snapshots
+
+# Bounded worker pool for new-pool pipelines (vetting + buy)
+SPEED_ENGINE_WORKERS = 8  # Pools processed concurrently
+SPEED_ENGINE_QUEUE_MAX = 64  # Max waiting events; the oldest is dropped when full
+SPEED_ENGINE_EVENT_MAX_AGE = 30  # Seconds after detection before an event is shed as stale
+
+# Extra websocket endpoints subscribed alongside the Helius URL (first arrival wins)
+# e.g. ['wss://api.mainnet-beta.solana.com', 'wss://your-other-provider/...']
+SPEED_ENGINE_EXTRA_WSS_URLS = []
+FAN_IN_TRACK_WINDOW = 4096  # Recent signatures remembered for per-endpoint race stats
+
+# Record & replay of the raw websocket stream (python raydium_listener.py --record / --replay)
+SPEED_ENGINE_RECORD_STREAM = False  # Always record when running the live listener
+SPEED_ENGINE_RECORD_FILE = './data/raydium_stream.rec'
+REPLAY_AS_FAST_AS_POSSIBLE = False  # Default replay pacing (False = original timing)
+REPLAY_DRY_RUN = True  # Replays run the full pipeline against stubbed RPC / Birdeye / buys (replay_stubs.py)
+REPLAY_DRY_RUN_RPC_LATENCY = 0.05  # Simulated seconds per stubbed RPC call
+REPLAY_DRY_RUN_BIRDEYE_LATENCY = 0.2  # Simulated seconds per stubbed Birdeye request
+REPLAY_DRY_RUN_BUY_LATENCY = 0.5  # Simulated seconds per stubbed buy (send + confirm)
+
+# Listener telemetry (periodic summary line + local HTTP metrics endpoint)
+METRICS_SUMMARY_INTERVAL = 30  # Seconds between console summary lines
+METRICS_HTTP_ENABLED = True  # Serve /metrics (Prometheus text) and /json
+METRICS_HTTP_HOST = '127.0.0.1'
+METRICS_HTTP_PORT = 9464
+LOOP_LAG_SAMPLE_INTERVAL = 0.5  # Seconds between event-loop lag samples
+SLOT_POLL_INTERVAL = 10  # Seconds between getSlot polls for slot-lag tracking
+
+# Gap backfill after websocket outages (getSignaturesForAddress on the Raydium program)
+BACKFILL_ENABLED = True  # Recover pool inits missed while no endpoint was connected
+BACKFILL_CHECKPOINT_FILE = './data/listener_checkpoint.json'  # Last stream position, lets a restart backfill its downtime
+BACKFILL_CHECKPOINT_INTERVAL = 2.0  # Seconds between checkpoint saves while streaming (only written when it moved)
+BACKFILL_MAX_GAP_SECONDS = 600  # Older gaps are not worth backfilling
+BACKFILL_MAX_SIGNATURES = 2000  # Cap on signatures paged per gap
+BACKFILL_CONCURRENCY = 16  # Parallel getTransaction calls during a backfill
+BACKFILL_ACT_ON_STALE = True  # False = backfilled events are logged by the queue but never traded
+BACKFILL_EVENT_MAX_AGE = 120  # Seconds since block time before a backfilled event is shed
+
+# Make-before-break websocket rotation (replacement is subscribed before the old socket closes)
+WSS_PING_INTERVAL = 10  # Seconds between health pings on each connection
+WSS_PING_TIMEOUT = 5  # A pong slower than this counts as missed
+WSS_MAX_MISSED_PINGS = 2  # Rotate after this many consecutive missed pongs
+WSS_RTT_ROTATE_FACTOR = 3.0  # Rotate when ping RTT exceeds this multiple of its running average...
+WSS_RTT_ROTATE_FLOOR = 0.25  # ...and is above this many seconds
+WSS_ROTATE_INTERVAL = 15 * 60  # Proactively replace connections older than this (0 = only on degradation)
+WSS_SUBSCRIBE_TIMEOUT = 10  # Seconds to wait for a subscription confirmation
+WSS_ROTATE_OVERLAP = 1.0  # Seconds both connections stream before the old one is closed
+
+# Async Birdeye client used by the concurrent vetting pipeline
+BIRDEYE_MAX_CONNECTIONS = 16  # Pooled keep-alive connections to Birdeye
+BIRDEYE_REQUEST_TIMEOUT = 8  # Seconds per Birdeye request
+BIRDEYE_VETTING_MAX_RETRIES = 8  # Retries while a very new token is not indexed yet
+BIRDEYE_VETTING_RETRY_DELAY = 5.0  # Initial retry delay in seconds (x1.5 per retry)
+
+# Birdeye quota for the concurrent scanner (scan_engine.py) - size these to your Birdeye plan
+BIRDEYE_RATE_LIMIT = 15  # Requests per second
+BIRDEYE_RATE_BURST = 15  # Requests allowed back-to-back before the rate applies
+SCAN_INTERVAL_SECONDS = 600  # main.py runs a scan + buy cycle this often; scanner cooldowns below are multiples of it
+SCAN_CONCURRENCY = 16  # Tokens fetched at the same time during scan_bot
+SCAN_MAX_RETRIES = 2  # Attempts per Birdeye request while scanning (listed tokens are usually indexed)
+SCAN_AUDIT_CSV = True  # Also write passing tokens to FINAL_SORTED_CSV / READY_TO_BUY_CSV as they stream (audit only, nothing reads them back)
+
+# Shared Birdeye response cache (keyed by endpoint + mint)
+BIRDEYE_CACHE_ENABLED = True
+BIRDEYE_CACHE_MAX_ENTRIES = 5000  # LRU bound across all endpoints
+BIRDEYE_CACHE_TTLS = {  # Seconds a 200 response stays fresh, per endpoint
+    'price': 2,  # Prices drive PnL / kill switch decisions - keep short
+    'token_overview': 15,
+    'token_security': 300  # Authorities / holder flags rarely change
+}
+BIRDEYE_CACHE_DEFAULT_TTL = 10  # Endpoints not listed above
+BIRDEYE_CACHE_WAIT_TIMEOUT = 30  # Max seconds a caller waits on another thread's in-flight request
+
+# On-chain mint check run before any Birdeye request (one getAccountInfo round-trip)
+ONCHAIN_MINT_VETTING = True  # Reject freezable / mintable / Token-2022 mints without waiting for Birdeye indexing
+
+# Persistent vetting verdicts shared by the speed engine, scanner and hybrid poller
+VERDICT_STORE_ENABLED = True
+VERDICT_STORE_FILE = './data/vetting_verdicts.db'  # SQLite (WAL mode), safe to share across processes
+VERDICT_TTLS = {  # Seconds a verdict is reused, per reason class (see verdict_store.REASON_CLASSES)
+    'permanent': 7 * 24 * 3600,  # Honeypot, fake token, Token-2022, blacklisted deployer, too old
+    'authority': 3600,  # Mint / freeze authority, ownership, taxes - can still be renounced
+    'market': 1.5 * SCAN_INTERVAL_SECONDS,  # Liquidity, market cap, holders, activity - skips the next scan
+    'pass': 300,  # Approved tokens are re-vetted after this
+    'transient': 0  # Fetch errors: never stored
+}
+VERDICT_REASON_TTLS = {  # Per-rule cooldowns that override the class TTL above
+    # Half a cycle over whole scans, so a rejection always covers N full scan intervals
+    'min_trades': 1.5 * SCAN_INTERVAL_SECONDS,  # Activity picks up quickly on fresh launches - recheck every 2nd scan
+    'sell_percentage': 1.5 * SCAN_INTERVAL_SECONDS,
+    'min_liquidity': 2.5 * SCAN_INTERVAL_SECONDS,  # Recheck every 3rd scan
+    'min_unique_wallets': 2.5 * SCAN_INTERVAL_SECONDS,
+    'max_market_cap': 3.5 * SCAN_INTERVAL_SECONDS  # Rarely falls back under the cap
+}
+
+# Adaptive vetting stage order (learned per-stage cost / rejection rate, see vetting_stats.py)
+VETTING_ADAPTIVE_ORDER = True  # False = always run stages in their declared order
+VETTING_GATE_STAGES = 1  # Up to this many leading stages run one at a time; the rest fan out concurrently once they pass
+VETTING_GATE_COST_RATIO = 10  # ...but a stage only gates when its data costs this many times less than the stages after it
+VETTING_SOURCE_COSTS = {  # Relative API cost per data source (RPC credits / Birdeye compute units)
+    'mint': 1,  # getAccountInfo
+    'security': 50,  # Birdeye token_security
+    'overview': 30  # Birdeye token_overview
+}
+VETTING_LATENCY_COST = 10  # Cost units charged per second of stage latency when ranking
+VETTING_REORDER_EVERY = 50  # Recompute the order (and its cost report) every N vetted tokens
+VETTING_STATS_FILE = './data/vetting_stage_stats.json'
+
+# Structured per-token vetting profile (`python intelligence_manager.py profile`)
+VETTING_PROFILE_ENABLED = True
+VETTING_PROFILE_FILE = './data/vetting_profile.jsonl'  # One JSON line per vetted token
+
+# Deferred re-vetting for tokens Birdeye has not indexed yet (parked instead of retried in place)
+REVET_ENABLED = True  # False = retry Birdeye in place (BIRDEYE_VETTING_MAX_RETRIES) like before
+REVET_WINDOW_SECONDS = 120  # Opportunity window: give up on a token this long after first parking it
+REVET_INITIAL_DELAY = 3.0  # Seconds before the first re-vet
+REVET_BACKOFF = 1.5  # Delay multiplier per attempt
+REVET_MAX_DELAY = 20.0  # Cap on the delay between re-vets
+REVET_CONCURRENCY = 4  # Re-vets running at the same time
+REVET_MAX_PARKED = 500  # Tokens parked at once; new ones are abandoned beyond this
+
+# Labelled logsNotification corpus used by `python pool_classifier.py bench`
+CLASSIFIER_CORPUS_FILE = './data/pool_classifier_corpus.jsonl'
 
 ############### INTELLIGENCE ENGINE CONFIGURATIONS ###############
 INTELLIGENCE_VETTING_TIMEOUT = 50  # Maximum time for intelligence vetting (seconds) - increased for new token indexing
 ENABLE_DEPLOYER_BLACKLIST = True  # Enable deployer wallet history checking
+DEPLOYER_BLACKLIST_FILE = './data/deployer_blacklist.txt'  # address,reason[,unix_timestamp] - indexed in memory, re-read on change
 AUTO_BLACKLIST_BAD_PERFORMERS = True  # Auto-blacklist tokens that fail after purchase
 INTELLIGENCE_LOG_REJECTIONS = True  # Log all rejected tokens for analysis
 
@@ -125,6 +257,7 @@ REJECT_TRANSFER_FEES = True                  # Charges fees on transfers
 MAX_OWNER_PERCENTAGE = 0.30                  # Max % owner can hold (30%)
 MAX_UPDATE_AUTHORITY_PERCENTAGE = 0.30       # Max % update authority can hold (30%)
 MAX_TOP10_HOLDER_PERCENT = 0.70              # Max % top 10 holders can hold (70%)
+REJECT_MISSING_HOLDER_DATA = True            # Reject when Birdeye has no top 10 holder % yet
 MAX_BUY_TAX = 0.05                          # Max buy tax (5%)
 MAX_SELL_TAX = 0.05                         # Max sell tax (5%)
 
@@ -169,6 +302,8 @@ SEQUENTIAL_SKIPPED_LOG = './data/sequential_skipped.txt'
 # in this section a lot is hard coded, so dive into the file if you want to make tweaks
 
 TIMEFRAME = '3m' # 1m, 3m 5m, 15m, 1h, 4h, 1d
+CANDLE_STORE_ENABLED = True  # Keep fetched candles on disk and only request bars newer than the last stored one
+CANDLE_STORE_DIR = './data/candles'  # <timeframe>/<mint>.bin, memory-mapped on read
 
 # NEW 3/9
 max_amount_of_bars_before_dropping = 120 #00 # 120 bars is 6 hours if over that amount of bars, we dropping
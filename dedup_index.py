@@ -0,0 +1,124 @@
+# dedup_index.py - Kali Speed Engine: Bounded In-Memory Dedup Index
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from termcolor import cprint
+from config import *
+
+
+class DedupIndex:
+    """
+    Process-wide dedup index for pool signatures and base mints.
+
+    Both keys live in size- and time-bounded LRU maps (OrderedDict), so a
+    lookup costs O(1) no matter how long the bot has been running. The index
+    is snapshotted to disk in the background and reloaded on restart.
+    """
+
+    def __init__(self, state_file=DEDUP_STATE_FILE, max_entries=DEDUP_MAX_ENTRIES, ttl_seconds=DEDUP_TTL_SECONDS):
+        self.state_file = state_file
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.signatures = OrderedDict()  # signature -> last seen unix time
+        self.mints = OrderedDict()       # base mint -> last seen unix time
+        self.signature_hits = 0
+        self.mint_hits = 0
+        self._dirty = False
+
+    def _prune(self, index, now):
+        """Drop expired entries and enforce the size bound (oldest first)"""
+        cutoff = now - self.ttl_seconds
+        while index:
+            key, seen_at = next(iter(index.items()))
+            if len(index) > self.max_entries or seen_at < cutoff:
+                index.popitem(last=False)
+                self._dirty = True
+            else:
+                break
+
+    def _check_and_add(self, index, key):
+        now = time.time()
+        self._prune(index, now)
+        if key in index:
+            index.move_to_end(key)
+            index[key] = now
+            return False
+        index[key] = now
+        self._dirty = True
+        self._prune(index, now)
+        return True
+
+    def check_and_add_signature(self, signature):
+        """Record a signature. Returns True if it was not seen before."""
+        is_new = self._check_and_add(self.signatures, signature)
+        if not is_new:
+            self.signature_hits += 1
+        return is_new
+
+    def claim_mint(self, mint):
+        """Claim a base mint for vetting. Returns True if no other signature claimed it."""
+        is_new = self._check_and_add(self.mints, mint)
+        if not is_new:
+            self.mint_hits += 1
+        return is_new
+
+    def load(self):
+        """Reload a previous snapshot, skipping entries that already expired"""
+        try:
+            if not os.path.exists(self.state_file):
+                return
+            with open(self.state_file, 'r') as f:
+                data = json.load(f)
+            cutoff = time.time() - self.ttl_seconds
+            for name, index in (('signatures', self.signatures), ('mints', self.mints)):
+                for key, seen_at in data.get(name, []):
+                    if seen_at >= cutoff:
+                        index[key] = seen_at
+                while len(index) > self.max_entries:
+                    index.popitem(last=False)
+            self._dirty = False
+            cprint(f"📂 Kali Speed Engine: Loaded dedup index ({len(self.signatures)} signatures, {len(self.mints)} mints)", 'cyan')
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Could not load dedup index: {e}", 'yellow')
+
+    def snapshot(self):
+        """Copy the index into a JSON-ready dict"""
+        return {
+            'signatures': list(self.signatures.items()),
+            'mints': list(self.mints.items())
+        }
+
+    def save(self, snapshot=None):
+        """Atomically write a snapshot to disk"""
+        try:
+            snapshot = snapshot if snapshot is not None else self.snapshot()
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Could not save dedup index: {e}", 'yellow')
+
+    async def run_persistence(self, interval=DEDUP_FLUSH_INTERVAL):
+        """Background task: flush the index to disk whenever it changed"""
+        while True:
+            await asyncio.sleep(interval)
+            if self._dirty:
+                self._dirty = False
+                # Snapshot on the loop thread, write the file off it
+                await asyncio.to_thread(self.save, self.snapshot())
+
+
+# Shared index for the whole speed engine process
+_shared_index = None
+
+def get_dedup_index():
+    """Return the process-wide DedupIndex, loading the last snapshot on first use"""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = DedupIndex()
+        _shared_index.load()
+    return _shared_index
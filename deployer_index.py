@@ -0,0 +1,126 @@
+# deployer_index.py - Kali Intelligence: Indexed Deployer Blacklist
+import os
+import threading
+import time
+from termcolor import cprint
+from config import *
+
+BLACKLIST_HEADER = (
+    "# Deployer wallet blacklist - one address per line\n"
+    "# Format: wallet_address,reason[,unix_timestamp]\n"
+)
+
+
+def parse_blacklist_line(line):
+    """'address[,reason[,timestamp]]' -> (address, reason, timestamp) or None for comments / blanks"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    address, _, rest = line.partition(',')
+    reason = rest.strip() or "blacklisted deployer"
+    timestamp = None
+    head, sep, tail = reason.rpartition(',')
+    if sep and tail.strip().isdigit():
+        reason, timestamp = head.strip(), int(tail.strip())
+    return address.strip(), reason, timestamp
+
+
+class DeployerIndex:
+    """
+    In-memory hash map of the deployer blacklist file: address -> (reason, timestamp).
+
+    The file stays the source of truth (intelligence_manager.py add and other
+    processes append to it). Each lookup stats the file and only reads the
+    bytes appended since the last read; a file that shrank or was replaced
+    is reloaded from scratch. Lookup cost does not grow with the list.
+    """
+
+    def __init__(self, path=DEPLOYER_BLACKLIST_FILE):
+        self.path = path
+        self._entries = {}
+        self._offset = 0
+        self._inode = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _ensure_file(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, 'w') as f:
+                f.write(BLACKLIST_HEADER)
+
+    def _refresh(self):
+        """Pick up changes on disk (caller holds the lock)"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._ensure_file()
+            st = os.stat(self.path)
+
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            # New or truncated / rewritten file: full reload
+            self._entries = {}
+            self._offset = 0
+            self._inode = st.st_ino
+            self.reloads += 1
+        if st.st_size == self._offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read(st.st_size - self._offset)
+        # Only consume complete lines; a half-written last line is read next time
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return
+        for raw in chunk[:end].decode('utf-8', errors='replace').splitlines():
+            parsed = parse_blacklist_line(raw)
+            if parsed:
+                address, reason, timestamp = parsed
+                self._entries[address] = (reason, timestamp)
+        self._offset += end
+
+    def lookup(self, address):
+        """(reason, timestamp) if the address is blacklisted, else None"""
+        if not address:
+            return None
+        with self._lock:
+            self._refresh()
+            return self._entries.get(address)
+
+    def add(self, address, reason="manual_add"):
+        """Append to the file and the index; returns False if it was already listed"""
+        with self._lock:
+            self._refresh()
+            if address in self._entries:
+                return False
+            timestamp = int(time.time())
+            with open(self.path, 'a') as f:
+                f.write(f"{address},{reason},{timestamp}\n")
+            self._entries[address] = (reason, timestamp)
+            return True
+
+    def entries(self):
+        """Snapshot of address -> (reason, timestamp)"""
+        with self._lock:
+            self._refresh()
+            return dict(self._entries)
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+
+# Shared index for the whole process
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+def get_deployer_index():
+    """Return the process-wide DeployerIndex"""
+    global _shared_index
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = DeployerIndex()
+    return _shared_index
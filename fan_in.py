@@ -0,0 +1,66 @@
+# fan_in.py - Kali Speed Engine: Multi-Endpoint First-Arrival Tracking
+from collections import Counter, OrderedDict, defaultdict
+from urllib.parse import urlparse
+from config import *
+
+
+def endpoint_label(url):
+    """Short, key-free name for a websocket endpoint (host[:port])"""
+    parsed = urlparse(url)
+    return parsed.netloc or url.split('?')[0]
+
+
+class FanInTracker:
+    """
+    Merges the same logsSubscribe stream arriving from several endpoints.
+
+    The first endpoint to deliver a signature wins it; later copies are
+    counted as duplicates together with how far behind the winner they were,
+    so we can see which provider is actually fastest.
+    """
+
+    def __init__(self, endpoints, window=FAN_IN_TRACK_WINDOW):
+        self.endpoints = list(endpoints)
+        self.window = window
+        self.wins = Counter()
+        self.duplicates = Counter()
+        self.total_lag = defaultdict(float)
+        self._first_seen = OrderedDict()  # signature -> (endpoint, arrival time)
+
+    def record_arrival(self, signature, endpoint, arrival):
+        """Returns True if this is the first arrival of the signature on any endpoint"""
+        first = self._first_seen.get(signature)
+        if first is None:
+            self._first_seen[signature] = (endpoint, arrival)
+            if len(self._first_seen) > self.window:
+                self._first_seen.popitem(last=False)
+            self.wins[endpoint] += 1
+            return True
+
+        if endpoint != first[0]:
+            self.duplicates[endpoint] += 1
+            self.total_lag[endpoint] += max(0.0, arrival - first[1])
+        return False
+
+    def stats(self):
+        """Per-endpoint wins, late copies and average lag behind the winner (ms)"""
+        # Replays / backfills only learn endpoint names from arrivals; list them without touching self.endpoints
+        endpoints = list(self.endpoints)
+        for endpoint in list(self.wins) + list(self.duplicates):
+            if endpoint not in endpoints:
+                endpoints.append(endpoint)
+        return {
+            endpoint: {
+                'wins': self.wins[endpoint],
+                'late': self.duplicates[endpoint],
+                'avg_lag_ms': (self.total_lag[endpoint] / self.duplicates[endpoint] * 1000) if self.duplicates[endpoint] else 0.0
+            }
+            for endpoint in endpoints
+        }
+
+    def summary(self):
+        """One-line leaderboard for the console"""
+        parts = []
+        for endpoint, s in self.stats().items():
+            parts.append(f"{endpoint}: {s['wins']} wins, {s['late']} late (+{s['avg_lag_ms']:.0f}ms)")
+        return " | ".join(parts)
@@ -0,0 +1,198 @@
+# gap_backfill.py - Kali Speed Engine: Gap Backfill After WebSocket Outages
+import asyncio
+import json
+import os
+import time
+from termcolor import cprint
+from config import *
+from pool_classifier import decode_frame, classify_logs
+
+# getSignaturesForAddress answers at 'confirmed', a slot or two behind the
+# 'processed' subscription; wait so the backfill window reaches the live stream
+CONFIRMATION_SETTLE_SECONDS = 2.0
+
+
+class GapBackfiller:
+    """
+    Remembers where the live stream was when every websocket went down and,
+    once a connection is back, replays the missed window through
+    getSignaturesForAddress + getTransaction. Recovered pool inits are
+    handed to the normal pipeline marked stale=True.
+    """
+
+    def __init__(self, rpc_client, submit, program_id, checkpoint_file=BACKFILL_CHECKPOINT_FILE):
+        self.rpc_client = rpc_client
+        self.submit = submit  # callable(event, endpoint) shared with the live path
+        self.program_id = program_id
+        self.checkpoint_file = checkpoint_file
+        self._last_frame = None
+        self._checkpoint = None  # {'signature', 'slot', 'time'}
+        self.pending_gap = None
+        self._unrecovered = None  # Gap whose backfill has started but not finished
+        self._saved = None  # Last position written to checkpoint_file
+        self._connected = set()
+        self._tasks = set()
+        self.backfills = 0
+        self.recovered = 0
+
+    # === Checkpointing ===
+
+    def note_frame(self, frame):
+        """Hot path: keep a reference to the newest frame, parsed only when needed"""
+        self._last_frame = frame
+
+    def checkpoint(self):
+        """Latest stream position (decodes the last frame lazily)"""
+        if self._last_frame is not None:
+            try:
+                record = decode_frame(self._last_frame)
+                if record and record.signature:
+                    self._checkpoint = {'signature': record.signature, 'slot': record.slot, 'time': time.time()}
+            except Exception:
+                pass
+            self._last_frame = None
+        return self._checkpoint
+
+    def mark_gap(self):
+        """All endpoints are down: remember where the stream stopped"""
+        if self.pending_gap is None and self.checkpoint():
+            self.pending_gap = dict(self._checkpoint)
+            cprint(f"🕳️ Kali Speed Engine: Stream gap opened after slot {self.pending_gap['slot']}", 'yellow')
+
+    def position(self):
+        """
+        What a restart should backfill from: the start of any gap not yet
+        recovered, otherwise the latest stream position
+        """
+        checkpoint = self.checkpoint()
+        return self.pending_gap or self._unrecovered or checkpoint
+
+    def save(self, position=None):
+        """Persist the stream position so a restart can backfill its own downtime"""
+        position = position if position is not None else self.position()
+        if not position or position == self._saved:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.checkpoint_file) or '.', exist_ok=True)
+            # Write-then-rename: a kill mid-write leaves the previous checkpoint intact
+            tmp_file = f"{self.checkpoint_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(position, f)
+            os.replace(tmp_file, self.checkpoint_file)
+            self._saved = position
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Could not save stream checkpoint: {e}", 'yellow')
+
+    async def run_persistence(self, interval=BACKFILL_CHECKPOINT_INTERVAL):
+        """Background task: save the position whenever it moved, so a crash or kill -9 still leaves a fresh checkpoint"""
+        while True:
+            await asyncio.sleep(interval)
+            # Resolve the position on the loop thread, write the file off it
+            position = self.position()
+            if position and position != self._saved:
+                await asyncio.to_thread(self.save, position)
+
+    def load(self):
+        """Treat a recent checkpoint from the previous run as an open gap"""
+        try:
+            if not os.path.exists(self.checkpoint_file):
+                return
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+            if time.time() - checkpoint.get('time', 0) <= BACKFILL_MAX_GAP_SECONDS:
+                self._checkpoint = checkpoint
+                self.pending_gap = dict(checkpoint)
+                cprint(f"📂 Kali Speed Engine: Will backfill downtime since slot {checkpoint.get('slot')}", 'cyan')
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Could not load stream checkpoint: {e}", 'yellow')
+
+    # === Connection tracking ===
+
+    def endpoint_up(self, endpoint):
+        """A subscription is live again; starts a backfill for any open gap"""
+        self._connected.add(endpoint)
+        if self.pending_gap is None:
+            return
+        gap = self.pending_gap
+        self.pending_gap = None
+        self._unrecovered = gap
+        if time.time() - gap['time'] > BACKFILL_MAX_GAP_SECONDS:
+            cprint(f"⏭️ Kali Speed Engine: Gap older than {BACKFILL_MAX_GAP_SECONDS}s, not backfilling", 'yellow')
+            return
+        task = asyncio.create_task(self.backfill(gap['signature']))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def endpoint_down(self, endpoint):
+        """Only a gap once no endpoint is left streaming"""
+        self._connected.discard(endpoint)
+        if not self._connected:
+            self.mark_gap()
+
+    async def stop(self):
+        """Cancel running backfills and persist the position"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.save()
+
+    def stats(self):
+        return {'runs': self.backfills, 'recovered': self.recovered, 'gap_open': self.pending_gap is not None}
+
+    # === Backfill ===
+
+    async def _missed_signatures(self, until_signature):
+        """Page getSignaturesForAddress back to the checkpoint (newest first)"""
+        signatures = []
+        before = None
+        while len(signatures) < BACKFILL_MAX_SIGNATURES:
+            limit = min(1000, BACKFILL_MAX_SIGNATURES - len(signatures))
+            data = await self.rpc_client.get_signatures_for_address(
+                self.program_id, until=until_signature, before=before, limit=limit
+            )
+            page = data.get('result') or []
+            signatures.extend(page)
+            if len(page) < limit:
+                return signatures
+            before = page[-1]['signature']
+
+        cprint(f"⚠️ Kali Speed Engine: Gap exceeds {BACKFILL_MAX_SIGNATURES} signatures, oldest part not backfilled", 'yellow')
+        return signatures
+
+    async def _recover(self, entry, semaphore):
+        async with semaphore:
+            try:
+                data = await self.rpc_client.get_transaction(entry['signature'], commitment="confirmed")
+                transaction = data.get('result')
+                if not transaction:
+                    return
+                logs = (transaction.get('meta') or {}).get('logMessages') or []
+                event = classify_logs(entry['signature'], logs, slot=transaction.get('slot'), err=entry.get('err'))
+                if event:
+                    block_time = entry.get('blockTime') or transaction.get('blockTime')
+                    event = event._replace(stale=True, detected_at=block_time or event.detected_at)
+                    self.recovered += 1
+                    self.submit(event, 'backfill')
+            except Exception as e:
+                cprint(f"⚠️ Kali Speed Engine: Backfill fetch failed for {entry['signature'][:8]}...: {e}", 'yellow')
+
+    async def backfill(self, until_signature):
+        """Recover pool inits between the checkpoint signature and now"""
+        started = time.time()
+        self.backfills += 1
+        try:
+            await asyncio.sleep(CONFIRMATION_SETTLE_SECONDS)
+            missed = await self._missed_signatures(until_signature)
+            # Failed transactions can't be pool creations
+            candidates = [entry for entry in missed if entry.get('err') is None]
+            cprint(f"🔁 Kali Speed Engine: Backfilling {len(candidates)} missed Raydium transactions...", 'cyan')
+
+            semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+            recovered_before = self.recovered
+            await asyncio.gather(*[self._recover(entry, semaphore) for entry in candidates])
+
+            cprint(f"✅ Kali Speed Engine: Backfill done in {time.time() - started:.1f}s - {self.recovered - recovered_before} missed pool(s) recovered", 'green')
+        except Exception as e:
+            cprint(f"❌ Kali Speed Engine: Backfill failed: {e}", 'red')
+        # Not reached when cancelled, so a shutdown mid-backfill keeps the gap for the next start
+        self._unrecovered = None
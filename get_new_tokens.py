@@ -10,9 +10,15 @@ import pprint
 import re as reggie
 from termcolor import cprint
 from config import *
-import pandas_ta as ta
 from datetime import datetime, timedelta
-from nice_funcs import security_check  # Import the security_check function
+from birdeye_cache import birdeye_get
+from security_rules import SECURITY_RULES, market_rules, activity_rules, add_activity_fields
+from verdict_store import get_verdict_store
+from scan_engine import ScanEngine
+from indicators import pad_left, analyze_candles
+from candle_store import get_candle_store, to_candles
+import asyncio
+import numpy as np
 
 def get_time_range():
     """Get time range for OHLCV data (10 days)"""
@@ -23,8 +29,19 @@ def get_time_range():
     return time_from, time_to
 
 def get_ohlcv_data(address):
-    """Get OHLCV data from Birdeye API"""
-    time_from, time_to = get_time_range()
+    """
+    OHLCV candles for a token (structured array with t/o/h/l/c/v fields).
+    With the candle store enabled only bars newer than the stored ones are
+    requested from Birdeye, and the result is a read-only view of the
+    memory-mapped file - no copy unless a short history needs padding.
+    """
+    window_start, time_to = get_time_range()
+    time_from = window_start
+    store = get_candle_store() if CANDLE_STORE_ENABLED else None
+    if store is not None:
+        last_stored = store.last_time(address)
+        if last_stored is not None and last_stored >= window_start:
+            time_from = int(last_stored)  # Re-fetch the last bar, it may still have been forming
     url = f"https://public-api.birdeye.so/defi/ohlcv?address={address}&type={TIMEFRAME}&time_from={time_from}&time_to={time_to}"
     
     headers = {"X-API-KEY": d.birdeye}
@@ -32,91 +49,51 @@ def get_ohlcv_data(address):
     
     if response.status_code != 200:
         cprint(f"🚨 Kali: Failed to get OHLCV data for {address}", 'red')
-        return pd.DataFrame()
+        return to_candles([])
         
     json_response = response.json()
     items = json_response.get('data', {}).get('items', [])
+    candles = to_candles(items)
 
-    processed_data = [{
-        'Datetime (UTC)': datetime.utcfromtimestamp(item['unixTime']).strftime('%Y-%m-%d %H:%M:%S'),
-        'Open': item['o'],
-        'High': item['h'],
-        'Low': item['l'],
-        'Close': item['c'],
-        'Volume': item['v']
-    } for item in items]
-
-    df = pd.DataFrame(processed_data)
+    if store is not None:
+        store.append(address, candles)
+        candles = store.read(address, since=window_start)
+    if len(candles) == 0:
+        return candles
     
-    if len(df) < 40:
-        rows_to_add = 40 - len(df)
-        first_row_replicated = pd.concat([df.iloc[0:1]] * rows_to_add, ignore_index=True)
-        df = pd.concat([first_row_replicated, df], ignore_index=True)
-
-    # Calculate technical indicators
-    df['MA20'] = ta.sma(df['Close'], length=20)
-    df['MA40'] = ta.sma(df['Close'], length=40)
-    df['Price_above_MA20'] = df['Close'] > df['MA20']
-    df['Price_above_MA40'] = df['Close'] > df['MA40']
-    df['MA20_above_MA40'] = df['MA20'] > df['MA40']
-
-    # Print OHLCV data head
+    # Short histories: repeat the first candle so the 40-bar MA exists
+    candles = pad_left(candles, 40)
+
+    # Print OHLCV data head (the only place a DataFrame is built, 5 rows)
+    last = candles[-5:]
     cprint("\n📊 Kali: Latest OHLCV Data for Token 🌙", 'cyan', attrs=['bold'])
     print("\nLast 5 candles:")
-    print(df[['Datetime (UTC)', 'Open', 'High', 'Low', 'Close', 'Volume']].tail().to_string())
-    print("\nTechnical Indicators:")
-    print(f"MA20: {df['MA20'].iloc[-1]:.8f}")
-    print(f"MA40: {df['MA40'].iloc[-1]:.8f}")
-    print(f"Price Above MA20: {df['Price_above_MA20'].iloc[-1]}")
-    print(f"Price Above MA40: {df['Price_above_MA40'].iloc[-1]}")
-    print(f"MA20 Above MA40: {df['MA20_above_MA40'].iloc[-1]}")
-
-    return df
-
-def analyze_ohlcv_trend(ohlcv_df):
+    print(pd.DataFrame({
+        'Datetime (UTC)': pd.to_datetime(last['t'], unit='s').strftime('%Y-%m-%d %H:%M:%S'),
+        'Open': last['o'],
+        'High': last['h'],
+        'Low': last['l'],
+        'Close': last['c'],
+        'Volume': last['v']
+    }, index=range(len(candles) - len(last), len(candles))).to_string())
+
+    return candles
+
+def analyze_ohlcv_trend(candles):
     """Analyze OHLCV trends and return analysis dict"""
-    # Get price metrics
-    highest_close = ohlcv_df['Close'].max()
-    lowest_close = ohlcv_df['Close'].min()
-    most_recent_close = ohlcv_df['Close'].iloc[-1]
-    avg_close = (highest_close + lowest_close) / 2
-    price_above_avg_close = most_recent_close > avg_close
-    
-    # Track higher highs/lows
-    prev_high = ohlcv_df['High'].iloc[0]
-    prev_low = ohlcv_df['Low'].iloc[0]
-    higher_highs = True
-    higher_lows = True
-    
-    for i in range(1, len(ohlcv_df)):
-        current_high = ohlcv_df['High'].iloc[i]
-        current_low = ohlcv_df['Low'].iloc[i]
-        
-        if current_high <= prev_high:
-            higher_highs = False
-        if current_low <= prev_low:
-            higher_lows = False
-            
-        prev_high = current_high
-        prev_low = current_low
-
-    price_increase_from_launch = ohlcv_df['Close'].iloc[-1] > ohlcv_df['Open'].iloc[0]
-    num_bars = len(ohlcv_df)
-
-    return {
-        'higher_highs': higher_highs,
-        'higher_lows': higher_lows,
-        'price_increase_from_launch': price_increase_from_launch,
-        'MA20': ohlcv_df['MA20'].iloc[-1],
-        'MA40': ohlcv_df['MA40'].iloc[-1],
-        'Price_above_MA20': ohlcv_df['Price_above_MA20'].iloc[-1],
-        'Price_above_MA40': ohlcv_df['Price_above_MA40'].iloc[-1],
-        'MA20_above_MA40': ohlcv_df['MA20_above_MA40'].iloc[-1],
-        'num_bars': num_bars,
-        'price_above_avg_close': price_above_avg_close
-    }
-
-def check_ohlcv_conditions(ohlcv_df, trend_analysis, address):
+    # One vectorized pass straight over the candle columns (views, no copies);
+    # indicators.analyze_candles also takes a (tokens, bars) batch
+    analysis = analyze_candles(candles['o'], candles['h'], candles['l'], candles['c'])
+
+    print("\nTechnical Indicators:")
+    print(f"MA20: {analysis['MA20']:.8f}")
+    print(f"MA40: {analysis['MA40']:.8f}")
+    print(f"Price Above MA20: {analysis['Price_above_MA20']}")
+    print(f"Price Above MA40: {analysis['Price_above_MA40']}")
+    print(f"MA20 Above MA40: {analysis['MA20_above_MA40']}")
+    return analysis
+
+def check_ohlcv_conditions(candles, trend_analysis, address):
     """Check if token passes OHLCV conditions"""
     # Check number of bars
     if trend_analysis['num_bars'] > max_amount_of_bars_before_dropping:
@@ -129,11 +106,11 @@ def check_ohlcv_conditions(ohlcv_df, trend_analysis, address):
         return False
 
     # Check moving average conditions over last 30 bars
-    if len(ohlcv_df) >= 30:
+    if trend_analysis['num_bars'] >= 30:
         conditions = [
-            (ohlcv_df['Price_above_MA20'].tail(30).sum() / 30) > 0.5,
-            (ohlcv_df['Price_above_MA40'].tail(30).sum() / 30) > 0.5,
-            (ohlcv_df['MA20_above_MA40'].tail(30).sum() / 30) > 0.5,
+            trend_analysis['price_above_ma20_share'] > 0.5,
+            trend_analysis['price_above_ma40_share'] > 0.5,
+            trend_analysis['ma20_above_ma40_share'] > 0.5,
             trend_analysis['price_increase_from_launch']
         ]
         
@@ -145,65 +122,46 @@ def check_ohlcv_conditions(ohlcv_df, trend_analysis, address):
     return False
 
 def token_overview(address, MAX_SELL_PERCENTAGE, MIN_TRADES_LAST_HOUR, MIN_UNQ_WALLETS2hr, MIN_VIEW24h, MIN_LIQUIDITY):
-    url = f"https://public-api.birdeye.so/defi/token_overview?address={address}"
-    headers = {"X-API-KEY": d.birdeye}
-
-    response = requests.get(url, headers=headers)
-    time.sleep(2)
-    result = {}
+    # Shared Birdeye cache (coalesces with get_token_overview / vetting lookups)
+    status, body = birdeye_get("token_overview", address)
 
     # Handle 521 error (Cloudflare/server down)
-    if response.status_code == 521:
+    if status == 521:
         cprint(f"🔄 Birdeye API temporarily down for {address[-4:]} - waiting 30s...", 'yellow')
         time.sleep(30)  # Wait longer for server issues
         return "retry"  # Signal to retry this token
     
-    if response.status_code != 200:
-        cprint(f"❌ Failed to get token data for {address[-4:]}: HTTP {response.status_code}", 'red')
+    if status != 200:
+        cprint(f"❌ Failed to get token data for {address[-4:]}: HTTP {status}", 'red')
         return None
 
-    overview_data = response.json().get('data', {})
-    
-    # Check market cap first
-    mc = overview_data.get('mc', 0)
-    if mc > MAX_MARKET_CAP:
-        cprint(f"🚫 Token dropped: {address}", 'red')
-        cprint(f"Reason: Market cap too high (${mc:,.2f} > ${MAX_MARKET_CAP:,.2f})", 'red')
-        return None
+    return evaluate_overview(address, body.get('data') or {}, MAX_SELL_PERCENTAGE, MIN_TRADES_LAST_HOUR, MIN_UNQ_WALLETS2hr, MIN_LIQUIDITY)
 
-    # Check top 10 holder percentage
-    top10_holder_percent = overview_data.get('top10HolderPercent', 0)
-    if top10_holder_percent > MAX_TOP10_HOLDER_PERCENT:
-        cprint(f"🚫 Token dropped: {address}", 'red')
-        cprint(f"Reason: Top 10 holders own too much ({top10_holder_percent*100:.1f}% > {MAX_TOP10_HOLDER_PERCENT*100:.1f}%)", 'red')
-        return None
+def evaluate_overview(address, overview, MAX_SELL_PERCENTAGE, MIN_TRADES_LAST_HOUR, MIN_UNQ_WALLETS2hr, MIN_LIQUIDITY):
+    """Apply the scan's market / activity rules to a token_overview payload; result dict or None"""
+    result = {}
+    overview_data = add_activity_fields(overview)
     
-    buy1h = overview_data.get('buy1h', 0)
-    sell1h = overview_data.get('sell1h', 0)
-    trade1h = buy1h + sell1h
-    total_trades = trade1h
-
-    # Perform buy/sell percentage calculations:
-    buy_percentage = (buy1h / total_trades * 100) if total_trades else 0
-    sell_percentage = (sell1h / total_trades * 100) if total_trades else 0
-
-    # Criteria checks with colored output:
-    if sell_percentage > MAX_SELL_PERCENTAGE:
-        cprint(f"🚫 Token dropped: {address}", 'yellow')
-        cprint(f"Reason: High sell % ({sell_percentage:.1f}%)", 'yellow')
-        return None
-    if trade1h < MIN_TRADES_LAST_HOUR:
-        cprint(f"🚫 Token dropped: {address}", 'magenta')
-        cprint(f"Reason: Low trades ({trade1h})", 'magenta')
-        return None
-    if overview_data.get('uniqueWallet24h', 0) < MIN_UNQ_WALLETS2hr:
-        cprint(f"🚫 Token dropped: {address}", 'cyan')
-        cprint(f"Reason: Low wallets ({overview_data.get('uniqueWallet24h', 0)})", 'cyan')
-        return None
-    if overview_data.get('liquidity', 0) < MIN_LIQUIDITY:
-        cprint(f"🚫 Token dropped: {address}", 'white')
-        cprint(f"Reason: Low liquidity ({overview_data.get('liquidity', 0)})", 'white')
-        return None
+    # Same compiled rules as the vetting engine, with this scan's thresholds
+    for rules in (
+        market_rules(min_liquidity=MIN_LIQUIDITY),
+        activity_rules(MAX_SELL_PERCENTAGE, MIN_TRADES_LAST_HOUR, MIN_UNQ_WALLETS2hr)
+    ):
+        rejection = rules.first_rejection(overview_data)
+        if rejection:
+            cprint(f"🚫 Token dropped: {address}", 'red')
+            cprint(f"Reason: {rejection.message}", 'red')
+            if VERDICT_STORE_ENABLED:
+                get_verdict_store().record(address, False, [rejection.code], 'scanner', {'overview': overview_data})
+            return None
+    
+    mc = overview_data.get('mc') or 0
+    top10_holder_percent = overview_data.get('top10HolderPercent') or 0
+    buy1h = overview_data.get('buy1h') or 0
+    sell1h = overview_data.get('sell1h') or 0
+    trade1h = overview_data['trade1h']
+    buy_percentage = overview_data['buy_percentage']
+    sell_percentage = overview_data['sell_percentage']
 
     # If we get here, token passed all filters - make it stand out!
     cprint(f"🚀 KALI FOUND A GEM! 🌙", 'white', 'on_green', attrs=['bold'])
@@ -267,13 +225,111 @@ def get_blacklisted_tokens():
                 blacklisted.add(token_address)
     return blacklisted
 
-def scan_bot():
-    """Main function to scan for new tokens"""
+async def scan_candidates(candidates, store=None):
+    """
+    Security for every candidate, the vectorized security rules over each
+    batch of responses as it arrives, then overview for that batch's
+    survivors - all through the scan engine's rate limiter. Yields the
+    overview result dict of every token that passes, the moment it passes.
+    """
+    engine = ScanEngine()
+
+    async def fetch_security(token_address):
+        security_data, error = await engine.client.token_security(token_address, engine.max_retries)
+        if error is not None:
+            if error.status == 429:
+                cprint(f"⚠️ Rate limited on {token_address[-4:]} - skipping this scan", 'yellow')
+                return None
+            if error.retryable:
+                # Timeouts / not indexed yet: worth another look next scan, not a blacklist entry
+                cprint(f"⚠️ Security data not available for {token_address[-4:]} yet ({error}) - skipping this scan", 'yellow')
+                return None
+            cprint(f"⚠️ Security check failed for {token_address}: {error}", 'white', 'on_red')
+            add_to_blacklist(token_address, 'security_check')
+            return None
+        if not security_data:
+            cprint(f"❌ No 'data' field in security response for {token_address}", 'white', 'on_red')
+            add_to_blacklist(token_address, 'invalid_security_data')
+            return None
+        if security_data.get('freezeable', False):
+            print(f"* {token_address[-4:]} is freezeable. Dropping.")
+            add_to_blacklist(token_address, 'security_check')
+            return None
+        return ('security', token_address, security_data)
+
+    async def fetch_overview(token_address, security_data):
+        # Check liquidity and other metrics
+        overview, error = await engine.client.token_overview(token_address, engine.max_retries)
+        if error is not None:
+            cprint(f"❌ Failed to get token data for {token_address[-4:]}: {error}", 'red')
+            return None
+        token_data = evaluate_overview(
+            token_address,
+            overview,
+            MAX_SELL_PERCENTAGE=MAX_SELL_PERCENTAGE,
+            MIN_TRADES_LAST_HOUR=MIN_TRADES_LAST_HOUR,
+            MIN_UNQ_WALLETS2hr=MIN_UNQ_WALLETS2HR,
+            MIN_LIQUIDITY=MIN_LIQUIDITY
+        )
+        if not token_data:
+            return None
+
+        # If we get here, token passed all filters
+        token_data['name'] = overview.get('name')
+        if store:
+            store.record(token_address, True, source='scanner', snapshot={'security': security_data, 'overview': token_data})
+        cprint(f"✨ Token {token_address} passed all filters!", 'white', 'on_green')
+        return ('overview', token_address, token_data)
+
+    tasks = {engine.submit('security', fetch_security, token_address) for token_address in candidates}
+    checked = passed = 0
+    try:
+        async for batch in engine.completed(tasks):
+            # Whatever security responses finished together are judged in one vectorized pass
+            security_rows = {token_address: data for stage, token_address, data in batch if stage == 'security'}
+            if security_rows:
+                verdicts = SECURITY_RULES.evaluate_frame(pd.DataFrame.from_dict(security_rows, orient='index'))
+                for token_address, reasons in verdicts.loc[verdicts['rejected'], 'reject_reasons'].items():
+                    add_to_blacklist(token_address, reasons[0])
+                    if store:
+                        store.record(token_address, False, reasons, 'scanner', {'security': security_rows[token_address]})
+                survivors = list(verdicts.index[~verdicts['rejected']])
+                checked += len(verdicts)
+                passed += len(survivors)
+                tasks.update(engine.submit('overview', fetch_overview, token_address, security_rows[token_address]) for token_address in survivors)
+
+            for stage, token_address, token_data in batch:
+                if stage == 'overview':
+                    yield token_data
+    finally:
+        await engine.close()
+    cprint(f"🔐 Kali: {passed}/{checked} tokens passed security rules"
+           f"{f', {engine.failed} checks failed' if engine.failed else ''}", 'white', 'on_cyan')
+
+class CsvAudit:
+    """Optional CSV copy of a stream: header on open, one flushed row per token"""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.rows = 0
+        pd.DataFrame(columns=self.columns).to_csv(path, index=False)
+
+    def write(self, row):
+        pd.DataFrame([row]).reindex(columns=self.columns).to_csv(self.path, mode='a', header=False, index=False)
+        self.rows += 1
+
+async def stream_new_tokens():
+    """
+    Scan for new tokens and yield each one (a row dict with at least
+    'address' and 'name') as soon as it passes all filters. Tokens whose
+    pass is still cached in the verdict store come first.
+    """
     cprint('🌙 Kali: Starting token scan...', 'white', 'on_cyan')
     print('\n🚀 Fetching tokens from Jupiter API...')
 
     # Get all new tokens first
-    all_tokens_df = get_jupiter_tokens()
+    all_tokens_df = await asyncio.to_thread(get_jupiter_tokens)
     if all_tokens_df is None or all_tokens_df.empty:
         cprint('❌ Kali: No tokens found from Jupiter API', 'white', 'on_red')
         return
@@ -296,88 +352,60 @@ def scan_bot():
     # Remove blacklisted tokens early to save API calls
     time_filtered_df = time_filtered_df[~time_filtered_df['address'].isin(blacklisted_tokens)]
     cprint(f'🌙 Kali: Found {len(time_filtered_df)} tokens after removing blacklisted ones', 'white', 'on_cyan')
+    rows = {row['address']: row for row in time_filtered_df.to_dict('records')}
+
+    # Optional audit copy of everything that passed
+    audit = CsvAudit(FINAL_SORTED_CSV, list(time_filtered_df.columns) + (['name'] if 'name' not in time_filtered_df.columns else [])) if SCAN_AUDIT_CSV else None
+
+    def passed(address, name=None):
+        row = dict(rows[address])
+        if not isinstance(row.get('name'), str) or not row.get('name'):
+            row['name'] = name or 'N/A'
+        if audit:
+            audit.write(row)
+        return row
     
-    # Create a list to store valid tokens
-    valid_tokens = []
+    # Verdicts from earlier scans / other processes that have not expired yet
+    store = get_verdict_store() if VERDICT_STORE_ENABLED else None
     
-    # Process remaining tokens
-    for index, row in time_filtered_df.iterrows():
-        token_address = row['address']
-        cprint(f'\n🔍 Kali: Checking token {token_address}', 'white', 'on_blue')
-        
-        # Check security data
-        security_data = security_check(token_address)
-        if not security_data:
-            cprint(f"⚠️ Security check returned no data for {token_address}", 'white', 'on_red')
-            add_to_blacklist(token_address, 'security_check')
-            continue
-            
-        # Debug print security data
-        cprint(f"🔐 Security Data for {token_address}:", 'white', 'on_cyan')
-        if 'data' in security_data:
-            print("Top 10 Holder %:", security_data['data'].get('top10HolderPercent'))
-            print("Freeze Authority:", security_data['data'].get('freezeAuthority'))
-            print("Mutable Metadata:", security_data['data'].get('mutableMetadata'))
-            print("Is Token 2022:", security_data['data'].get('isToken2022'))
-        else:
-            cprint("❌ No 'data' field in security response", 'white', 'on_red')
-            add_to_blacklist(token_address, 'invalid_security_data')
-            continue
-
-        # Check for freezable with proper error handling
-        if security_data['data'].get('freezeAuthority'):
-            add_to_blacklist(token_address, 'freezable')
-            continue
-            
-        # Check top holder percentage with proper error handling
-        top10_holder_percent = security_data['data'].get('top10HolderPercent')
-        if top10_holder_percent is not None:
-            if top10_holder_percent > MAX_TOP10_HOLDER_PERCENT:
-                add_to_blacklist(token_address, 'top_holder_percent')
-                continue
+    # Only new mints and mints whose cooldown expired are fetched again
+    addresses = list(rows)
+    cached = store.lookup_many(addresses, source='scanner') if store else {}
+    candidates = [address for address in addresses if address not in cached]
+    cooldowns = {}
+    cached_passes = []
+    for verdict in cached.values():
+        if verdict.passed:
+            cached_passes.append(verdict)
         else:
-            cprint(f"⚠️ No top10HolderPercent data for {token_address}", 'white', 'on_red')
-            add_to_blacklist(token_address, 'missing_holder_data')
-            continue
-            
-        # Check for mutable metadata
-        if DROP_IF_MUTABLE_METADATA and security_data['data'].get('mutableMetadata'):
-            add_to_blacklist(token_address, 'mutable_metadata')
-            continue
-            
-        # Check for 2022 token program
-        if DROP_IF_2022_TOKEN_PROGRAM and security_data['data'].get('isToken2022'):
-            add_to_blacklist(token_address, 'token_2022_program')
-            continue
-            
-        # Check liquidity and other metrics
-        token_data = token_overview(
-            token_address,
-            MAX_SELL_PERCENTAGE=MAX_SELL_PERCENTAGE,
-            MIN_TRADES_LAST_HOUR=MIN_TRADES_LAST_HOUR,
-            MIN_UNQ_WALLETS2hr=MIN_UNQ_WALLETS2HR,
-            MIN_VIEW24h=MIN_VIEW24H,
-            MIN_LIQUIDITY=MIN_LIQUIDITY
-        )
-        
-        if token_data == "retry" or not token_data:
-            continue
-
-        # If we get here, token passed all filters
-        valid_tokens.append(token_address)
-        cprint(f"✨ Token {token_address} passed all filters!", 'white', 'on_green')
+            cooldowns[verdict.reason] = cooldowns.get(verdict.reason, 0) + 1
+    if cached:
+        reused = ', '.join(f"{reason} {count}" for reason, count in sorted(cooldowns.items(), key=lambda item: -item[1]))
+        cprint(f"🗄️ Kali: Reusing {len(cached)} verdicts ({len(cached_passes)} passed"
+               f"{', ' + reused if reused else ''}) - checking {len(candidates)} new / expired mints", 'white', 'on_cyan')
+    found = 0
+    for verdict in cached_passes:
+        found += 1
+        yield passed(verdict.mint, ((verdict.snapshot or {}).get('overview') or {}).get('name'))
+    
+    # Concurrent, quota-bounded Birdeye fetches for the rest, handed on as they pass
+    scan_started = time.time()
+    async for token_data in scan_candidates(candidates, store):
+        found += 1
+        yield passed(token_data['address'], token_data.get('name'))
+    cprint(f"⏱️ Kali: Scanned {len(candidates)} tokens in {time.time() - scan_started:.1f}s "
+           f"({SCAN_CONCURRENCY} concurrent, {BIRDEYE_RATE_LIMIT} req/s quota)", 'white', 'on_cyan')
     
-    # Filter DataFrame to only include valid tokens
-    if valid_tokens:
-        final_df = time_filtered_df[time_filtered_df['address'].isin(valid_tokens)]
-        final_df.to_csv(FINAL_SORTED_CSV, index=False)
-        cprint(f"💾 Saved {len(final_df)} tokens to {FINAL_SORTED_CSV}", 'white', 'on_green')
+    if found:
+        cprint(f"✅ Kali: {found} tokens passed all filters" + (f" - audit copy in {FINAL_SORTED_CSV}" if audit else ''), 'white', 'on_green')
     else:
         cprint("❌ No tokens passed all filters", 'white', 'on_red')
-        # Create empty DataFrame with required columns to prevent errors
-        empty_df = pd.DataFrame(columns=['address', 'timestamp'])
-        empty_df.to_csv(FINAL_SORTED_CSV, index=False)
+
+def scan_bot():
+    """Run a full scan and return the passing tokens as a DataFrame (standalone use)"""
+    async def collect():
+        return [row async for row in stream_new_tokens()]
+    return pd.DataFrame(asyncio.run(collect()))
 
 if __name__ == "__main__":
     scan_bot()
-    
\ No newline at end of file
@@ -0,0 +1,159 @@
+# indicators.py - Kali Intelligence: Vectorized OHLCV Indicator Kernel
+import sys
+import numpy as np
+from termcolor import cprint
+
+# Every function takes NumPy arrays with time on the last axis, so a single
+# series is shape (bars,) and a batch of tokens is shape (tokens, bars).
+# Batched rows must share one length - pad short series with pad_left first.
+
+
+def pad_left(values, length):
+    """
+    Repeat the first bar until there are `length` bars. Keeps the dtype (so
+    a structured candle array pads as whole candles) and returns the input
+    itself, not a copy, when it is already long enough.
+    """
+    values = np.asarray(values)
+    missing = length - values.shape[-1]
+    if missing <= 0:
+        return values
+    pad = [(0, 0)] * (values.ndim - 1) + [(missing, 0)]
+    return np.pad(values, pad, mode='edge')
+
+
+def sma(values, length):
+    """Simple moving average; NaN until `length` bars are available (same as pandas_ta.sma)"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < length:
+        return out
+    # Mean of each window directly (a cumsum difference drifts), and a flat
+    # window - e.g. the padded start of a short series - is exactly its
+    # value, as in pandas, so close > MA stays False where they are equal
+    windows = np.lib.stride_tricks.sliding_window_view(values, length, axis=-1)
+    flat = windows.min(axis=-1) == windows.max(axis=-1)
+    out[..., length - 1:] = np.where(flat, windows[..., 0], windows.mean(axis=-1))
+    return out
+
+
+def above(a, b):
+    """a > b element-wise; False wherever either side is NaN"""
+    with np.errstate(invalid='ignore'):
+        return np.greater(a, b)
+
+
+def crossovers(fast, slow):
+    """+1 where fast crosses above slow, -1 where it crosses below, 0 elsewhere"""
+    state = above(fast, slow).astype(np.int8)
+    cross = np.zeros(state.shape, dtype=np.int8)
+    cross[..., 1:] = np.diff(state, axis=-1)
+    # A bar only counts once both averages exist on it and the previous bar
+    valid = ~(np.isnan(fast) | np.isnan(slow))
+    cross[..., 1:] *= valid[..., 1:] & valid[..., :-1]
+    return cross
+
+
+def fraction_true(flags, window):
+    """Share of True flags over the last `window` bars"""
+    return np.asarray(flags)[..., -window:].sum(axis=-1) / window
+
+
+def strictly_increasing(values):
+    """True if every bar is above the previous one (higher highs / higher lows)"""
+    return (np.diff(values, axis=-1) > 0).all(axis=-1)
+
+
+def increasing_run(values):
+    """Length in bars of the strictly increasing run ending at the last bar"""
+    rising = np.diff(values, axis=-1) > 0
+    # Distance back to the last non-rising step, found from the reversed mask
+    broken = ~rising[..., ::-1]
+    first_break = np.where(broken.any(axis=-1), broken.argmax(axis=-1), rising.shape[-1])
+    return first_break + 1
+
+
+def above_mid_range(close):
+    """Last close above the midpoint of the highest and lowest close"""
+    close = np.asarray(close, dtype=float)
+    return close[..., -1] > (close.max(axis=-1) + close.min(axis=-1)) / 2
+
+
+def analyze_candles(open_, high, low, close, fast=20, slow=40, window=30):
+    """
+    Trend summary for one series or a batch (see module note on shapes).
+    Returns a dict of scalars / per-token arrays:
+      higher_highs, higher_lows, price_increase_from_launch,
+      price_above_avg_close, MA20, MA40 (last values), the share of the last
+      `window` bars with price above each MA and MA20 above MA40, the last
+      MA crossover direction and the current rising-close run.
+    """
+    close = np.asarray(close, dtype=float)
+    ma_fast = sma(close, fast)
+    ma_slow = sma(close, slow)
+    cross = crossovers(ma_fast, ma_slow)
+    nonzero = cross != 0
+    last_cross_at = np.where(nonzero.any(axis=-1), cross.shape[-1] - 1 - nonzero[..., ::-1].argmax(axis=-1), -1)
+    last_cross = np.where(last_cross_at >= 0, np.take_along_axis(cross, np.maximum(last_cross_at, 0)[..., None], axis=-1)[..., 0], 0)
+    return {
+        'higher_highs': strictly_increasing(high),
+        'higher_lows': strictly_increasing(low),
+        'price_increase_from_launch': close[..., -1] > np.asarray(open_, dtype=float)[..., 0],
+        'price_above_avg_close': above_mid_range(close),
+        'MA20': ma_fast[..., -1],
+        'MA40': ma_slow[..., -1],
+        'Price_above_MA20': above(close, ma_fast)[..., -1],
+        'Price_above_MA40': above(close, ma_slow)[..., -1],
+        'MA20_above_MA40': above(ma_fast, ma_slow)[..., -1],
+        'price_above_ma20_share': fraction_true(above(close, ma_fast), window),
+        'price_above_ma40_share': fraction_true(above(close, ma_slow), window),
+        'ma20_above_ma40_share': fraction_true(above(ma_fast, ma_slow), window),
+        'last_crossover': last_cross,
+        'bars_since_crossover': np.where(last_cross_at >= 0, cross.shape[-1] - 1 - last_cross_at, -1),
+        'rising_close_run': increasing_run(close),
+        'num_bars': close.shape[-1]
+    }
+
+
+def check_against_pandas(samples=500, seed=7):
+    """
+    Compare sma / above / analyze_candles with pandas rolling().mean() on
+    flat, padded and random series; returns the number of mismatches
+    """
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    series = [np.r_[np.full(30, 100.1), 100.1 + np.arange(1, 30) * 0.37], np.full(60, 0.000123)]
+    for i in range(samples):
+        bars = int(rng.integers(3, 80))
+        close = np.cumsum(rng.normal(0, 1, bars)) * rng.choice([1e-6, 1e-3, 1]) + rng.choice([0.000123, 100.1, 5e4])
+        if i % 4 == 0:
+            close[:bars // 2] = close[0]  # Flat stretch
+        series.append(pad_left(close, 40))
+
+    mismatches = 0
+    for close in series:
+        frame = pd.Series(close)
+        ma20 = frame.rolling(20).mean().to_numpy()
+        ma40 = frame.rolling(40).mean().to_numpy()
+        result = analyze_candles(close, close, close, close)
+        checks = (
+            np.array_equal(np.isnan(ma20), np.isnan(sma(close, 20))),
+            np.array_equal(above(close, ma20), above(close, sma(close, 20))),
+            np.array_equal(above(close, ma40), above(close, sma(close, 40))),
+            np.isclose(fraction_true(above(close, ma20), 30), result['price_above_ma20_share']),
+            np.isclose(fraction_true(above(close, ma40), 30), result['price_above_ma40_share']),
+            np.isclose(fraction_true(above(ma20, ma40), 30), result['ma20_above_ma40_share']),
+        )
+        mismatches += not all(checks)
+
+    color = 'green' if mismatches == 0 else 'red'
+    cprint(f"🧪 Kali Indicators: {len(series)} series vs pandas rolling mean - {mismatches} mismatches", color)
+    return mismatches
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        sys.exit(1 if check_against_pandas() else 0)
+    else:
+        print("Usage:")
+        print("  python indicators.py check   # Compare against pandas rolling().mean() on flat / padded / random series")
@@ -10,10 +10,11 @@ from datetime import datetime, timedelta
 import pandas as pd
 from termcolor import cprint
 import nice_funcs as n
+from deployer_index import get_deployer_index
+from vetting_profiler import get_vetting_profiler, reason_category
 
 class IntelligenceManager:
     def __init__(self):
-        self.deployer_blacklist_file = './data/deployer_blacklist.txt'
         self.rejections_file = './data/intelligence_rejections.txt'
         self.snipes_file = './data/speed_engine_snipes.txt'
         
@@ -33,6 +34,10 @@ class IntelligenceManager:
         cprint(f"   Security failures: {rejection_stats['security']}", 'red')
         cprint(f"   Liquidity failures: {rejection_stats['liquidity']}", 'red')
         cprint(f"   Deployer blacklisted: {rejection_stats['deployer']}", 'red')
+        cprint(f"   Token too old: {rejection_stats['age']}", 'red')
+        cprint(f"   Missing / failed data: {rejection_stats['data']}", 'red')
+        if rejection_stats['other']:
+            cprint(f"   Uncategorized (older log lines): {rejection_stats['other']}", 'red')
         
         # Success stats
         success_stats = self.get_success_stats()
@@ -43,22 +48,13 @@ class IntelligenceManager:
     def get_blacklist_count(self):
         """Count blacklisted deployers"""
         try:
-            if not os.path.exists(self.deployer_blacklist_file):
-                return 0
-            
-            count = 0
-            with open(self.deployer_blacklist_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        count += 1
-            return count
+            return len(get_deployer_index())
         except Exception:
             return 0
     
     def get_rejection_stats(self):
         """Get rejection statistics"""
-        stats = {'total': 0, 'security': 0, 'liquidity': 0, 'deployer': 0}
+        stats = {'total': 0, 'security': 0, 'liquidity': 0, 'deployer': 0, 'age': 0, 'data': 0, 'other': 0}
         
         try:
             if not os.path.exists(self.rejections_file):
@@ -76,7 +72,8 @@ class IntelligenceManager:
                             
                             if timestamp >= cutoff_time:
                                 stats['total'] += 1
-                                # Could add more detailed categorization here
+                                reason = parts[3] if len(parts) > 3 else None
+                                stats[reason_category(reason)] += 1
                                 
                     except Exception:
                         continue
@@ -142,22 +139,13 @@ class IntelligenceManager:
         cprint("🚫 DEPLOYER BLACKLIST", 'white', 'on_red', attrs=['bold'])
         
         try:
-            if not os.path.exists(self.deployer_blacklist_file):
-                cprint("   No blacklist file found", 'yellow')
-                return
-                
-            with open(self.deployer_blacklist_file, 'r') as f:
-                lines = f.readlines()
+            entries = get_deployer_index().entries()
                 
             blacklisted_count = 0
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    parts = line.split(',')
-                    address = parts[0].strip()
-                    reason = parts[1].strip() if len(parts) > 1 else "no reason given"
-                    cprint(f"   {address[-6:]}...{address[:6]} - {reason}", 'red')
-                    blacklisted_count += 1
+            for address, (reason, timestamp) in entries.items():
+                added = f" (added {datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')})" if timestamp else ""
+                cprint(f"   {address[-6:]}...{address[:6]} - {reason}{added}", 'red')
+                blacklisted_count += 1
                     
             if blacklisted_count == 0:
                 cprint("   No deployers currently blacklisted", 'yellow')
@@ -207,6 +195,43 @@ class IntelligenceManager:
         except Exception as e:
             cprint(f"❌ Error reading rejections: {e}", 'red')
 
+    def show_profile(self, hours=24):
+        """Where vetting time goes: percentiles per stage and per data source"""
+        cprint(f"⏱️ VETTING PROFILE (Last {hours} hours)", 'white', 'on_blue', attrs=['bold'])
+        
+        try:
+            profiler = get_vetting_profiler()
+            records = profiler.load(hours)
+            if not records:
+                cprint(f"   No profile records in {profiler.path}", 'yellow')
+                return
+            summary = profiler.summarize(records)
+            
+            verdicts = ', '.join(f"{verdict} {count}" for verdict, count in summary['verdicts'].items())
+            cprint(f"\n   Tokens vetted: {summary['tokens']} ({verdicts})", 'cyan')
+            
+            def row(name, q, extra=""):
+                cprint(f"   {name:<14} {q['count']:>6}  p50 {q['p50']:7.3f}s  p95 {q['p95']:7.3f}s  p99 {q['p99']:7.3f}s  max {q['max']:7.3f}s{extra}", 'cyan')
+            
+            cprint("\n📊 Time to verdict:", 'white', 'on_cyan')
+            row("total", summary['total'])
+            
+            cprint("\n🔬 Stages (wall time until the stage's verdict):", 'white', 'on_cyan')
+            for name, q in sorted(summary['stages'].items(), key=lambda item: -item[1]['p95']):
+                row(name, q)
+            
+            cprint("\n🌐 Fetches (wall time incl. retries):", 'white', 'on_cyan')
+            for source, q in sorted(summary['fetches'].items(), key=lambda item: -item[1]['p95']):
+                row(source, q, f"  attempts avg {q['avg_attempts']:.2f} max {q['max_attempts']}")
+            
+            if summary['rules']:
+                cprint("\n🚫 Failing rules:", 'white', 'on_red')
+                for rule, count in summary['rules'].items():
+                    cprint(f"   {rule:<30} {count:>6}  ({reason_category(rule)})", 'red')
+                    
+        except Exception as e:
+            cprint(f"❌ Error reading vetting profile: {e}", 'red')
+
 def main():
     """Main CLI interface"""
     manager = IntelligenceManager()
@@ -217,6 +242,7 @@ def main():
         cprint("  python intelligence_manager.py stats              # Show statistics", 'cyan')
         cprint("  python intelligence_manager.py blacklist          # View deployer blacklist", 'cyan')
         cprint("  python intelligence_manager.py rejections         # View recent rejections", 'cyan')
+        cprint("  python intelligence_manager.py profile [hours]    # Vetting time per stage (p50/p95/p99)", 'cyan')
         cprint("  python intelligence_manager.py add <address> <reason>  # Add deployer to blacklist", 'cyan')
         cprint("\nExamples:", 'white')
         cprint("  python intelligence_manager.py add [DEPLOYER_ADDRESS] rug_pull", 'yellow')
@@ -230,6 +256,9 @@ def main():
         manager.view_blacklist()
     elif command == "rejections":
         manager.view_recent_rejections()
+    elif command == "profile":
+        hours = float(sys.argv[2]) if len(sys.argv) > 2 else 24
+        manager.show_profile(hours)
     elif command == "add":
         if len(sys.argv) < 3:
             cprint("❌ Error: Deployer address required", 'red')
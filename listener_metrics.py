@@ -0,0 +1,259 @@
+# listener_metrics.py - Kali Speed Engine: Listener Lag & Throughput Telemetry
+import asyncio
+import bisect
+import json
+import time
+from termcolor import cprint
+from config import *
+from birdeye_cache import get_birdeye_cache
+
+# Solana targets ~400ms per slot; used to extrapolate the chain tip between getSlot polls
+SLOT_DURATION_SECONDS = 0.4
+
+
+class Histogram:
+    """Fixed-bucket histogram with cheap approximate quantiles"""
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for i, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+
+
+class ListenerMetrics:
+    """
+    Live counters and histograms for the speed engine listener, exposed on a
+    local HTTP endpoint (/metrics Prometheus text, /json snapshot) and as a
+    periodic one-line summary.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.frames = 0
+        self.pool_hits = 0
+        self.dedup_hits = 0
+        self.chain_slot = None
+        self.chain_slot_at = None
+        self.loop_lag = Histogram([0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0])
+        self.slot_lag = Histogram([0, 1, 2, 3, 5, 10, 20, 50, 100])
+        self.work_queue = None
+        self.dedup = None
+        self.fan_in = None
+        self.backfiller = None
+        self.revet = None
+        self._last_rate_at = time.time()
+        self._last_rate_frames = 0
+        self.messages_per_sec = 0.0
+        self._tasks = []
+        self._server = None
+
+    def attach(self, work_queue=None, dedup=None, fan_in=None, backfiller=None, revet=None):
+        """Link the components whose own stats are folded into the snapshot"""
+        self.work_queue = work_queue
+        self.dedup = dedup
+        self.fan_in = fan_in
+        self.backfiller = backfiller
+        self.revet = revet
+
+    # === Hooks called from the listener hot path ===
+
+    def record_frame(self):
+        self.frames += 1
+
+    def record_pool_hit(self, event):
+        self.pool_hits += 1
+        tip = self.estimated_chain_slot()
+        if tip is not None and event.slot is not None:
+            self.slot_lag.observe(max(0, tip - event.slot))
+
+    def record_dedup_hit(self):
+        self.dedup_hits += 1
+
+    # === Background samplers ===
+
+    def estimated_chain_slot(self):
+        """Last polled slot extrapolated forward by wall-clock time"""
+        if self.chain_slot is None:
+            return None
+        return self.chain_slot + int((time.time() - self.chain_slot_at) / SLOT_DURATION_SECONDS)
+
+    async def _sample_loop_lag(self, interval):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lag.observe(max(0.0, time.perf_counter() - start - interval))
+
+    async def _poll_chain_slot(self, rpc_client, interval):
+        while True:
+            try:
+                data = await rpc_client.get_slot(commitment="processed")
+                if isinstance(data.get('result'), int):
+                    self.chain_slot = data['result']
+                    self.chain_slot_at = time.time()
+            except Exception as e:
+                cprint(f"⚠️ Kali Speed Engine: Slot poll failed: {e}", 'yellow')
+            await asyncio.sleep(interval)
+
+    async def _print_summaries(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            cprint(self.summary_line(), 'blue')
+            if self.fan_in is not None and len(self.fan_in.endpoints) > 1:
+                cprint(f"🏁 Kali Speed Engine: Endpoint race - {self.fan_in.summary()}", 'blue')
+            cprint(f"🗃️ Kali Speed Engine: {get_birdeye_cache().summary()}", 'blue')
+
+    def start(self, rpc_client=None):
+        """Start samplers, the periodic summary and (if enabled) the HTTP endpoint"""
+        self._tasks.append(asyncio.create_task(self._sample_loop_lag(LOOP_LAG_SAMPLE_INTERVAL)))
+        self._tasks.append(asyncio.create_task(self._print_summaries(METRICS_SUMMARY_INTERVAL)))
+        if rpc_client is not None:
+            self._tasks.append(asyncio.create_task(self._poll_chain_slot(rpc_client, SLOT_POLL_INTERVAL)))
+        if METRICS_HTTP_ENABLED:
+            self._tasks.append(asyncio.create_task(self._serve_http(METRICS_HTTP_HOST, METRICS_HTTP_PORT)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    # === Reporting ===
+
+    def _update_rate(self):
+        now = time.time()
+        elapsed = now - self._last_rate_at
+        if elapsed >= 1.0:
+            self.messages_per_sec = (self.frames - self._last_rate_frames) / elapsed
+            self._last_rate_at = now
+            self._last_rate_frames = self.frames
+
+    def snapshot(self):
+        self._update_rate()
+        snapshot = {
+            'uptime_seconds': time.time() - self.started_at,
+            'frames': self.frames,
+            'messages_per_sec': self.messages_per_sec,
+            'pool_hits': self.pool_hits,
+            'classifier_hit_rate': self.pool_hits / self.frames if self.frames else 0.0,
+            'dedup_hits': self.dedup_hits,
+            'dedup_hit_rate': self.dedup_hits / self.pool_hits if self.pool_hits else 0.0,
+            'event_loop_lag_seconds': self.loop_lag.snapshot(),
+            'slot_lag': self.slot_lag.snapshot(),
+            'chain_slot': self.estimated_chain_slot()
+        }
+        if self.work_queue is not None:
+            snapshot['work_queue'] = self.work_queue.stats()
+        if self.dedup is not None:
+            snapshot['dedup_index'] = {
+                'signatures': len(self.dedup.signatures),
+                'mints': len(self.dedup.mints),
+                'mint_hits': self.dedup.mint_hits
+            }
+        if self.fan_in is not None:
+            snapshot['endpoints'] = self.fan_in.stats()
+        if self.backfiller is not None:
+            snapshot['backfill'] = self.backfiller.stats()
+        if self.revet is not None:
+            snapshot['revet'] = self.revet.stats()
+        snapshot['birdeye_cache'] = get_birdeye_cache().stats()
+        return snapshot
+
+    def summary_line(self):
+        s = self.snapshot()
+        queue = s.get('work_queue', {})
+        return (
+            f"📊 Kali Speed Engine: {s['messages_per_sec']:,.0f} msg/s | "
+            f"pool hits {s['pool_hits']} ({s['classifier_hit_rate']:.3%}) | "
+            f"dedup hits {s['dedup_hits']} | "
+            f"loop lag p95 {s['event_loop_lag_seconds']['p95'] * 1000:.0f}ms | "
+            f"queue {queue.get('depth', 0)} (peak {queue.get('peak_depth', 0)}) | "
+            f"slot lag p50 {s['slot_lag']['p50']:.0f} p95 {s['slot_lag']['p95']:.0f}"
+        )
+
+    def prometheus_text(self):
+        """Flatten the snapshot into Prometheus exposition format"""
+        lines = []
+
+        def emit(name, value):
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                lines.append(f"kali_{name} {value}")
+            elif isinstance(value, dict):
+                for key, inner in value.items():
+                    emit(f"{name}_{key}".replace('.', '_').replace(':', '_').replace('-', '_'), inner)
+
+        for key, value in self.snapshot().items():
+            emit(key, value)
+        return "\n".join(lines) + "\n"
+
+    async def _serve_http(self, host, port):
+        try:
+            self._server = await asyncio.start_server(self._handle_http, host, port)
+            cprint(f"📈 Kali Speed Engine: Metrics at http://{host}:{port}/metrics (JSON at /json)", 'cyan')
+            async with self._server:
+                await self._server.serve_forever()
+        except OSError as e:
+            cprint(f"⚠️ Kali Speed Engine: Metrics endpoint unavailable on {host}:{port}: {e}", 'yellow')
+
+    async def _handle_http(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Drain headers
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode('latin-1').split()
+            path = parts[1] if len(parts) > 1 else '/'
+
+            if path.startswith('/json'):
+                body = json.dumps(self.snapshot(), default=str).encode('utf-8')
+                content_type = 'application/json'
+                status = '200 OK'
+            elif path.startswith('/metrics') or path == '/':
+                body = self.prometheus_text().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4'
+                status = '200 OK'
+            else:
+                body = b"not found\n"
+                content_type = 'text/plain'
+                status = '404 Not Found'
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
@@ -13,11 +13,40 @@ import json
 import nice_funcs as n
 import schedule
 from datetime import datetime 
-from get_new_tokens import scan_bot  # Import scan_bot instead of ohlcv_filter
+from get_new_tokens import stream_new_tokens, CsvAudit  # Streaming scanner (scan_bot for standalone use)
 from position_tracker_v2 import EnhancedPositionTracker
 
 
 
+async def buy_from_scan():
+    """Consume the scanner stream and open a position on each token the moment it passes"""
+    # Skip tokens we already traded and closed
+    try:
+        with open(CLOSED_POSITIONS_TXT, 'r') as f:
+            closed_positions = {line.strip() for line in f.readlines()}
+    except FileNotFoundError:
+        closed_positions = set()
+
+    audit = CsvAudit(READY_TO_BUY_CSV, ['name', 'address']) if SCAN_AUDIT_CSV else None
+
+# 🍀 THIS IS WHERE THE BUYING STARTS
+    async for token in stream_new_tokens():
+        token_mint_address = token['address']
+        if token_mint_address in closed_positions:
+            continue
+        if audit:
+            audit.write(token)
+        cprint(f'🌙 Kali: Token {token["name"]} at address: {token_mint_address}', 'white', 'on_cyan')
+
+        # Blocking wallet / swap calls run off the event loop so the scan keeps going meanwhile
+        usdc_holdings = float(await asyncio.to_thread(n.get_position, USDC_CA))
+        if usdc_holdings > USDC_SIZE:
+            cprint(f'💰 Kali: USDC Balance {usdc_holdings} > {USDC_SIZE}, opening position...', 'white', 'on_blue')
+            cprint(f'📝 Token Address: {token_mint_address}', 'white', 'on_blue')
+            await asyncio.to_thread(n.open_position, token_mint_address)
+        else:
+            cprint(f'⚠️ Kali: Insufficient USDC ({usdc_holdings}), skipping position', 'white', 'on_red')
+
 def bot():
     # Get the current time
     now = datetime.now()
@@ -123,44 +152,17 @@ def bot():
             tracker_thread.start()
             cprint('✅ Position tracker thread started', 'green')
 
-    # Run token scan every time
+    # Run token scan every time - each token is bought as soon as it passes
     cprint(f'🔍 Kali: Running token scan...', 'white', 'on_cyan')
-    scan_bot()  # Run the scan_bot from get_new_tokens.py
-        
-    try:
-        df = pd.read_csv(FINAL_SORTED_CSV)
-    except Exception as e:
-        cprint(f"❌ Kali: Error reading {FINAL_SORTED_CSV}: {str(e)}", 'white', 'on_red')
-        return
-
-    # look at closed_positions.txt and if the token is there, then remove that row from the df
-    with open(CLOSED_POSITIONS_TXT, 'r') as f:
-        closed_positions = [line.strip() for line in f.readlines()]
-    df = df[~df['address'].isin(closed_positions)]
-    df.to_csv(READY_TO_BUY_CSV, index=False)
-
-    df = n.get_names(df)
-
-# 🍀 THIS IS WHERE THE BUYING STARTS
-    for index, row in df.iterrows():
-        usdc_holdings = n.get_position(USDC_CA)
-        usdc_holdings = float(usdc_holdings)
-        token_mint_address = row['address']
-        
-        if usdc_holdings > USDC_SIZE:
-            cprint(f'💰 Kali: USDC Balance {usdc_holdings} > {USDC_SIZE}, opening position...', 'white', 'on_blue')
-            cprint(f'📝 Token Address: {token_mint_address}', 'white', 'on_blue')
-            n.open_position(token_mint_address)
-        else:
-            cprint(f'⚠️ Kali: Insufficient USDC ({usdc_holdings}), skipping position', 'white', 'on_red')
+    asyncio.run(buy_from_scan())
     
     time.sleep(5)
 
 bot()
 cprint('🌙 Kali: Done with 1st run, now looping...', 'white', 'on_green')
 
-# Schedule bot to run every 120 seconds
-schedule.every(600).seconds.do(bot)
+# Schedule bot to run every SCAN_INTERVAL_SECONDS (scanner cooldowns in config.py are sized to it)
+schedule.every(SCAN_INTERVAL_SECONDS).seconds.do(bot)
 
 while True:
     try:
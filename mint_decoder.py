@@ -0,0 +1,115 @@
+# mint_decoder.py - Kali Intelligence: On-Chain SPL Mint Decoder
+import base64
+import struct
+from solders.pubkey import Pubkey
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAbS1EQ8RSwb3KzbT5r3t6Lj6"
+
+# spl_token::state::Mint (82 bytes, shared by both token programs):
+#   COption<Pubkey> mint_authority | u64 supply | u8 decimals |
+#   bool is_initialized | COption<Pubkey> freeze_authority
+MINT_SIZE = 82
+_MINT_LAYOUT = struct.Struct('<I32sQBBI32s')
+
+# Token-2022 extensions: base mint padded to the 165-byte account size,
+# one account-type byte, then TLV entries (u16 type, u16 length, value)
+_EXTENSIONS_OFFSET = 165
+_ACCOUNT_TYPE_MINT = 1
+EXTENSION_NAMES = {
+    1: 'transfer_fee_config',
+    3: 'mint_close_authority',
+    4: 'confidential_transfer_mint',
+    6: 'default_account_state',
+    9: 'non_transferable',
+    10: 'interest_bearing_config',
+    12: 'permanent_delegate',
+    14: 'transfer_hook',
+    16: 'confidential_transfer_fee_config',
+    18: 'metadata_pointer',
+    19: 'token_metadata',
+    20: 'group_pointer',
+    22: 'group_member_pointer',
+    25: 'scaled_ui_amount',
+    26: 'pausable',
+}
+
+
+def _option_pubkey(tag, key):
+    return str(Pubkey(key)) if tag == 1 else None
+
+
+def _extension_types(data):
+    """TLV extension type ids of a Token-2022 mint (empty for a plain mint)"""
+    if len(data) <= _EXTENSIONS_OFFSET or data[_EXTENSIONS_OFFSET] != _ACCOUNT_TYPE_MINT:
+        return []
+    types = []
+    offset = _EXTENSIONS_OFFSET + 1
+    while offset + 4 <= len(data):
+        ext_type, length = struct.unpack_from('<HH', data, offset)
+        if ext_type == 0:
+            break  # Uninitialized padding
+        types.append(ext_type)
+        offset += 4 + length
+    return types
+
+
+def decode_mint(data, owner):
+    """
+    Decode raw mint account bytes owned by `owner`.
+
+    Field names follow Birdeye's token_security payload where they overlap
+    (freezeAuthority, isToken2022, mintable, freezable, transferFees) so the
+    same rules apply to both sources.
+    Raises ValueError for accounts that are not SPL mints.
+    """
+    if owner not in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID):
+        raise ValueError(f"account is owned by {owner}, not a token program")
+    if len(data) < MINT_SIZE:
+        raise ValueError(f"account data is {len(data)} bytes, expected at least {MINT_SIZE}")
+
+    mint_tag, mint_key, supply, decimals, initialized, freeze_tag, freeze_key = _MINT_LAYOUT.unpack_from(data)
+    if not initialized:
+        raise ValueError("mint is not initialized")
+
+    is_token_2022 = owner == TOKEN_2022_PROGRAM_ID
+    extension_types = _extension_types(data) if is_token_2022 else []
+    mint_authority = _option_pubkey(mint_tag, mint_key)
+    freeze_authority = _option_pubkey(freeze_tag, freeze_key)
+    return {
+        'programId': owner,
+        'mintAuthority': mint_authority,
+        'freezeAuthority': freeze_authority,
+        'supply': supply,
+        'decimals': decimals,
+        'mintable': mint_authority is not None,
+        'freezable': freeze_authority is not None,
+        'isToken2022': is_token_2022,
+        'extensions': [EXTENSION_NAMES.get(ext, f'unknown_{ext}') for ext in extension_types],
+        'transferFees': 1 in extension_types,
+    }
+
+
+def decode_account_info(response):
+    """
+    getAccountInfo (base64 encoding) response -> (mint dict, None) or (None, error message)
+    """
+    if 'error' in response:
+        return None, f"getAccountInfo error: {response['error'].get('message', response['error'])}"
+    value = (response.get('result') or {}).get('value')
+    if value is None:
+        return None, "mint account not found"
+    try:
+        encoded = value['data'][0]
+        return decode_mint(base64.b64decode(encoded), value.get('owner')), None
+    except (KeyError, IndexError, TypeError, ValueError, struct.error) as e:
+        return None, f"could not decode mint account: {e}"
+
+
+async def fetch_mint(rpc_client, mint_address, commitment="processed"):
+    """One getAccountInfo round-trip -> (mint dict, None) or (None, error message)"""
+    try:
+        response = await rpc_client.get_account_info(mint_address, encoding="base64", commitment=commitment)
+    except Exception as e:
+        return None, f"getAccountInfo failed: {e}"
+    return decode_account_info(response)
@@ -14,6 +14,8 @@ from solders.keypair import Keypair
 from solders.transaction import VersionedTransaction
 from solana.rpc.api import Client
 from solana.rpc.types import TxOpts, Commitment 
+from birdeye_cache import birdeye_get
+from deployer_index import get_deployer_index
 
 def create_keypair_from_key(key_data):
     """
@@ -52,14 +54,11 @@ def get_sol_balance(wallet_address):
             if 'result' in data:
                 sol_amount = data['result']['value'] / 1000000000  # Convert lamports to SOL
                 
-                # Get SOL price from Birdeye (this endpoint works with basic API)
-                price_url = "https://public-api.birdeye.so/defi/price?address=So11111111111111111111111111111111111111112"
-                price_headers = {"X-API-KEY": d.birdeye}
-                price_response = requests.get(price_url, headers=price_headers)
+                # Get SOL price from Birdeye (this endpoint works with basic API, cached)
+                price_status, price_data = birdeye_get("price", "So11111111111111111111111111111111111111112")
                 
                 usd_value = None
-                if price_response.status_code == 200:
-                    price_data = price_response.json()
+                if price_status == 200:
                     if price_data.get('success'):
                         sol_price = price_data.get('data', {}).get('value', 0)
                         usd_value = sol_amount * sol_price
@@ -75,14 +74,10 @@ def ask_bid(token_mint_address):
 
     ''' this returns the price '''
 
-    API_KEY = d.birdeye
-    
-    url = f"https://public-api.birdeye.so/defi/price?address={token_mint_address}"
-    headers = {"X-API-KEY": API_KEY}
-    response = requests.get(url, headers=headers)
+    # Shared Birdeye cache: repeated lookups within the price TTL cost no API call
+    status, json_response = birdeye_get("price", token_mint_address)
     
-    if response.status_code == 200:
-        json_response = response.json()  # Parse the JSON response
+    if status == 200:
         if 'data' in json_response and 'value' in json_response['data']:
             return json_response['data']['value']  # Return the price value
         else:
@@ -97,13 +92,8 @@ def security_check(address):
     - Freeze authority, top holder %, mutable metadata, token type
     '''
 
-    API_KEY = d.birdeye
-
-    url = f"https://public-api.birdeye.so/defi/token_security?address={address}"
-    headers = {"X-API-KEY": API_KEY}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        security_data = response.json()  # Return the JSON response if the call is successful
+    status, security_data = birdeye_get("token_security", address)
+    if status == 200:
         if security_data and 'data' in security_data:
             # Check if the token is freezeable (has freeze authority)
             if security_data['data'].get('freezeable', False):
@@ -111,7 +101,7 @@ def security_check(address):
                 return None  # Return None to indicate the token should be dropped
         return security_data
     else:
-        print(f"* {address[-4:]} security check failed (HTTP {response.status_code}). Dropping.")
+        print(f"* {address[-4:]} security check failed (HTTP {status}). Dropping.")
         return None  # Return None if there's an error with the API call
 
 
@@ -121,282 +111,13 @@ def pre_trade_token_vetting(token_address, birdeye_api_key, helius_rpc_url):
     
     This function combines security checks, liquidity analysis, and deployer history
     to instantly filter out scams and low-quality tokens before execution.
+    Blocking wrapper around token_vetting.vet_token, which fetches security and
+    overview data concurrently - async callers should await vet_token directly.
     
     Returns True if the token passes all checks, False otherwise.
     """
-    cprint(f"🔬 Kali Intelligence: Vetting token {token_address[-6:]}", 'yellow', attrs=['bold'])
-
-    # === Birdeye Security Check ===
-    max_retries = 8  # Increased to handle very new tokens
-    retry_delay = 5.0  # Longer initial delay for better success rate
-    
-    for attempt in range(max_retries):
-        try:
-            sec_url = f"https://public-api.birdeye.so/defi/token_security?address={token_address}"
-            sec_headers = {"X-API-KEY": birdeye_api_key}
-            sec_response = requests.get(sec_url, headers=sec_headers, timeout=8)
-            
-            if sec_response.status_code == 200:
-                # Success! Break out of retry loop
-                break
-            elif sec_response.status_code in [555, 404, 500, 502, 503]:
-                # These codes suggest data not ready yet - retry
-                if attempt < max_retries - 1:
-                    cprint(f"   ⏳ Token data not ready (Code: {sec_response.status_code}), retrying in {retry_delay}s... (attempt {attempt + 1})", 'yellow')
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5  # Exponential backoff
-                    continue
-                else:
-                    cprint(f"   🚨 VETTING FAILED: Birdeye security API error after {max_retries} attempts (Code: {sec_response.status_code})", 'red')
-                    return False
-            else:
-                # Other errors (rate limit, auth, etc.) - fail immediately
-                cprint(f"   🚨 VETTING FAILED: Birdeye security API error (Code: {sec_response.status_code})", 'red')
-                return False
-                
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                cprint(f"   ⏳ Network error, retrying in {retry_delay}s... (attempt {attempt + 1}): {e}", 'yellow')
-                time.sleep(retry_delay)
-                retry_delay *= 1.5
-                continue
-            else:
-                cprint(f"   🚨 VETTING FAILED: Network error after {max_retries} attempts: {e}", 'red')
-                return False
-    
-    # Process the successful response
-    security_data = sec_response.json().get('data', {})
-    if not security_data:
-        cprint("   🚨 VETTING FAILED: No security data returned from Birdeye", 'red')
-        return False
-
-    # === CRITICAL SEVERITY SECURITY FILTERS ===
-    # Based on official Birdeye Security Documentation: https://docs.birdeye.so/docs/security
-    
-    # 1. Fake Token Check (Critical)
-    if REJECT_FAKE_TOKENS and security_data.get('fakeToken'):
-        cprint("   🚨 VETTING FAILED: FAKE TOKEN - Scam/imitation detected", 'red')
-        return False
-    
-    # 2. Ownership Renounced Check (Critical) 
-    if not security_data.get('ownershipRenounced', False):
-        if REJECT_NON_RENOUNCED_OWNERSHIP:
-            cprint("   🚨 VETTING FAILED: OWNERSHIP NOT RENOUNCED - Owner can change parameters", 'red')
-            return False
-        else:
-            cprint("   ⚠️ WARNING: OWNERSHIP NOT RENOUNCED - Owner retains control (RISK ACCEPTED)", 'red')
-    
-    # 3. Honeypot Check (Critical)
-    if REJECT_HONEYPOTS and security_data.get('honeypot'):
-        cprint("   🚨 VETTING FAILED: HONEYPOT - Buyers cannot sell", 'red')
-        return False
-    
-    # 4. Freezable Token Check (Critical)
-    if REJECT_FREEZABLE_TOKENS and security_data.get('freezable'):
-        cprint("   🚨 VETTING FAILED: FREEZABLE - Can freeze token transfers", 'red')
-        return False
-        
-    # 5. Freeze Authority Check (Critical)
-    if REJECT_FREEZABLE_TOKENS and security_data.get('freezeAuthority') is not None:
-        cprint("   🚨 VETTING FAILED: FREEZE AUTHORITY EXISTS", 'red')
-        return False
-    
-    # 6. Token 2022 Check (Critical)
-    if REJECT_TOKEN_2022 and security_data.get('isToken2022'):
-        cprint("   🚨 VETTING FAILED: TOKEN 2022 PROGRAM - Experimental standard", 'red')
-        return False
-
-    # === HIGH RISK SECURITY FILTERS ===
-    
-    # 7. Mintable Token Check (High Risk)
-    if REJECT_MINTABLE_TOKENS and security_data.get('mintable'):
-        cprint("   🚨 VETTING FAILED: MINTABLE - Can create infinite supply", 'red')
-        return False
-    
-    # 8. Mutable Metadata Check (High Risk)
-    if security_data.get('mutableMetadata'):
-        if REJECT_MUTABLE_METADATA:
-            cprint("   🚨 VETTING FAILED: MUTABLE METADATA - Can change name/logo", 'red')
-            return False
-        else:
-            cprint("   ⚠️ INFO: MUTABLE METADATA detected - Token can change name/logo (allowed)", 'yellow')
-    
-    # 9. Transfer Fees Check (High Risk)
-    if REJECT_TRANSFER_FEES and security_data.get('transferFees'):
-        cprint("   🚨 VETTING FAILED: TRANSFER FEES - Charges fees on transfers", 'red')
-        return False
-    
-    # 10. Buy Tax Check (High Risk)
-    buy_tax = security_data.get('buyTax', 0)
-    if buy_tax is not None and isinstance(buy_tax, (int, float)) and buy_tax > MAX_BUY_TAX:
-        cprint(f"   🚨 VETTING FAILED: BUY TAX {buy_tax:.1%} > {MAX_BUY_TAX:.1%}", 'red')
-        return False
-    
-    # 11. Sell Tax Check (High Risk)
-    sell_tax = security_data.get('sellTax', 0)
-    if sell_tax is not None and isinstance(sell_tax, (int, float)) and sell_tax > MAX_SELL_TAX:
-        cprint(f"   🚨 VETTING FAILED: SELL TAX {sell_tax:.1%} > {MAX_SELL_TAX:.1%}", 'red')
-        return False
-    
-    # 12. Owner Percentage Check (High Risk)
-    owner_pct = security_data.get('ownerPercentage', 0)
-    if owner_pct is not None and isinstance(owner_pct, (int, float)) and owner_pct > MAX_OWNER_PERCENTAGE:
-        cprint(f"   🚨 VETTING FAILED: OWNER HOLDS {owner_pct:.1%} > {MAX_OWNER_PERCENTAGE:.1%}", 'red')
-        return False
-    
-    # 13. Update Authority Percentage Check (High Risk)
-    ua_pct = security_data.get('updateAuthorityPercentage', 0)
-    if ua_pct is not None and isinstance(ua_pct, (int, float)) and ua_pct > MAX_UPDATE_AUTHORITY_PERCENTAGE:
-        cprint(f"   🚨 VETTING FAILED: UPDATE AUTHORITY HOLDS {ua_pct:.1%} > {MAX_UPDATE_AUTHORITY_PERCENTAGE:.1%}", 'red')
-        return False
-    
-    # 14. Top 10 Holders Check (High Risk)
-    top_10_pct = security_data.get('top10HolderPercent', 1.0)
-    if top_10_pct is not None and isinstance(top_10_pct, (int, float)) and top_10_pct > MAX_TOP10_HOLDER_PERCENT:
-        cprint(f"   🚨 VETTING FAILED: TOP 10 HOLDERS {top_10_pct:.1%} > {MAX_TOP10_HOLDER_PERCENT:.1%}", 'red')
-        return False
-
-    # === MEDIUM RISK FILTERS ===
-    
-    # 15. Mutable Info Check (Medium Risk)
-    if security_data.get('mutableInfo'):
-        if not ALLOW_MUTABLE_INFO:
-            cprint("   ⚠️ VETTING FAILED: MUTABLE INFO - Token info can be changed", 'yellow')
-            return False
-        else:
-            cprint("   ℹ️ INFO: MUTABLE INFO detected - Additional token info can be changed (allowed)", 'cyan')
-        
-    cprint("   ✅ ALL SECURITY CHECKS PASSED", 'green')
-        
-    # === Birdeye Market Overview Check ===
-    max_retries_overview = 8  # Increased to handle very new tokens
-    retry_delay_overview = 5.0  # Longer initial delay for better success rate
-    
-    for attempt in range(max_retries_overview):
-        try:
-            overview_url = f"https://public-api.birdeye.so/defi/token_overview?address={token_address}"
-            overview_headers = {"X-API-KEY": birdeye_api_key}
-            overview_response = requests.get(overview_url, headers=overview_headers, timeout=8)
-            
-            if overview_response.status_code == 200:
-                # Success! Break out of retry loop
-                break
-            elif overview_response.status_code in [555, 404, 500, 502, 503]:
-                # These codes suggest data not ready yet - retry
-                if attempt < max_retries_overview - 1:
-                    cprint(f"   ⏳ Overview data not ready (Code: {overview_response.status_code}), retrying in {retry_delay_overview}s... (attempt {attempt + 1})", 'yellow')
-                    time.sleep(retry_delay_overview)
-                    retry_delay_overview *= 1.5  # Exponential backoff
-                    continue
-                else:
-                    cprint(f"   🚨 VETTING FAILED: Birdeye overview API error after {max_retries_overview} attempts (Code: {overview_response.status_code})", 'red')
-                    return False
-            else:
-                # Other errors (rate limit, auth, etc.) - fail immediately
-                cprint(f"   🚨 VETTING FAILED: Birdeye overview API error (Code: {overview_response.status_code})", 'red')
-                return False
-                
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries_overview - 1:
-                cprint(f"   ⏳ Network error on overview, retrying in {retry_delay_overview}s... (attempt {attempt + 1}): {e}", 'yellow')
-                time.sleep(retry_delay_overview)
-                retry_delay_overview *= 1.5
-                continue
-            else:
-                cprint(f"   🚨 VETTING FAILED: Network error during overview check after {max_retries_overview} attempts: {e}", 'red')
-                return False
-    
-    # Process the successful overview response
-    overview_data = overview_response.json().get('data', {})
-    if not overview_data:
-        cprint("   🚨 VETTING FAILED: No overview data returned from Birdeye", 'red')
-        return False
-        
-    liquidity = overview_data.get('liquidity', 0)
-    market_cap = overview_data.get('mc', 0)
-    
-    # Ensure values are never None
-    if liquidity is None:
-        liquidity = 0
-    if market_cap is None:
-        market_cap = 0
-    
-    # --- Market Quality Checks ---
-    if isinstance(liquidity, (int, float)) and liquidity < MIN_LIQUIDITY:
-        cprint(f"   🚨 VETTING FAILED: Insufficient liquidity (${liquidity:,.2f} < ${MIN_LIQUIDITY:,.2f})", 'red')
-        return False
-        
-    if isinstance(market_cap, (int, float)) and market_cap > MAX_MARKET_CAP:
-        cprint(f"   🚨 VETTING FAILED: Market cap too high (${market_cap:,.2f} > ${MAX_MARKET_CAP:,.2f})", 'red')
-        return False
-
-    cprint(f"   ✅ Market checks passed (Liquidity: ${liquidity:,.0f}, MC: ${market_cap:,.0f})", 'green')
-
-    # === TOKEN AGE CHECK (Prevent trading old tokens) ===
-    try:
-        creation_time = overview_data.get('creation_time') or overview_data.get('createdAt')
-        if creation_time:
-            import time
-            current_time = time.time()
-            # Convert creation_time to timestamp if it's a string
-            if isinstance(creation_time, str):
-                from datetime import datetime
-                try:
-                    # Try parsing various date formats
-                    creation_timestamp = datetime.fromisoformat(creation_time.replace('Z', '+00:00')).timestamp()
-                except:
-                    # If parsing fails, try other common formats
-                    try:
-                        creation_timestamp = datetime.strptime(creation_time, "%Y-%m-%dT%H:%M:%S.%fZ").timestamp()
-                    except:
-                        creation_timestamp = None
-            else:
-                creation_timestamp = creation_time
-            
-            if creation_timestamp:
-                token_age_hours = (current_time - creation_timestamp) / 3600
-                
-                # Reject tokens older than configured limit
-                from config import MAX_TOKEN_AGE_HOURS
-                if token_age_hours > MAX_TOKEN_AGE_HOURS:
-                    cprint(f"   🚨 VETTING FAILED: Token too old ({token_age_hours:.1f}h > {MAX_TOKEN_AGE_HOURS}h)", 'red')
-                    return False
-                else:
-                    cprint(f"   ✅ Token age check passed: {token_age_hours:.1f}h old", 'green')
-            else:
-                # If we can't parse creation time, check other indicators for OLD tokens
-                if liquidity > 1000000 or market_cap > 1000000:  # $1M+ suggests old token
-                    cprint(f"   🚨 VETTING FAILED: High liquidity/MC suggests old token (Liq: ${liquidity:,.0f}, MC: ${market_cap:,.0f})", 'red')
-                    return False
-                else:
-                    # For NEW tokens: No age data is NORMAL - they're too new for Birdeye to have indexed yet
-                    cprint(f"   ✅ Token age check: No age data (likely very new token) - proceeding", 'green')
-        else:
-            # NEW LOGIC: For Speed Engine detections, NO age data often means VERY NEW token
-            # Check if this is a reasonable new token based on liquidity/MC
-            if liquidity > 1000000 or market_cap > 1000000:  # $1M+ suggests old token
-                cprint(f"   🚨 VETTING FAILED: High liquidity/MC without age data suggests old token (Liq: ${liquidity:,.0f}, MC: ${market_cap:,.0f})", 'red')
-                return False
-            else:
-                # Low liquidity + no age data = likely VERY NEW token from Speed Engine
-                cprint(f"   ✅ Token age check: No age data but low liquidity/MC - likely fresh token", 'green')
-                cprint(f"   Liquidity: ${liquidity:,.0f}, MC: ${market_cap:,.0f} (proceeding)", 'cyan')
-    except Exception as age_error:
-        cprint(f"   ⚠️ Token age check error: {age_error} (proceeding anyway for new tokens)", 'yellow')
-
-    # === Deployer History Check ===
-    deployer = get_deployer_address(token_address, birdeye_api_key)
-    if check_deployer_blacklist(deployer):
-        # The check_deployer_blacklist function already prints the reason
-        return False
-
-    if deployer:
-        cprint(f"   ✅ Deployer check passed: {deployer[-6:]}", 'green')
-    else:
-        cprint("   ⚠️ Could not verify deployer (proceeding anyway)", 'yellow')
-
-    cprint(f"   🎯 INTELLIGENCE VETTING PASSED: Token {token_address[-6:]} approved for trading!", 'white', 'on_green', attrs=['bold'])
-    return True
+    from token_vetting import vet_token_sync
+    return vet_token_sync(token_address, birdeye_api_key)
 
 
 def get_deployer_address(token_address, birdeye_api_key):
@@ -405,11 +126,10 @@ def get_deployer_address(token_address, birdeye_api_key):
     Returns the deployer address or None if unavailable.
     """
     try:
-        url = f"https://public-api.birdeye.so/defi/token_security?address={token_address}"
-        headers = {"X-API-KEY": birdeye_api_key}
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            data = response.json().get('data', {})
+        # Same cache entry as security_check / vetting, so usually no extra request
+        status, body = birdeye_get("token_security", token_address, timeout=5)
+        if status == 200:
+            data = body.get('data') or {}
             return data.get('creatorAddress') or data.get('deployer')
     except Exception as e:
         cprint(f"   ⚠️ Could not get deployer address: {e}", 'yellow')
@@ -420,31 +140,17 @@ def check_deployer_blacklist(deployer_address):
     """
     Checks if a deployer wallet is on the blacklist.
     Returns True if blacklisted, False otherwise.
+    O(1) lookup in the in-memory deployer index (re-read only when the file changes).
     """
     if not deployer_address:
         return False  # Can't check a null address
         
     try:
-        import os
-        blacklist_file = './data/deployer_blacklist.txt'
-        
-        if not os.path.exists(blacklist_file):
-            # Create empty blacklist file if it doesn't exist
-            with open(blacklist_file, 'w') as f:
-                f.write("# Deployer wallet blacklist - one address per line\n")
-                f.write("# Format: wallet_address,reason\n")
-            return False
-        
-        with open(blacklist_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Handle both formats: "address" or "address,reason"
-                    blacklisted_address = line.split(',')[0].strip()
-                    if deployer_address == blacklisted_address:
-                        reason = line.split(',')[1].strip() if ',' in line else "blacklisted deployer"
-                        cprint(f"   🚨 VETTING FAILED: Deployer {deployer_address[-6:]} is blacklisted ({reason})", 'red', attrs=['bold'])
-                        return True
+        entry = get_deployer_index().lookup(deployer_address)
+        if entry:
+            reason = entry[0]
+            cprint(f"   🚨 VETTING FAILED: Deployer {deployer_address[-6:]} is blacklisted ({reason})", 'red', attrs=['bold'])
+            return True
                         
     except Exception as e:
         cprint(f"   ⚠️ Error checking deployer blacklist: {e}", 'yellow')
@@ -461,20 +167,10 @@ def add_deployer_to_blacklist(deployer_address, reason="manual_add"):
         return
         
     try:
-        import os
-        blacklist_file = './data/deployer_blacklist.txt'
-        
-        # Check if already exists
-        if check_deployer_blacklist(deployer_address):
+        if not get_deployer_index().add(deployer_address, reason):
             cprint(f"   ⚠️ Deployer {deployer_address[-6:]} already blacklisted", 'yellow')
             return
             
-        # Create directory if it doesn't exist
-        os.makedirs('./data', exist_ok=True)
-        
-        with open(blacklist_file, 'a') as f:
-            f.write(f"{deployer_address},{reason}\n")
-            
         cprint(f"   🚫 Added deployer {deployer_address[-6:]} to blacklist (reason: {reason})", 'red')
         
     except Exception as e:
@@ -1009,14 +705,11 @@ def get_token_overview(address):
     Returns dict with liquidity data or empty dict if error.
     """
     try:
-        API_KEY = d.birdeye
-        url = f"https://public-api.birdeye.so/defi/token_overview?address={address}"
-        headers = {"X-API-KEY": API_KEY}
-        response = requests.get(url, headers=headers, timeout=8)
+        status, json_response = birdeye_get("token_overview", address, timeout=8)
         
-        if response.ok:
-            json_response = response.json()
-            data = json_response.get('data', {})
+        if status == 200:
+            # Copy: the cached response is shared with other callers
+            data = dict(json_response.get('data') or {})
             # Ensure liquidity is always a number, never None
             if data and 'liquidity' in data:
                 if data['liquidity'] is None:
@@ -1024,7 +717,7 @@ def get_token_overview(address):
             return data or {}  # Return empty dict if data is None
         else:
             # Return empty dict if there's an error
-            cprint(f"⚠️ Kali: Error fetching overview for {address[-6:]}: {response.status_code}", 'yellow')
+            cprint(f"⚠️ Kali: Error fetching overview for {address[-6:]}: {status}", 'yellow')
             return {}
             
     except Exception as e:
@@ -0,0 +1,203 @@
+# pool_classifier.py - Kali Speed Engine: Single-Pass Raydium Pool-Creation Classifier
+import json
+import sys
+import time
+from collections import namedtuple
+from termcolor import cprint
+from config import *
+try:
+    # Optional: orjson parses websocket frames several times faster than json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Typed detection event handed from the listener to the pool pipeline
+# (endpoint is filled in by the listener with the websocket that delivered it first;
+#  stale marks events recovered by the gap backfill rather than seen live)
+PoolCreationEvent = namedtuple(
+    'PoolCreationEvent',
+    ['signature', 'slot', 'kind', 'ray_log', 'detected_at', 'endpoint', 'stale'],
+    defaults=(None, False)
+)
+
+# Raydium AMM v4 logs this line only from its initialize2 handler (new pool).
+# The old "Instruction: InitializeAccount(3)" patterns come from the SPL Token
+# program and also fire on ordinary swaps that open a token / wSOL account.
+POOL_INIT_MARKER = "Program log: initialize2: InitializeInstruction2"
+
+POOL_INIT_MARKER_BYTES = POOL_INIT_MARKER.encode('utf-8')
+
+# ray_log payload the init handler emits later in the same log batch
+RAY_LOG_PREFIX = "Program log: ray_log: "
+
+# Minimal typed view of a logsNotification frame
+LogFrame = namedtuple('LogFrame', ['signature', 'logs', 'slot', 'err'])
+
+
+def classify_logs(signature, logs, slot=None, err=None):
+    """
+    Scan one log array once and return a PoolCreationEvent, or None if the
+    transaction is not a (successful) Raydium pool initialization.
+    """
+    if err is not None or not logs:
+        return None
+
+    text = "\n".join(logs)
+
+    # Cheap C-level substring scan rejects almost all swap traffic
+    init_at = text.find(POOL_INIT_MARKER)
+    if init_at < 0:
+        return None
+
+    # Continue the same scan from the init line to pick up its ray_log
+    # (plain find + slice; a regex search here cost more than the whole negative path)
+    ray_log = None
+    ray_at = text.find(RAY_LOG_PREFIX, init_at + len(POOL_INIT_MARKER))
+    if ray_at >= 0:
+        ray_at += len(RAY_LOG_PREFIX)
+        line_end = text.find("\n", ray_at)
+        ray_log = text[ray_at:line_end if line_end >= 0 else len(text)].strip() or None
+
+    return PoolCreationEvent(signature, slot, 'initialize2', ray_log, time.time())
+
+
+def prefilter_frame(frame):
+    """
+    Byte-level test on the raw websocket frame, before any JSON work.
+    The init marker contains no characters JSON escapes, so a frame that
+    lacks it cannot be a pool creation.
+    """
+    if isinstance(frame, str):
+        return POOL_INIT_MARKER in frame
+    return POOL_INIT_MARKER_BYTES in frame
+
+
+def decode_frame(frame):
+    """Parse a raw frame into a LogFrame, or None if it is not a logsNotification"""
+    data = _json_loads(frame)
+    if data.get("method") != "logsNotification":
+        return None
+    result = data["params"]["result"]
+    value = result["value"]
+    return LogFrame(value.get("signature"), value.get("logs") or [], result.get("context", {}).get("slot"), value.get("err"))
+
+
+def classify_frame(frame):
+    """Raw frame (str or bytes) -> PoolCreationEvent or None, rejecting non-matches before decoding"""
+    if not prefilter_frame(frame):
+        return None
+    record = decode_frame(frame)
+    if record is None:
+        return None
+    return classify_logs(record.signature, record.logs, slot=record.slot, err=record.err)
+
+
+def classify_notification(data):
+    """Classify a decoded logsNotification message dict"""
+    if data.get("method") != "logsNotification":
+        return None
+    result = data.get("params", {}).get("result", {})
+    value = result.get("value", {})
+    return classify_logs(
+        value.get("signature"),
+        value.get("logs", []),
+        slot=result.get("context", {}).get("slot"),
+        err=value.get("err")
+    )
+
+
+# === Benchmarking against a labelled corpus ===
+
+def _legacy_is_pool_creation(logs):
+    """The nested pattern x log loop the listener used before this classifier"""
+    for pattern in ["InitializeAccount3", "InitializeAccount", "initialize2"]:
+        for log in logs:
+            if "Program log: Instruction:" in log and pattern in log:
+                return True
+    return False
+
+
+def load_corpus(corpus_file=CLASSIFIER_CORPUS_FILE):
+    """Load labelled notifications: one {"label": bool, "note": str, "notification": {...}} per line"""
+    samples = []
+    with open(corpus_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                samples.append(json.loads(line))
+    return samples
+
+
+def _score(samples, predict):
+    tp = fp = fn = tn = 0
+    for sample in samples:
+        predicted = predict(sample['notification'])
+        if predicted and sample['label']:
+            tp += 1
+        elif predicted:
+            fp += 1
+        elif sample['label']:
+            fn += 1
+        else:
+            tn += 1
+    precision = tp / (tp + fp) if (tp + fp) else 0.0
+    recall = tp / (tp + fn) if (tp + fn) else 0.0
+    return precision, recall
+
+
+def _ns_per_message(samples, predict, rounds):
+    notifications = [sample['notification'] for sample in samples]
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        for notification in notifications:
+            predict(notification)
+    return (time.perf_counter_ns() - start) / (rounds * len(notifications))
+
+
+def benchmark(corpus_file=CLASSIFIER_CORPUS_FILE, rounds=2000):
+    """Print precision / recall and per-message cost for the classifier vs the legacy matcher"""
+    samples = load_corpus(corpus_file)
+    if not samples:
+        cprint(f"❌ Kali Classifier: Corpus {corpus_file} is empty", 'red')
+        return
+
+    def predict_new(notification):
+        return classify_notification(notification) is not None
+
+    def predict_legacy(notification):
+        logs = notification.get("params", {}).get("result", {}).get("value", {}).get("logs", [])
+        return _legacy_is_pool_creation(logs)
+
+    # Raw-frame paths include JSON decoding, as the listener pays it per message
+    raw_samples = [dict(sample, notification=json.dumps(sample['notification']).encode('utf-8')) for sample in samples]
+
+    def predict_frame(frame):
+        return classify_frame(frame) is not None
+
+    def predict_legacy_frame(frame):
+        return predict_legacy(json.loads(frame))
+
+    positives = sum(1 for sample in samples if sample['label'])
+    cprint(f"🧪 Kali Classifier Benchmark: {len(samples)} notifications ({positives} pool inits)", 'white', 'on_blue', attrs=['bold'])
+    for name, corpus, predict in (
+        ('classifier', samples, predict_new),
+        ('legacy', samples, predict_legacy),
+        ('frame', raw_samples, predict_frame),
+        ('legacy frame', raw_samples, predict_legacy_frame),
+    ):
+        precision, recall = _score(corpus, predict)
+        ns = _ns_per_message(corpus, predict, rounds)
+        cprint(f"   {name:<12} precision={precision:.3f} recall={recall:.3f} {ns:,.0f} ns/message", 'cyan')
+
+    for sample in samples:
+        if predict_new(sample['notification']) != sample['label']:
+            cprint(f"   ⚠️ Misclassified: {sample.get('note', '')}", 'yellow')
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark(sys.argv[2] if len(sys.argv) > 2 else CLASSIFIER_CORPUS_FILE)
+    else:
+        print("Usage:")
+        print("  python pool_classifier.py bench [corpus.jsonl]   # Precision/recall + ns per message")
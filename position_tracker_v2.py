@@ -13,6 +13,7 @@ from termcolor import cprint
 import nice_funcs as n
 from config import *
 import dontshare as d
+from birdeye_cache import get_birdeye_cache
 
 class EnhancedPositionTracker:
     def __init__(self):
@@ -313,6 +314,8 @@ class EnhancedPositionTracker:
                 
                 # Monitor positions
                 await self.monitor_positions()
+                if self.positions:
+                    cprint(f"🗃️ {get_birdeye_cache().summary()}", 'blue')
                 
                 # Wait
                 await asyncio.sleep(self.check_interval)
@@ -0,0 +1,97 @@
+# ray_log_decoder.py - Kali Speed Engine: Raydium AMM v4 ray_log Decoder
+import base64
+import struct
+from collections import namedtuple
+from solders.pubkey import Pubkey
+from termcolor import cprint
+from config import *
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+# Raydium AMM v4 LogType discriminators (first byte of every ray_log)
+RAY_LOG_INIT = 0
+RAY_LOG_DEPOSIT = 1
+RAY_LOG_WITHDRAW = 2
+RAY_LOG_SWAP_BASE_IN = 3
+RAY_LOG_SWAP_BASE_OUT = 4
+
+# InitLog: log_type u8, time u64, pc_decimals u8, coin_decimals u8,
+# pc_lot_size u64, coin_lot_size u64, pc_amount u64, coin_amount u64, market Pubkey
+INIT_LOG_LAYOUT = struct.Struct('<BQBBQQQQ32s')
+
+RayInitLog = namedtuple('RayInitLog', [
+    'open_time', 'pc_decimals', 'coin_decimals', 'pc_lot_size', 'coin_lot_size',
+    'pc_amount', 'coin_amount', 'market'
+])
+
+# OpenBook / Serum v3 market state: 5 byte "serum" padding, account_flags u64,
+# own_address Pubkey, vault_signer_nonce u64, then base (coin) and quote (pc) mints
+MARKET_BASE_MINT_OFFSET = 53
+MARKET_QUOTE_MINT_OFFSET = 85
+
+
+def decode_ray_log(payload):
+    """
+    Decode a base64 ray_log payload. Returns a RayInitLog for pool
+    initialization logs, None for every other log type or bad input.
+    """
+    try:
+        raw = base64.b64decode(payload)
+    except Exception:
+        return None
+
+    if len(raw) < INIT_LOG_LAYOUT.size or raw[0] != RAY_LOG_INIT:
+        return None
+
+    (_, open_time, pc_decimals, coin_decimals, pc_lot_size, coin_lot_size,
+     pc_amount, coin_amount, market) = INIT_LOG_LAYOUT.unpack_from(raw)
+
+    return RayInitLog(
+        open_time, pc_decimals, coin_decimals, pc_lot_size, coin_lot_size,
+        pc_amount, coin_amount, str(Pubkey.from_bytes(market))
+    )
+
+
+def decode_market_mints(account_data):
+    """Extract (base_mint, quote_mint) from raw OpenBook market account bytes"""
+    if len(account_data) < MARKET_QUOTE_MINT_OFFSET + 32:
+        return None, None
+    base_mint = Pubkey.from_bytes(account_data[MARKET_BASE_MINT_OFFSET:MARKET_BASE_MINT_OFFSET + 32])
+    quote_mint = Pubkey.from_bytes(account_data[MARKET_QUOTE_MINT_OFFSET:MARKET_QUOTE_MINT_OFFSET + 32])
+    return str(base_mint), str(quote_mint)
+
+
+def pick_new_token(base_mint, quote_mint):
+    """Return (new_token, paired_token): the side that is not SOL/USDC is the new token"""
+    known_quotes = (SOL_MINT, USDC_CA)
+    if base_mint and base_mint not in known_quotes:
+        return base_mint, quote_mint
+    if quote_mint and quote_mint not in known_quotes:
+        return quote_mint, base_mint
+    return None, None
+
+
+async def resolve_pool_tokens(ray_log, rpc_client):
+    """
+    Resolve (new_token, paired_token) from an initialize2 ray_log.
+
+    The init log names the OpenBook market rather than the mints, but the
+    market account already exists before the pool does, so one processed
+    getAccountInfo replaces waiting for the pool transaction to confirm.
+    Returns (None, None) if anything is missing so callers can fall back.
+    """
+    init_log = decode_ray_log(ray_log) if ray_log else None
+    if not init_log:
+        return None, None
+
+    try:
+        data = await rpc_client.get_account_info(init_log.market, encoding="base64", commitment="processed")
+        value = (data.get('result') or {}).get('value')
+        if not value:
+            return None, None
+        account_data = base64.b64decode(value['data'][0])
+        base_mint, quote_mint = decode_market_mints(account_data)
+        return pick_new_token(base_mint, quote_mint)
+    except Exception as e:
+        cprint(f"⚠️ Kali Speed Engine: ray_log market lookup failed: {e}", 'yellow')
+        return None, None
@@ -3,7 +3,6 @@ import asyncio
 import json
 import time
 import websockets
-import requests
 import base64
 import os
 from termcolor import cprint
@@ -11,6 +10,19 @@ from datetime import datetime
 import dontshare as d
 import nice_funcs as n
 from config import *
+from rpc_client import get_rpc_client, close_rpc_client
+from dedup_index import DedupIndex, get_dedup_index
+from pool_classifier import classify_frame
+from ray_log_decoder import resolve_pool_tokens
+from work_queue import PoolWorkQueue
+from fan_in import FanInTracker, endpoint_label
+from stream_recorder import StreamRecorder, replay_recording
+from listener_metrics import ListenerMetrics
+from gap_backfill import GapBackfiller
+from birdeye_client import get_birdeye_client, close_birdeye_client
+from token_vetting import vet_token
+from revet_scheduler import get_revet_scheduler
+from replay_stubs import DryRunStubs
 
 # Raydium Liquidity Pool V4 program ID
 RAYDIUM_LP_V4 = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
@@ -32,88 +44,72 @@ def get_helius_wss_url():
         cprint("⚠️ Kali: Unable to convert RPC URL to WebSocket. Please check your Helius RPC URL.", 'red')
         return None
 
-async def get_transaction_details(signature):
+async def get_transaction_details(signature, rpc_client=None):
     """
     Fetch transaction details from signature and extract token addresses
     Enhanced with retry logic for ultra-fast detection
+    Uses the pooled async RPC client so the event loop keeps running while we wait
     """
+    rpc_client = rpc_client or get_rpc_client()
     max_retries = 5
     retry_delay = 0.5  # Start with 500ms delay
     
     for attempt in range(max_retries):
         try:
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTransaction",
-                "params": [
-                    signature,
-                    {
-                        "encoding": "jsonParsed",
-                        "maxSupportedTransactionVersion": 0,
-                        "commitment": "confirmed"  # Wait for confirmed status
-                    }
-                ]
-            }
+            # Wait for confirmed status
+            data = await rpc_client.get_transaction(signature, commitment="confirmed")
             
-            response = requests.post(d.rpc_url, json=payload, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
+            # Check if transaction is found and confirmed
+            if 'result' in data and data['result']:
+                transaction = data['result']
                 
-                # Check if transaction is found and confirmed
-                if 'result' in data and data['result']:
-                    transaction = data['result']
-                    
-                    # Look for token accounts in the transaction
-                    base_token = None
-                    quote_token = None
+                # Look for token accounts in the transaction
+                base_token = None
+                quote_token = None
+                
+                # Parse the transaction for new token mints
+                if 'meta' in transaction and 'postTokenBalances' in transaction['meta']:
+                    for balance in transaction['meta']['postTokenBalances']:
+                        mint = balance.get('mint')
+                        if mint and mint != USDC_CA and mint != "So11111111111111111111111111111111111111112":
+                            base_token = mint
+                            quote_token = USDC_CA  # Assume pairing with USDC
+                            break
+                
+                # Also check preTokenBalances for newly created tokens
+                if not base_token and 'meta' in transaction and 'preTokenBalances' in transaction['meta']:
+                    # Look for tokens that appear in post but not in pre (newly created)
+                    pre_mints = set()
+                    post_mints = set()
                     
-                    # Parse the transaction for new token mints
-                    if 'meta' in transaction and 'postTokenBalances' in transaction['meta']:
-                        for balance in transaction['meta']['postTokenBalances']:
-                            mint = balance.get('mint')
-                            if mint and mint != USDC_CA and mint != "So11111111111111111111111111111111111111112":
-                                base_token = mint
-                                quote_token = USDC_CA  # Assume pairing with USDC
-                                break
+                    for balance in transaction['meta']['preTokenBalances']:
+                        mint = balance.get('mint')
+                        if mint:
+                            pre_mints.add(mint)
                     
-                    # Also check preTokenBalances for newly created tokens
-                    if not base_token and 'meta' in transaction and 'preTokenBalances' in transaction['meta']:
-                        # Look for tokens that appear in post but not in pre (newly created)
-                        pre_mints = set()
-                        post_mints = set()
-                        
-                        for balance in transaction['meta']['preTokenBalances']:
-                            mint = balance.get('mint')
-                            if mint:
-                                pre_mints.add(mint)
-                        
-                        for balance in transaction['meta']['postTokenBalances']:
-                            mint = balance.get('mint')
-                            if mint:
-                                post_mints.add(mint)
-                        
-                        # Find newly created tokens
-                        new_tokens = post_mints - pre_mints
-                        for token in new_tokens:
-                            if token != USDC_CA and token != "So11111111111111111111111111111111111111112":
-                                base_token = token
-                                quote_token = USDC_CA
-                                break
+                    for balance in transaction['meta']['postTokenBalances']:
+                        mint = balance.get('mint')
+                        if mint:
+                            post_mints.add(mint)
                     
-                    if base_token:
-                        cprint(f"✅ Kali Speed Engine: Token extracted on attempt {attempt + 1}", 'green')
-                        return base_token, quote_token
-                    else:
-                        cprint(f"⚠️ Kali Speed Engine: No new token found in transaction (attempt {attempt + 1})", 'yellow')
+                    # Find newly created tokens
+                    new_tokens = post_mints - pre_mints
+                    for token in new_tokens:
+                        if token != USDC_CA and token != "So11111111111111111111111111111111111111112":
+                            base_token = token
+                            quote_token = USDC_CA
+                            break
                 
-                elif 'error' in data:
-                    cprint(f"⚠️ Kali Speed Engine: RPC Error: {data['error']}", 'yellow')
+                if base_token:
+                    cprint(f"✅ Kali Speed Engine: Token extracted on attempt {attempt + 1}", 'green')
+                    return base_token, quote_token
                 else:
-                    cprint(f"⚠️ Kali Speed Engine: Transaction not found yet (attempt {attempt + 1})", 'yellow')
+                    cprint(f"⚠️ Kali Speed Engine: No new token found in transaction (attempt {attempt + 1})", 'yellow')
+            
+            elif 'error' in data:
+                cprint(f"⚠️ Kali Speed Engine: RPC Error: {data['error']}", 'yellow')
             else:
-                cprint(f"⚠️ Kali Speed Engine: HTTP {response.status_code} (attempt {attempt + 1})", 'yellow')
+                cprint(f"⚠️ Kali Speed Engine: Transaction not found yet (attempt {attempt + 1})", 'yellow')
                 
         except Exception as e:
             cprint(f"⚠️ Kali Speed Engine: Error on attempt {attempt + 1}: {e}", 'yellow')
@@ -126,37 +122,54 @@ async def get_transaction_details(signature):
     cprint(f"❌ Kali Speed Engine: Failed to extract tokens after {max_retries} attempts", 'red')
     return None, None
 
-async def process_new_pool(signature):
+async def process_new_pool(signature, rpc_client=None, ray_log=None, dedup=None, dry_run=None):
     """
     Process new pool detection and trigger fast trading logic
+    dry_run: DryRunStubs answering RPC / Birdeye / buys instead of the network (replays)
     """
     cprint(f"🔥 Kali Speed Engine: Processing new pool signature: {signature}", 'yellow', attrs=['bold'])
+    rpc_client = dry_run.rpc if dry_run else (rpc_client or get_rpc_client())
     
-    # Get transaction details to extract token addresses
-    base_token, quote_token = await get_transaction_details(signature)
+    # Fast path: decode the init ray_log from the notification itself
+    base_token, quote_token = await resolve_pool_tokens(ray_log, rpc_client)
+    
+    if base_token:
+        cprint(f"⚡ Kali Speed Engine: Token extracted from ray_log (no getTransaction needed)", 'green')
+    else:
+        # Fallback: get transaction details to extract token addresses
+        base_token, quote_token = await get_transaction_details(signature, rpc_client)
     
     if base_token and quote_token:
+        # Several signatures can touch the same new mint - only the first one gets vetted
+        if not (dedup or get_dedup_index()).claim_mint(base_token):
+            cprint(f"⚠️ Kali Speed Engine: Mint {base_token[-6:]} already in the pipeline, skipping {signature[:8]}...", 'yellow')
+            return
+        
         cprint(f"💎 Kali Speed Engine: NEW TOKEN DETECTED!", 'white', 'on_green', attrs=['bold'])
         cprint(f"   Base Token: {base_token}", 'green')
         cprint(f"   Quote Token: {quote_token}", 'green')
         cprint(f"   Transaction: https://solscan.io/tx/{signature}", 'cyan')
         
         # Trigger ULTRA-FAST trading sequence
-        await trigger_fast_snipe(base_token, signature)
+        await trigger_fast_snipe(base_token, signature, rpc_client, dry_run=dry_run)
     else:
         cprint(f"⚠️ Kali Speed Engine: Could not extract token addresses from {signature}", 'yellow')
 
-async def trigger_fast_snipe(token_address, signature):
+async def trigger_fast_snipe(token_address, signature, rpc_client=None, dry_run=None):
     """
     🧠 INTELLIGENCE-POWERED FAST SNIPE: Now with SEQUENTIAL MODE
+    Blocking helpers from nice_funcs run in worker threads so the listener keeps reading
+    dry_run: DryRunStubs for replays - same pipeline, but nothing is bought, logged or
+    written to positions / the verdict store
     """
+    rpc_client = dry_run.rpc if dry_run else (rpc_client or get_rpc_client())
     cprint(f"⚡ Kali Speed Engine: INTELLIGENCE SNIPE INITIATED for {token_address[-6:]}", 'white', 'on_red', attrs=['bold'])
     
     try:
         # === NEW: SEQUENTIAL MODE CHECK ===
-        if ENABLE_SEQUENTIAL_MODE:
-            if n.has_active_positions():
-                position_count = n.get_active_position_count()
+        if ENABLE_SEQUENTIAL_MODE and not dry_run:
+            if await asyncio.to_thread(n.has_active_positions):
+                position_count = await asyncio.to_thread(n.get_active_position_count)
                 cprint(f"🔒 Kali Sequential Mode: Skipping snipe - {position_count} active position(s)", 'yellow', attrs=['bold'])
                 cprint(f"   Waiting for current position to close before new trades", 'cyan')
                 
@@ -167,21 +180,34 @@ async def trigger_fast_snipe(token_address, signature):
                 return
             
             # Clean up any closed positions before proceeding
-            n.clean_closed_positions()
+            await asyncio.to_thread(n.clean_closed_positions)
         
         # === INTELLIGENCE ENGINE VETTING ===
         cprint(f"🧠 Kali Intelligence: Running comprehensive vetting pipeline...", 'white', 'on_blue', attrs=['bold'])
         
-        # Run the comprehensive intelligence vetting
-        is_safe = n.pre_trade_token_vetting(token_address, d.birdeye, d.rpc_url)
+        # Run the comprehensive intelligence vetting (security + overview fetched concurrently)
+        # With the re-vet scheduler running, a not-yet-indexed token is parked instead of
+        # retried in place, so this worker is free for the next pool immediately
+        revet = get_revet_scheduler()
+        defer = REVET_ENABLED and revet.is_running()
+        outcome = {}
+        birdeye_client = dry_run.birdeye if dry_run else get_birdeye_client()
+        is_safe = await vet_token(token_address, birdeye_client, defer=defer, rpc_client=rpc_client, outcome=outcome, persist=not dry_run)
+        
+        if is_safe is None:
+            revet.park(token_address, signature)
+            return
         
         if not is_safe:
             cprint(f"🚫 Kali Intelligence: Token {token_address[-6:]} REJECTED by intelligence engine", 'red', attrs=['bold'])
+            if dry_run:
+                return
             
-            # Log rejected tokens for analysis
+            # Log rejected tokens (with the failing rule code) for analysis
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            reason = outcome.get('reason') or 'INTELLIGENCE_REJECTED'
             with open('./data/intelligence_rejections.txt', 'a') as f:
-                f.write(f'{timestamp},{token_address},{signature},INTELLIGENCE_REJECTED\n')
+                f.write(f'{timestamp},{token_address},{signature},{reason}\n')
             return
         
         # === INTELLIGENCE APPROVED - EXECUTE DYNAMIC ULTRA-FAST BUY ===
@@ -189,7 +215,10 @@ async def trigger_fast_snipe(token_address, signature):
         
         # === DYNAMIC STRATEGY: GET LIQUIDITY FOR OPTIMAL SIZING ===
         cprint(f"📊 Kali Speed + Strategy: Fetching liquidity for dynamic sizing...", 'cyan')
-        token_overview = n.get_token_overview(token_address)
+        if dry_run:
+            token_overview, _ = await dry_run.birdeye.token_overview(token_address)
+        else:
+            token_overview = await asyncio.to_thread(n.get_token_overview, token_address)
         
         # Ensure we have valid liquidity data (never None)
         liquidity = 0
@@ -208,16 +237,21 @@ async def trigger_fast_snipe(token_address, signature):
         if liquidity > 0:
             cprint(f"   Token liquidity: ${liquidity:,.0f}", 'cyan')
         
+        if dry_run:
+            success = await dry_run.market_buy(token_address, usdc_amount_lamports)
+            cprint(f"🧪 Kali Speed Engine: Dry-run buy for {token_address[-6:]} ({success})", 'cyan')
+            return
+        
         # Import required modules for fast execution
         from solders.keypair import Keypair
         from solana.rpc.api import Client
         
         # Initialize keypair and client for ultra-fast execution
         keypair = n.create_keypair_from_key(d.sol_key)
-        http_client = Client(d.rpc_url)
+        http_client = Client(rpc_client.rpc_url)
         
         # Execute the ultra-fast market buy
-        success = n.market_buy_fast(token_address, usdc_amount_lamports, keypair, http_client)
+        success = await asyncio.to_thread(n.market_buy_fast, token_address, usdc_amount_lamports, keypair, http_client)
         
         if success:
             cprint(f"✅ Kali Speed + Strategy Engine: FIXED FAST SNIPE SUCCESSFUL! 🚀", 'white', 'on_green', attrs=['bold'])
@@ -245,15 +279,123 @@ async def trigger_fast_snipe(token_address, signature):
     except Exception as e:
         cprint(f"❌ Kali Speed Engine: Error in fast snipe: {e}", 'red')
 
-async def listen_for_new_pools():
+def get_wss_urls():
     """
-    Main WebSocket listener - connects to Helius and listens for new Raydium pools
+    All websocket endpoints to subscribe on: the Helius URL derived from the
+    RPC URL plus any extra endpoints configured in SPEED_ENGINE_EXTRA_WSS_URLS
     """
-    wss_url = get_helius_wss_url()
-    if not wss_url:
-        return
+    urls = []
+    helius_url = get_helius_wss_url()
+    if helius_url:
+        urls.append(helius_url)
+    for url in SPEED_ENGINE_EXTRA_WSS_URLS:
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+async def listen_for_new_pools(wss_urls=None, record_path=None, replay_path=None, replay_fast=REPLAY_AS_FAST_AS_POSSIBLE):
+    """
+    Main WebSocket listener - subscribes to Raydium logs on every configured
+    endpoint at once and merges the streams (first arrival wins)
+    
+    record_path: also append every raw frame to this recording file
+    replay_path: read frames from a recording instead of live websockets
+    """
+    if replay_path:
+        wss_urls = []
+        cprint(f"📼 Kali Speed Engine: Replaying {replay_path} ({'as fast as possible' if replay_fast else 'original speed'})...", 'cyan', attrs=['bold'])
+    else:
+        wss_urls = wss_urls or get_wss_urls()
+        if not wss_urls:
+            return
+        cprint(f"🚀 Kali Speed Engine: Connecting to {len(wss_urls)} WebSocket endpoint(s)...", 'cyan', attrs=['bold'])
+    
+    # One pooled RPC client shared by every pool pipeline spawned below
+    rpc_client = get_rpc_client()
+    
+    # In-memory dedup index, flushed to disk in the background
+    # (replays get a private, unsaved index so they never touch live state)
+    if replay_path:
+        dedup = DedupIndex()
+        persistence_task = None
+    else:
+        dedup = get_dedup_index()
+        persistence_task = asyncio.create_task(dedup.run_persistence())
+    
+    # Offline benchmark: the whole pipeline runs, against stubs instead of RPC / Birdeye / buys
+    dry_run = DryRunStubs() if replay_path and REPLAY_DRY_RUN else None
+    
+    # Bounded worker pool: backpressure instead of one task per detection
+    async def handle_event(event):
+        await process_new_pool(event.signature, rpc_client, event.ray_log, dedup=dedup, dry_run=dry_run)
+    
+    work_queue = PoolWorkQueue(handle_event)
+    work_queue.start()
+    
+    # First-arrival bookkeeping across endpoints
+    fan_in = FanInTracker([endpoint_label(url) for url in wss_urls])
+    
+    # Optional raw frame recording for offline replay
+    recorder = StreamRecorder(record_path) if record_path else None
+    pool_events = 0
+    
+    # Live counters / histograms, HTTP metrics endpoint and periodic summary line
+    metrics = ListenerMetrics()
+    metrics.start(rpc_client=None if replay_path else rpc_client)
+    
+    def accept_event(event, endpoint, arrival):
+        """Dedup and queue a classified event (live frames and gap backfills)"""
+        nonlocal pool_events
+        signature = event.signature
+        
+        # Slower endpoints delivering the same signature are only counted
+        if not fan_in.record_arrival(signature, endpoint, arrival):
+            return
+        
+        if not event.stale:
+            metrics.record_pool_hit(event)
+        
+        # Additional validation: Check if we already processed this signature
+        if not dedup.check_and_add_signature(signature):
+            metrics.record_dedup_hit()
+            cprint(f"⚠️ Kali Speed Engine: Signature {signature[:8]}... already processed, skipping", 'yellow')
+            return
+        
+        pool_events += 1
+        if event.stale:
+            cprint(f"🕰️ MISSED RAYDIUM POOL RECOVERED by backfill (slot {event.slot})! Signature: {signature}", 'yellow', attrs=['bold'])
+        else:
+            cprint(f"🔥 NEW RAYDIUM POOL DETECTED via {endpoint}! Signature: {signature}", 'yellow', attrs=['bold'])
+        
+        # Hand off to the worker pool without waiting
+        work_queue.submit(event._replace(endpoint=endpoint))
+    
+    # Remembers the stream position and recovers what an outage missed
+    backfiller = None
+    backfiller_task = None
+    if BACKFILL_ENABLED and not replay_path:
+        backfiller = GapBackfiller(rpc_client, lambda event, endpoint: accept_event(event, endpoint, time.time()), RAYDIUM_LP_V4)
+        backfiller.load()
+        backfiller_task = asyncio.create_task(backfiller.run_persistence())
+    
+    # Tokens Birdeye has not indexed yet are re-vetted later instead of blocking a worker
+    revet = get_revet_scheduler()
+    if REVET_ENABLED and not (replay_path and REPLAY_DRY_RUN):
+        revet.start(lambda token_address, signature: trigger_fast_snipe(token_address, signature, rpc_client))
+    metrics.attach(work_queue=work_queue, dedup=dedup, fan_in=fan_in, backfiller=backfiller, revet=revet)
+    
+    def handle_message(message, endpoint, arrival):
+        """Shared processing path for frames from every endpoint (and replays)"""
+        metrics.record_frame()
+        if recorder:
+            recorder.write(endpoint, arrival, message)
+        if backfiller:
+            backfiller.note_frame(message)
         
-    cprint("🚀 Kali Speed Engine: Connecting to Helius WebSocket...", 'cyan', attrs=['bold'])
+        # 🎯 Byte-level prefilter, then decode + single-pass classify the survivors
+        event = classify_frame(message)
+        if event and event.signature:
+            accept_event(event, endpoint, arrival)
     
     # WebSocket subscription request for Raydium program logs
     request = {
@@ -267,133 +409,231 @@ async def listen_for_new_pools():
     }
 
     max_retries = 5
-    retry_count = 0
     
-    while retry_count < max_retries:
-        try:
-            async with websockets.connect(wss_url) as websocket:
-                await websocket.send(json.dumps(request))
-                cprint("✅ Kali Speed Engine: Connected and subscribed to Raydium logs!", 'green', attrs=['bold'])
-                cprint("🔍 Kali Speed Engine: Monitoring for new pool creations...", 'cyan')
-                
-                retry_count = 0  # Reset retry count on successful connection
+    try:
+        if replay_path:
+            replay_started = time.perf_counter()
+            # The replay waits for queue room instead of overflowing it
+            frames, elapsed = await replay_recording(replay_path, handle_message, fast=replay_fast, ready=work_queue.wait_for_room)
+            # Wait for the workers to finish what the replay queued, including events in progress
+            await work_queue.wait_idle()
+            rate = frames / elapsed if elapsed else 0.0
+            total = time.perf_counter() - replay_started
+            cprint(f"📼 Kali Speed Engine: Replayed {frames} frames in {elapsed:.3f}s ({rate:,.0f} frames/s), {pool_events} pool events handled in {total:.3f}s", 'white', 'on_blue', attrs=['bold'])
+            cprint(f"   Queue: {work_queue.stats()}", 'cyan')
+            cprint(f"   Endpoint race: {fan_in.summary()}", 'cyan')
+            cprint(f"   {metrics.summary_line()}", 'cyan')
+            if dry_run:
+                cprint(f"   {dry_run.summary()}", 'cyan')
+        else:
+            await asyncio.gather(*[
+                _endpoint_listener(url, request, handle_message, max_retries, backfiller)
+                for url in wss_urls
+            ])
+    finally:
+        await metrics.stop()
+        if backfiller_task:
+            backfiller_task.cancel()
+        if backfiller:
+            await backfiller.stop()
+        await revet.stop()
+        if recorder:
+            recorder.close()
+        await work_queue.stop()
+        if persistence_task:
+            persistence_task.cancel()
+            dedup.save()
+        await close_rpc_client()
+        await close_birdeye_client()
+        if len(wss_urls) > 1:
+            cprint(f"🏁 Kali Speed Engine: Final endpoint race - {fan_in.summary()}", 'cyan')
 
-                # Enhanced connection monitoring with keepalive
-                last_ping = time.time()
-                ping_interval = 30  # Send ping every 30 seconds
-                
-                while True:
-                    try:
-                        # Send periodic pings to keep connection alive
-                        current_time = time.time()
-                        if current_time - last_ping > ping_interval:
-                            try:
-                                await websocket.ping()
-                                last_ping = current_time
-                                cprint("📡 Kali Speed Engine: Keepalive ping sent", 'blue')
-                            except Exception as ping_error:
-                                cprint(f"⚠️ Kali Speed Engine: Ping failed: {ping_error}", 'yellow')
-                                break
-                        
-                        # Wait for message with timeout to check for pings
-                        try:
-                            message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                        except asyncio.TimeoutError:
-                            # No message received, continue to check ping timing
-                            continue
-                            
-                        data = json.loads(message)
+async def _open_subscription(wss_url, request, handle_message, endpoint):
+    """
+    Connect and subscribe, returning only once the subscription is confirmed
+    (notifications that race the confirmation are handled, not dropped)
+    """
+    websocket = await websockets.connect(wss_url)
+    try:
+        await websocket.send(json.dumps(request))
+        deadline = time.time() + WSS_SUBSCRIBE_TIMEOUT
+        while True:
+            message = await asyncio.wait_for(websocket.recv(decode=False), timeout=max(0.1, deadline - time.time()))
+            if b'logsNotification' in message:
+                handle_message(message, endpoint, time.time())
+                continue
+            response = json.loads(message)
+            if response.get('id') == request['id']:
+                if 'error' in response:
+                    raise websockets.exceptions.WebSocketException(f"logsSubscribe rejected: {response['error']}")
+                return websocket
+    except BaseException:
+        await websocket.close()
+        raise
+
+async def _read_connection(websocket, endpoint, handle_message):
+    """Pump frames from one connection into the shared handler until it closes"""
+    while True:
+        try:
+            # Raw bytes: the prefilter runs before any UTF-8 / JSON decoding
+            message = await websocket.recv(decode=False)
+        except websockets.exceptions.ConnectionClosed:
+            return
+        try:
+            handle_message(message, endpoint, time.time())
+        except json.JSONDecodeError as e:
+            cprint(f"⚠️ Kali Speed Engine: JSON decode error: {e}", 'yellow')
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Message processing error: {e}", 'yellow')
 
-                        # Check if it's a log notification
-                        if data.get("method") == "logsNotification":
-                            logs = data.get("params", {}).get("result", {}).get("value", {}).get("logs", [])
-                            
-                            # 🎯 FIXED: Look for ACTUAL Raydium pool creation patterns
-                            # Based on live analysis of 2500+ transactions
-                            pool_creation_patterns = [
-                                "InitializeAccount3",    # Most common new pool pattern (65% of pools)
-                                "InitializeAccount",     # Alternative pool pattern (35% of pools)
-                                "initialize2",           # Legacy pattern (0% but kept for compatibility)
-                            ]
-                            
-                            # Check for any of the valid pool creation patterns
-                            is_pool_creation = False
-                            for pattern in pool_creation_patterns:
-                                for log in logs:
-                                    if "Program log: Instruction:" in log and pattern in log:
-                                        is_pool_creation = True
-                                        break
-                                if is_pool_creation:
-                                    break
-                            
-                            if is_pool_creation:
-                                signature = data.get("params", {}).get("result", {}).get("value", {}).get("signature")
-                                
-                                if signature:
-                                    # Additional validation: Check if we already processed this signature
-                                    processed_signatures_file = './data/processed_signatures.txt'
-                                    try:
-                                        # Load already processed signatures
-                                        if os.path.exists(processed_signatures_file):
-                                            with open(processed_signatures_file, 'r') as f:
-                                                processed_signatures = set(line.strip() for line in f.readlines())
-                                        else:
-                                            processed_signatures = set()
-                                        
-                                        # Skip if already processed
-                                        if signature in processed_signatures:
-                                            cprint(f"⚠️ Kali Speed Engine: Signature {signature[:8]}... already processed, skipping", 'yellow')
-                                            continue
-                                        
-                                        # Add to processed list
-                                        with open(processed_signatures_file, 'a') as f:
-                                            f.write(f"{signature}\n")
-                                            
-                                    except Exception as sig_error:
-                                        cprint(f"⚠️ Kali Speed Engine: Error managing signature tracking: {sig_error}", 'yellow')
-                                    
-                                    cprint(f"🔥 NEW RAYDIUM POOL DETECTED! Signature: {signature}", 'yellow', attrs=['bold'])
-                                    
-                                    # Process immediately without waiting
-                                    asyncio.create_task(process_new_pool(signature))
+async def _ping_rtt(websocket):
+    """Round-trip time of one ping in seconds, or None if the pong is missed"""
+    try:
+        start = time.perf_counter()
+        pong_waiter = await websocket.ping()
+        await asyncio.wait_for(pong_waiter, timeout=WSS_PING_TIMEOUT)
+        return time.perf_counter() - start
+    except (asyncio.TimeoutError, websockets.exceptions.ConnectionClosed):
+        return None
 
-                    except websockets.exceptions.ConnectionClosed:
-                        cprint("🔄 Kali Speed Engine: Connection closed, attempting to reconnect...", 'yellow')
-                        break
-                    except json.JSONDecodeError as e:
-                        cprint(f"⚠️ Kali Speed Engine: JSON decode error: {e}", 'yellow')
-                        continue
-                    except Exception as e:
-                        cprint(f"⚠️ Kali Speed Engine: Message processing error: {e}", 'yellow')
-                        continue
+async def _endpoint_listener(wss_url, request, handle_message, max_retries, backfiller=None):
+    """
+    Connect / reconnect loop for one endpoint's WebSocket subscription
 
+    A degrading connection (scheduled age, rising ping RTT, missed pongs) is
+    replaced make-before-break: the new socket is subscribed and streaming
+    before the old one is closed, and the overlap is deduped by the shared
+    fan-in / signature index. Each connection reports up / down to the gap
+    backfiller so real outages still get recovered.
+    """
+    endpoint = endpoint_label(wss_url)
+    retry_count = 0
+    generation = 0
+    
+    while retry_count < max_retries:
+        try:
+            websocket = await _open_subscription(wss_url, request, handle_message, endpoint)
         except websockets.exceptions.InvalidURI:
-            cprint("❌ Kali Speed Engine: Invalid WebSocket URI. Check your Helius RPC configuration.", 'red')
+            cprint(f"❌ Kali Speed Engine: Invalid WebSocket URI for {endpoint}. Check your RPC configuration.", 'red')
             break
-        except websockets.exceptions.WebSocketException as e:
+        except (websockets.exceptions.WebSocketException, asyncio.TimeoutError) as e:
             retry_count += 1
-            cprint(f"🔄 Kali Speed Engine: WebSocket error (attempt {retry_count}/{max_retries}): {e}", 'yellow')
+            cprint(f"🔄 Kali Speed Engine: WebSocket error on {endpoint} (attempt {retry_count}/{max_retries}): {e}", 'yellow')
             await asyncio.sleep(5 * retry_count)  # Exponential backoff
+            continue
         except Exception as e:
             retry_count += 1
-            cprint(f"❌ Kali Speed Engine: Unexpected error (attempt {retry_count}/{max_retries}): {e}", 'red')
+            cprint(f"❌ Kali Speed Engine: Unexpected error on {endpoint} (attempt {retry_count}/{max_retries}): {e}", 'red')
             await asyncio.sleep(5 * retry_count)
+            continue
+        
+        cprint(f"✅ Kali Speed Engine: Connected and subscribed to Raydium logs on {endpoint}!", 'green', attrs=['bold'])
+        cprint("🔍 Kali Speed Engine: Monitoring for new pool creations...", 'cyan')
+        retry_count = 0  # Reset retry count on successful connection
+        
+        generation += 1
+        connection_id = f"{endpoint}#{generation}"
+        if backfiller:
+            backfiller.endpoint_up(connection_id)
+        reader = asyncio.create_task(_read_connection(websocket, endpoint, handle_message))
+        
+        # Connection health: age, ping RTT against its running average, missed pongs
+        opened_at = time.time()
+        rtt_average = None
+        missed_pings = 0
+        
+        try:
+            while True:
+                done, _ = await asyncio.wait({reader}, timeout=WSS_PING_INTERVAL)
+                if done:
+                    break  # Socket closed under us - reconnect below
+                
+                reason = None
+                rtt = await _ping_rtt(websocket)
+                if rtt is None:
+                    missed_pings += 1
+                    cprint(f"⚠️ Kali Speed Engine: Missed pong on {endpoint} ({missed_pings}/{WSS_MAX_MISSED_PINGS})", 'yellow')
+                    if missed_pings >= WSS_MAX_MISSED_PINGS:
+                        reason = f"{missed_pings} missed pings"
+                else:
+                    missed_pings = 0
+                    if rtt_average is not None and rtt > WSS_RTT_ROTATE_FLOOR and rtt > rtt_average * WSS_RTT_ROTATE_FACTOR:
+                        reason = f"ping RTT {rtt * 1000:.0f}ms vs {rtt_average * 1000:.0f}ms average"
+                    rtt_average = rtt if rtt_average is None else 0.8 * rtt_average + 0.2 * rtt
+                if reason is None and WSS_ROTATE_INTERVAL and time.time() - opened_at > WSS_ROTATE_INTERVAL:
+                    reason = "scheduled"
+                if reason is None:
+                    continue
+                
+                # === MAKE BEFORE BREAK: replacement is live before the old socket goes ===
+                cprint(f"🔀 Kali Speed Engine: Rotating {endpoint} connection ({reason})...", 'cyan')
+                try:
+                    replacement = await _open_subscription(wss_url, request, handle_message, endpoint)
+                except Exception as e:
+                    cprint(f"⚠️ Kali Speed Engine: Replacement for {endpoint} failed, keeping current connection: {e}", 'yellow')
+                    opened_at = time.time()
+                    missed_pings = 0
+                    continue
+                
+                generation += 1
+                old_websocket, old_reader, old_connection_id = websocket, reader, connection_id
+                websocket = replacement
+                connection_id = f"{endpoint}#{generation}"
+                if backfiller:
+                    backfiller.endpoint_up(connection_id)
+                reader = asyncio.create_task(_read_connection(websocket, endpoint, handle_message))
+                
+                # Both sockets stream during the overlap; duplicates die in the fan-in / dedup index
+                await asyncio.sleep(WSS_ROTATE_OVERLAP)
+                await old_websocket.close()
+                old_reader.cancel()
+                await asyncio.gather(old_reader, return_exceptions=True)
+                if backfiller:
+                    backfiller.endpoint_down(old_connection_id)
+                
+                opened_at = time.time()
+                rtt_average = None
+                missed_pings = 0
+                cprint(f"✅ Kali Speed Engine: {endpoint} rotated with no blind window", 'green')
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            await websocket.close()
+            if backfiller:
+                backfiller.endpoint_down(connection_id)
+        
+        cprint(f"🔄 Kali Speed Engine: Connection to {endpoint} closed, attempting to reconnect...", 'yellow')
 
-    cprint("❌ Kali Speed Engine: Max retries reached. WebSocket listener stopped.", 'red')
+    cprint(f"❌ Kali Speed Engine: Max retries reached. WebSocket listener for {endpoint} stopped.", 'red')
 
-def start_speed_engine():
+def start_speed_engine(record_path=None, replay_path=None, replay_fast=REPLAY_AS_FAST_AS_POSSIBLE):
     """
     Start the Speed Engine WebSocket listener
     """
     cprint("🚀 KALI SPEED ENGINE STARTING...", 'white', 'on_blue', attrs=['bold'])
     cprint("⚡ Transitioning from minutes to MILLISECONDS!", 'white', 'on_blue', attrs=['bold'])
     
+    record_path = record_path or (SPEED_ENGINE_RECORD_FILE if SPEED_ENGINE_RECORD_STREAM else None)
+    
     try:
-        asyncio.run(listen_for_new_pools())
+        asyncio.run(listen_for_new_pools(record_path=record_path, replay_path=replay_path, replay_fast=replay_fast))
     except KeyboardInterrupt:
         cprint("\n⏹️ Kali Speed Engine: Shutting down gracefully...", 'yellow')
     except Exception as e:
         cprint(f"❌ Kali Speed Engine: Fatal error: {e}", 'red')
 
 if __name__ == "__main__":
-    start_speed_engine()
\ No newline at end of file
+    import sys
+    
+    args = sys.argv[1:]
+    if args and args[0] == "--record" and len(args) > 1:
+        start_speed_engine(record_path=args[1])
+    elif args and args[0] == "--replay" and len(args) > 1:
+        start_speed_engine(replay_path=args[1], replay_fast="--fast" in args)
+    elif args:
+        print("Usage:")
+        print("  python raydium_listener.py                          # Live listener")
+        print("  python raydium_listener.py --record <file>          # Live listener + record raw frames")
+        print("  python raydium_listener.py --replay <file> [--fast] # Replay a recording (original speed or max)")
+    else:
+        start_speed_engine()
\ No newline at end of file
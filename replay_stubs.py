@@ -0,0 +1,106 @@
+# replay_stubs.py - Kali Speed Engine: Dry-Run Stand-Ins for Replay Benchmarks
+import asyncio
+import base64
+import hashlib
+import struct
+import time
+from collections import Counter
+from solders.pubkey import Pubkey
+from config import *
+from mint_decoder import TOKEN_PROGRAM_ID
+from ray_log_decoder import SOL_MINT, MARKET_BASE_MINT_OFFSET, MARKET_QUOTE_MINT_OFFSET
+
+
+def _fake_pubkey(seed):
+    """Deterministic placeholder address derived from any string"""
+    return str(Pubkey(hashlib.sha256(seed.encode()).digest()))
+
+
+class DryRunRPCClient:
+    """
+    Answers the RPC calls the pool pipeline makes with synthetic data after a
+    fixed delay: every OpenBook market resolves to a fresh placeholder mint
+    paired with SOL, and every placeholder mint decodes as a plain SPL mint
+    without authorities.
+    """
+
+    def __init__(self, latency=REPLAY_DRY_RUN_RPC_LATENCY):
+        self.rpc_url = 'dry-run'
+        self.latency = latency
+        self.calls = Counter()
+        self._mints = set()
+
+    def _new_mint(self, seed):
+        mint = _fake_pubkey(seed)
+        self._mints.add(mint)
+        return mint
+
+    async def get_transaction(self, signature, commitment="confirmed"):
+        self.calls['getTransaction'] += 1
+        await asyncio.sleep(self.latency)
+        return {'result': {'meta': {'preTokenBalances': [], 'postTokenBalances': [{'mint': self._new_mint(signature)}]}}}
+
+    async def get_account_info(self, pubkey, encoding="base64", commitment="processed"):
+        self.calls['getAccountInfo'] += 1
+        await asyncio.sleep(self.latency)
+        if pubkey in self._mints:
+            data = struct.pack('<I32sQBBI32s', 0, bytes(32), 10 ** 15, 6, 1, 0, bytes(32))
+            owner = TOKEN_PROGRAM_ID
+        else:
+            data = bytearray(MARKET_QUOTE_MINT_OFFSET + 32)
+            data[MARKET_BASE_MINT_OFFSET:MARKET_BASE_MINT_OFFSET + 32] = bytes(Pubkey.from_string(self._new_mint(pubkey)))
+            data[MARKET_QUOTE_MINT_OFFSET:MARKET_QUOTE_MINT_OFFSET + 32] = bytes(Pubkey.from_string(SOL_MINT))
+            owner = 'dry-run'
+        return {'result': {'value': {'data': [base64.b64encode(bytes(data)).decode(), 'base64'], 'owner': owner}}}
+
+
+class DryRunBirdeyeClient:
+    """AsyncBirdeyeClient stand-in: security and overview payloads that pass the configured rules"""
+
+    def __init__(self, latency=REPLAY_DRY_RUN_BIRDEYE_LATENCY):
+        self.latency = latency
+        self.calls = Counter()
+
+    async def _get(self, endpoint, data, trace):
+        self.calls[endpoint] += 1
+        if trace is not None:
+            trace['attempts'] = 1
+        await asyncio.sleep(self.latency)
+        if trace is not None:
+            trace['status'] = 200
+        return data, None
+
+    async def token_security(self, address, max_retries=BIRDEYE_VETTING_MAX_RETRIES, trace=None):
+        return await self._get('token_security', {
+            'ownershipRenounced': True,
+            'freezeAuthority': None,
+            'top10HolderPercent': MAX_TOP10_HOLDER_PERCENT / 2,
+            'creatorAddress': _fake_pubkey(f"creator:{address}")
+        }, trace)
+
+    async def token_overview(self, address, max_retries=BIRDEYE_VETTING_MAX_RETRIES, trace=None):
+        return await self._get('token_overview', {
+            'liquidity': MIN_LIQUIDITY * 2,
+            'mc': MAX_MARKET_CAP / 2,
+            'creation_time': time.time()
+        }, trace)
+
+
+class DryRunStubs:
+    """RPC, Birdeye and buy stand-ins for one dry-run replay, with call counts for the summary"""
+
+    def __init__(self):
+        self.rpc = DryRunRPCClient()
+        self.birdeye = DryRunBirdeyeClient()
+        self.buys = 0
+
+    async def market_buy(self, token_address, amount_lamports):
+        """Pretend swap: waits like a send + confirm and returns a placeholder signature"""
+        self.buys += 1
+        await asyncio.sleep(REPLAY_DRY_RUN_BUY_LATENCY)
+        return f"dryrun-{token_address[:8]}"
+
+    def summary(self):
+        calls = {**self.rpc.calls, **self.birdeye.calls}
+        made = ', '.join(f"{name} {count}" for name, count in sorted(calls.items())) or 'none'
+        return f"Dry run: {self.buys} buys, calls {made}"
@@ -0,0 +1,166 @@
+# revet_scheduler.py - Kali Intelligence: Deferred Re-Vetting Scheduler
+import asyncio
+import heapq
+import itertools
+import time
+from termcolor import cprint
+from config import *
+
+
+class RevetScheduler:
+    """
+    Parks tokens Birdeye has not indexed yet and re-vets them later without
+    holding a pool worker.
+
+    - Parked tokens sit in a min-heap keyed by their next due time; a single
+      timer task sleeps until the earliest one is due.
+    - Each re-vet hands the token back to the normal buy path (handler).
+      If it is still not indexed the handler parks it again and the delay
+      grows by backoff, capped at max_delay.
+    - A token is abandoned once window seconds have passed since it was
+      first parked: by then the launch opportunity is gone.
+    """
+
+    def __init__(self, window=REVET_WINDOW_SECONDS, initial_delay=REVET_INITIAL_DELAY, backoff=REVET_BACKOFF,
+                 max_delay=REVET_MAX_DELAY, concurrency=REVET_CONCURRENCY, max_parked=REVET_MAX_PARKED):
+        self.window = window
+        self.initial_delay = initial_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.concurrency = concurrency
+        self.max_parked = max_parked
+        self._heap = []  # (due_at, seq, token_address, signature)
+        self._seq = itertools.count()
+        self._tracked = {}  # token_address -> {'first_seen', 'attempts'} while parked or re-vetting
+        self._handler = None
+        self._wakeup = None
+        self._slots = None
+        self._task = None
+        self._running = set()
+
+        # Metrics
+        self.parked = 0
+        self.retried = 0
+        self.resolved = 0
+        self.abandoned = 0
+
+    def start(self, handler):
+        """Start the timer task; handler is an async callable (token_address, signature)"""
+        self._handler = handler
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._task = asyncio.create_task(self._run())
+        cprint(f"⏳ Kali Intelligence: Re-vet scheduler started (window {self.window}s, concurrency {self.concurrency})", 'cyan')
+
+    async def stop(self):
+        """Cancel the timer and any re-vets in progress; parked tokens are dropped"""
+        tasks = [task for task in [self._task, *self._running] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running = set()
+        self._heap = []
+        self._tracked = {}
+
+    def park(self, token_address, signature=None):
+        """
+        Schedule a re-vet for a token that is not indexed yet.
+        Returns False if the token was abandoned instead.
+        """
+        now = time.time()
+        entry = self._tracked.get(token_address)
+        if entry is None:
+            if len(self._tracked) >= self.max_parked:
+                self.abandoned += 1
+                cprint(f"⚠️ Kali Intelligence: Re-vet queue full ({self.max_parked}), abandoning {token_address[-6:]}", 'yellow')
+                return False
+            entry = {'first_seen': now, 'attempts': 0}
+            self._tracked[token_address] = entry
+
+        delay = min(self.initial_delay * self.backoff ** entry['attempts'], self.max_delay)
+        if now + delay - entry['first_seen'] > self.window:
+            del self._tracked[token_address]
+            self.abandoned += 1
+            cprint(f"⌛ Kali Intelligence: Abandoning {token_address[-6:]} - still not indexed {now - entry['first_seen']:.0f}s after detection", 'yellow')
+            return False
+
+        entry['attempts'] += 1
+        entry['parked'] = True
+        heapq.heappush(self._heap, (now + delay, next(self._seq), token_address, signature))
+        self.parked += 1
+        cprint(f"🅿️ Kali Intelligence: Parked {token_address[-6:]} for re-vet in {delay:.1f}s (attempt {entry['attempts']})", 'cyan')
+        if self._wakeup is not None:
+            self._wakeup.set()  # New entry may be due earlier than the one the timer sleeps on
+        return True
+
+    def is_running(self):
+        return self._task is not None
+
+    def is_parked(self, token_address):
+        return token_address in self._tracked
+
+    def depth(self):
+        return len(self._heap)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            due_at = self._heap[0][0]
+            delay = due_at - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, token_address, signature = heapq.heappop(self._heap)
+            await self._slots.acquire()
+            task = asyncio.create_task(self._revet(token_address, signature))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _revet(self, token_address, signature):
+        entry = self._tracked.get(token_address)
+        try:
+            if entry is None:
+                return
+            entry['parked'] = False
+            self.retried += 1
+            cprint(f"🔁 Kali Intelligence: Re-vetting parked token {token_address[-6:]} (attempt {entry['attempts']})", 'cyan')
+            await self._handler(token_address, signature)
+        except Exception as e:
+            cprint(f"❌ Kali Intelligence: Re-vet error for {token_address[-6:]}: {e}", 'red')
+        finally:
+            self._slots.release()
+            # Not parked again by the handler: the token was bought or rejected
+            if entry is not None and not entry['parked'] and self._tracked.get(token_address) is entry:
+                del self._tracked[token_address]
+                self.resolved += 1
+
+    def stats(self):
+        """Parked / retried / resolved / abandoned counts"""
+        return {
+            'parked_now': len(self._heap),
+            'in_flight': len(self._running),
+            'parked': self.parked,
+            'retried': self.retried,
+            'resolved': self.resolved,
+            'abandoned': self.abandoned
+        }
+
+
+# Shared scheduler for the whole speed engine process
+_shared_scheduler = None
+
+def get_revet_scheduler():
+    """Return the process-wide RevetScheduler"""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = RevetScheduler()
+    return _shared_scheduler
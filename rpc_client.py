@@ -0,0 +1,120 @@
+# rpc_client.py - Kali Speed Engine: Pooled Async JSON-RPC Client
+import asyncio
+import itertools
+import aiohttp
+from termcolor import cprint
+import dontshare as d
+from config import *
+
+
+class AsyncRPCClient:
+    """
+    Non-blocking Solana JSON-RPC client.
+
+    Holds one aiohttp session with a pooled keep-alive connector, so every
+    call reuses an open connection instead of paying a new TCP/TLS handshake
+    and never stalls the event loop the way requests.post() does.
+    """
+
+    def __init__(self, rpc_url=None, max_connections=SPEED_ENGINE_RPC_MAX_CONNECTIONS, timeout=SPEED_ENGINE_RPC_TIMEOUT):
+        self.rpc_url = rpc_url or d.rpc_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session = None
+        self._loop = None
+        self._ids = itertools.count(1)
+
+    async def _get_session(self):
+        """Create the pooled session lazily, once per event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+        return self._session
+
+    async def call(self, method, params=None, timeout=None):
+        """
+        Send a single JSON-RPC request and return the decoded response dict.
+        Non-200 responses are returned as {'error': {...}} so callers handle
+        them the same way as RPC-level errors.
+        """
+        session = await self._get_session()
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": method,
+            "params": params or []
+        }
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        async with session.post(self.rpc_url, json=payload, timeout=request_timeout) as response:
+            if response.status != 200:
+                return {'error': {'code': response.status, 'message': f"HTTP {response.status}"}}
+            return await response.json(content_type=None)
+
+    async def get_transaction(self, signature, commitment="confirmed"):
+        """Fetch a parsed transaction by signature"""
+        return await self.call("getTransaction", [
+            signature,
+            {
+                "encoding": "jsonParsed",
+                "maxSupportedTransactionVersion": 0,
+                "commitment": commitment
+            }
+        ])
+
+    async def get_account_info(self, pubkey, encoding="base64", commitment="processed"):
+        """Fetch raw account data for a pubkey"""
+        return await self.call("getAccountInfo", [
+            pubkey,
+            {
+                "encoding": encoding,
+                "commitment": commitment
+            }
+        ])
+
+    async def get_slot(self, commitment="processed"):
+        """Current slot at the given commitment"""
+        return await self.call("getSlot", [{"commitment": commitment}])
+
+    async def get_signatures_for_address(self, address, until=None, before=None, limit=1000, commitment="confirmed"):
+        """Signatures touching an address, newest first, optionally bounded by until / before"""
+        options = {"limit": limit, "commitment": commitment}
+        if until:
+            options["until"] = until
+        if before:
+            options["before"] = before
+        return await self.call("getSignaturesForAddress", [address, options])
+
+    async def close(self):
+        """Close the pooled session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+# Shared client for the whole speed engine process
+_shared_client = None
+
+def get_rpc_client():
+    """Return the process-wide AsyncRPCClient"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncRPCClient()
+    return _shared_client
+
+async def close_rpc_client():
+    """Close the process-wide AsyncRPCClient if it was opened"""
+    if _shared_client is not None:
+        try:
+            await _shared_client.close()
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Error closing RPC client: {e}", 'yellow')
@@ -0,0 +1,91 @@
+# scan_engine.py - Kali Intelligence: Concurrent Rate-Limited Scan Engine
+import asyncio
+import time
+from termcolor import cprint
+from config import *
+from birdeye_client import AsyncBirdeyeClient
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` requests per second on average, bursts of up
+    to `burst`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate=BIRDEYE_RATE_LIMIT, burst=BIRDEYE_RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited = 0.0  # Total seconds callers spent waiting for quota
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+
+
+class ScanEngine:
+    """
+    Runs per-token Birdeye work over a whole candidate list. Each stage
+    (e.g. 'security', 'overview') has its own `concurrency` slots, so a
+    later stage is never queued behind the rest of an earlier one, and
+    every request (including retries) draws from one token bucket sized to
+    the Birdeye plan. Cached responses do not use quota.
+    """
+
+    def __init__(self, concurrency=SCAN_CONCURRENCY, rate=BIRDEYE_RATE_LIMIT, burst=BIRDEYE_RATE_BURST, max_retries=SCAN_MAX_RETRIES):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.limiter = TokenBucket(rate, burst)
+        self.client = AsyncBirdeyeClient(max_connections=max(concurrency, 1), limiter=self.limiter)
+        self._slots = {}  # stage -> asyncio.Semaphore
+        self.failed = 0
+
+    def submit(self, stage, process, address, *args):
+        """
+        Schedule process(address, *args) in `stage`'s slots. An exception is
+        logged and the task resolves to None, so one bad token never aborts
+        the scan.
+        """
+        slots = self._slots.setdefault(stage, asyncio.Semaphore(self.concurrency))
+
+        async def run():
+            async with slots:
+                try:
+                    return await process(address, *args)
+                except Exception as e:
+                    self.failed += 1
+                    cprint(f"⚠️ Kali Intelligence: {stage} check failed for {address[-6:]}: {e}", 'yellow')
+                    return None
+
+        return asyncio.ensure_future(run())
+
+    async def completed(self, tasks):
+        """
+        Yield the non-None results of everything that finished since the
+        last batch, until `tasks` is empty. Tasks the consumer adds to the
+        set between batches are picked up; the rest are cancelled on exit.
+        """
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                tasks.difference_update(done)
+                batch = [task.result() for task in done if task.result() is not None]
+                if batch:
+                    yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def close(self):
+        await self.client.close()
@@ -0,0 +1,325 @@
+# security_rules.py - Kali Intelligence: Declarative Token Rule Engine
+import numbers
+import sys
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from termcolor import cprint
+from config import *
+
+# One check against one field of a Birdeye payload.
+#   op: 'truthy'   fails when the field is truthy
+#       'not_null' fails when the field is present and not None
+#       'falsy'    fails when the field is missing / falsy
+#       'missing'  fails when the field is missing / None
+#       'gt' / 'lt' fails when the field is a number above / below threshold
+#   action: 'reject' or 'warn' (reported but not a failure)
+Rule = namedtuple('Rule', ['code', 'field', 'op', 'threshold', 'action', 'severity', 'message'])
+
+# Structured outcome of a failed rule
+Finding = namedtuple('Finding', ['code', 'severity', 'action', 'message', 'value'])
+
+
+def _flag_rule(code, field, op, enabled, severity, message, warning=None):
+    """Boolean check: rejects when enabled, otherwise optionally warns"""
+    if enabled:
+        return Rule(code, field, op, None, 'reject', severity, message)
+    if warning:
+        return Rule(code, field, op, None, 'warn', severity, warning)
+    return None
+
+
+def _numeric(value):
+    """
+    Number a limit is compared against, coerced like the vectorized path
+    (pd.to_numeric with errors='coerce', so '0.95' counts); None if not a number
+    """
+    if isinstance(value, numbers.Real):
+        number = float(value)
+    elif isinstance(value, str):
+        number = float(pd.to_numeric(value, errors='coerce'))
+    else:
+        return None
+    return None if number != number else number
+
+
+class RuleSet:
+    """
+    Ordered, compiled rules evaluated either on one record (dict) or on a
+    whole DataFrame of candidates in one vectorized pass.
+    """
+
+    def __init__(self, name, rules, defaults=None):
+        self.name = name
+        self.rules = [rule for rule in rules if rule is not None]
+        self.defaults = defaults or {}  # field -> value used when missing / None
+        self.reject_rules = [rule for rule in self.rules if rule.action == 'reject']
+
+    # === Single record ===
+
+    @staticmethod
+    def _fails(rule, value):
+        op = rule.op
+        if op == 'truthy':
+            return bool(value)
+        if op == 'not_null':
+            return value is not None
+        if op == 'falsy':
+            return not value
+        if op == 'missing':
+            return value is None
+        number = _numeric(value)
+        if number is None:
+            return False  # Numeric limits only apply to numbers
+        if op == 'gt':
+            return number > rule.threshold
+        if op == 'lt':
+            return number < rule.threshold
+        raise ValueError(f"Unknown rule op: {op}")
+
+    def _value(self, record, field):
+        value = record.get(field)
+        # NaN counts as missing, as it does in a DataFrame column
+        if value is None or (isinstance(value, float) and value != value):
+            return self.defaults.get(field)
+        return value
+
+    @staticmethod
+    def _finding(rule, value):
+        if rule.op in ('gt', 'lt'):
+            value = _numeric(value)  # '0.95' is reported (and formatted) as 0.95
+        return Finding(rule.code, rule.severity, rule.action, rule.message.format(value=value, threshold=rule.threshold), value)
+
+    def evaluate(self, record):
+        """All findings for one record, in rule order (rejects and warnings)"""
+        findings = []
+        for rule in self.rules:
+            value = self._value(record, rule.field)
+            if self._fails(rule, value):
+                findings.append(self._finding(rule, value))
+        return findings
+
+    def rejections(self, record):
+        return [finding for finding in self.evaluate(record) if finding.action == 'reject']
+
+    def first_rejection(self, record):
+        """First failing reject rule (the one an if-chain would stop at), or None"""
+        for rule in self.reject_rules:
+            value = self._value(record, rule.field)
+            if self._fails(rule, value):
+                return self._finding(rule, value)
+        return None
+
+    # === Vectorized ===
+
+    def _fail_mask(self, rule, frame):
+        default = self.defaults.get(rule.field)
+        if rule.field not in frame.columns:
+            column = pd.Series([default] * len(frame), index=frame.index, dtype=object)
+        else:
+            column = frame[rule.field]
+            if default is not None:
+                column = column.where(column.notna(), default)
+        op = rule.op
+        missing = column.isna().to_numpy()
+        if op in ('truthy', 'falsy'):
+            values = column.to_numpy(dtype=object)
+            truthy = np.zeros(len(values), dtype=bool)
+            truthy[~missing] = values[~missing].astype(bool)
+            return truthy if op == 'truthy' else ~truthy
+        if op == 'not_null':
+            return ~missing
+        if op == 'missing':
+            return missing
+        # Strings and other non-numbers never trip a limit
+        numeric = pd.to_numeric(column, errors='coerce').to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            if op == 'gt':
+                return numeric > rule.threshold
+            if op == 'lt':
+                return numeric < rule.threshold
+        raise ValueError(f"Unknown rule op: {op}")
+
+    def evaluate_frame(self, frame):
+        """
+        Evaluate every reject rule over a DataFrame (one row per token).
+        Returns a DataFrame aligned to frame.index with:
+          rejected (bool), reject_reason (first failing code or None),
+          reject_reasons (list of all failing codes)
+        """
+        codes = np.array([rule.code for rule in self.reject_rules], dtype=object)
+        if not len(frame) or not len(codes):
+            return pd.DataFrame({
+                'rejected': np.zeros(len(frame), dtype=bool),
+                'reject_reason': pd.Series([None] * len(frame), index=frame.index, dtype=object),
+                'reject_reasons': [[] for _ in range(len(frame))]
+            }, index=frame.index)
+
+        masks = np.vstack([self._fail_mask(rule, frame) for rule in self.reject_rules])  # rules x rows
+        rejected = masks.any(axis=0)
+        first = masks.argmax(axis=0)
+        reject_reason = np.where(rejected, codes[first], None)
+        reject_reasons = [[] for _ in range(masks.shape[1])]
+        rows, rules = np.nonzero(masks.T)  # Row-major, so each row's codes stay in rule order
+        for row, rule in zip(rows.tolist(), rules.tolist()):
+            reject_reasons[row].append(codes[rule])
+        return pd.DataFrame({
+            'rejected': rejected,
+            # object dtype keeps None for passing rows (no string-dtype NaN)
+            'reject_reason': pd.Series(reject_reason, index=frame.index, dtype=object),
+            'reject_reasons': reject_reasons
+        }, index=frame.index)
+
+
+# === Rule sets compiled from config.py ===
+
+def security_rules():
+    """Birdeye token_security checks (https://docs.birdeye.so/docs/security)"""
+    return RuleSet('security', [
+        # CRITICAL
+        _flag_rule('fake_token', 'fakeToken', 'truthy', REJECT_FAKE_TOKENS, 'critical',
+                   "FAKE TOKEN - Scam/imitation detected"),
+        _flag_rule('ownership_not_renounced', 'ownershipRenounced', 'falsy', REJECT_NON_RENOUNCED_OWNERSHIP, 'critical',
+                   "OWNERSHIP NOT RENOUNCED - Owner can change parameters",
+                   "OWNERSHIP NOT RENOUNCED - Owner retains control (RISK ACCEPTED)"),
+        _flag_rule('honeypot', 'honeypot', 'truthy', REJECT_HONEYPOTS, 'critical',
+                   "HONEYPOT - Buyers cannot sell"),
+        _flag_rule('freezable', 'freezable', 'truthy', REJECT_FREEZABLE_TOKENS, 'critical',
+                   "FREEZABLE - Can freeze token transfers"),
+        _flag_rule('freezable', 'freezeAuthority', 'not_null', REJECT_FREEZABLE_TOKENS, 'critical',
+                   "FREEZE AUTHORITY EXISTS"),
+        _flag_rule('token_2022_program', 'isToken2022', 'truthy', REJECT_TOKEN_2022, 'critical',
+                   "TOKEN 2022 PROGRAM - Experimental standard"),
+        # HIGH RISK
+        _flag_rule('mintable', 'mintable', 'truthy', REJECT_MINTABLE_TOKENS, 'high',
+                   "MINTABLE - Can create infinite supply"),
+        _flag_rule('mutable_metadata', 'mutableMetadata', 'truthy', REJECT_MUTABLE_METADATA, 'high',
+                   "MUTABLE METADATA - Can change name/logo",
+                   "MUTABLE METADATA detected - Token can change name/logo (allowed)"),
+        _flag_rule('transfer_fees', 'transferFees', 'truthy', REJECT_TRANSFER_FEES, 'high',
+                   "TRANSFER FEES - Charges fees on transfers"),
+        Rule('buy_tax', 'buyTax', 'gt', MAX_BUY_TAX, 'reject', 'high',
+             "BUY TAX {value:.1%} > {threshold:.1%}"),
+        Rule('sell_tax', 'sellTax', 'gt', MAX_SELL_TAX, 'reject', 'high',
+             "SELL TAX {value:.1%} > {threshold:.1%}"),
+        Rule('owner_percentage', 'ownerPercentage', 'gt', MAX_OWNER_PERCENTAGE, 'reject', 'high',
+             "OWNER HOLDS {value:.1%} > {threshold:.1%}"),
+        Rule('update_authority_percentage', 'updateAuthorityPercentage', 'gt', MAX_UPDATE_AUTHORITY_PERCENTAGE, 'reject', 'high',
+             "UPDATE AUTHORITY HOLDS {value:.1%} > {threshold:.1%}"),
+        Rule('top_holder_percent', 'top10HolderPercent', 'gt', MAX_TOP10_HOLDER_PERCENT, 'reject', 'high',
+             "TOP 10 HOLDERS {value:.1%} > {threshold:.1%}"),
+        _flag_rule('missing_holder_data', 'top10HolderPercent', 'missing', REJECT_MISSING_HOLDER_DATA, 'high',
+                   "NO TOP 10 HOLDER DATA"),
+        # MEDIUM RISK
+        _flag_rule('mutable_info', 'mutableInfo', 'truthy', not ALLOW_MUTABLE_INFO, 'medium',
+                   "MUTABLE INFO - Token info can be changed",
+                   "MUTABLE INFO detected - Additional token info can be changed (allowed)"),
+    ])
+
+
+def mint_rules():
+    """On-chain mint account checks (see mint_decoder.py) - no Birdeye indexing needed"""
+    return RuleSet('mint', [
+        _flag_rule('freezable', 'freezable', 'truthy', REJECT_FREEZABLE_TOKENS, 'critical',
+                   "FREEZE AUTHORITY SET ON MINT - Can freeze token transfers"),
+        _flag_rule('token_2022_program', 'isToken2022', 'truthy', REJECT_TOKEN_2022, 'critical',
+                   "TOKEN 2022 PROGRAM - Experimental standard"),
+        _flag_rule('mintable', 'mintable', 'truthy', REJECT_MINTABLE_TOKENS, 'high',
+                   "MINT AUTHORITY SET ON MINT - Can create infinite supply"),
+        _flag_rule('transfer_fees', 'transferFees', 'truthy', REJECT_TRANSFER_FEES, 'high',
+                   "TRANSFER FEE EXTENSION - Charges fees on transfers"),
+    ])
+
+
+def market_rules(min_liquidity=MIN_LIQUIDITY, max_market_cap=MAX_MARKET_CAP):
+    """token_overview liquidity / market cap bounds"""
+    return RuleSet('market', [
+        Rule('min_liquidity', 'liquidity', 'lt', min_liquidity, 'reject', 'market',
+             "Insufficient liquidity (${value:,.2f} < ${threshold:,.2f})"),
+        Rule('max_market_cap', 'mc', 'gt', max_market_cap, 'reject', 'market',
+             "Market cap too high (${value:,.2f} > ${threshold:,.2f})"),
+    ], defaults={'liquidity': 0, 'mc': 0})
+
+
+def activity_rules(max_sell_percentage=MAX_SELL_PERCENTAGE, min_trades_last_hour=MIN_TRADES_LAST_HOUR, min_unique_wallets=MIN_UNQ_WALLETS2HR):
+    """Scanner trading-activity checks on token_overview (see add_activity_fields)"""
+    return RuleSet('activity', [
+        Rule('top_holder_percent', 'top10HolderPercent', 'gt', MAX_TOP10_HOLDER_PERCENT, 'reject', 'high',
+             "Top 10 holders own too much ({value:.1%} > {threshold:.1%})"),
+        Rule('sell_percentage', 'sell_percentage', 'gt', max_sell_percentage, 'reject', 'activity',
+             "High sell % ({value:.1f}%)"),
+        Rule('min_trades', 'trade1h', 'lt', min_trades_last_hour, 'reject', 'activity',
+             "Low trades ({value})"),
+        Rule('min_unique_wallets', 'uniqueWallet24h', 'lt', min_unique_wallets, 'reject', 'activity',
+             "Low wallets ({value})"),
+    ], defaults={'top10HolderPercent': 0, 'uniqueWallet24h': 0})
+
+
+def add_activity_fields(overview):
+    """Derive trade1h / buy_percentage / sell_percentage on an overview dict (copy)"""
+    record = dict(overview)
+    buy1h = record.get('buy1h') or 0
+    sell1h = record.get('sell1h') or 0
+    trade1h = buy1h + sell1h
+    record['trade1h'] = trade1h
+    record['buy_percentage'] = (buy1h / trade1h * 100) if trade1h else 0
+    record['sell_percentage'] = (sell1h / trade1h * 100) if trade1h else 0
+    return record
+
+
+def add_activity_columns(frame):
+    """Vectorized add_activity_fields for a DataFrame of overviews (copy)"""
+    frame = frame.copy()
+    zeros = pd.Series(0.0, index=frame.index)
+    buy1h = pd.to_numeric(frame['buy1h'], errors='coerce').fillna(0) if 'buy1h' in frame else zeros
+    sell1h = pd.to_numeric(frame['sell1h'], errors='coerce').fillna(0) if 'sell1h' in frame else zeros
+    trade1h = buy1h + sell1h
+    safe = trade1h.where(trade1h != 0)
+    frame['trade1h'] = trade1h
+    frame['buy_percentage'] = (buy1h / safe * 100).fillna(0)
+    frame['sell_percentage'] = (sell1h / safe * 100).fillna(0)
+    return frame
+
+
+# Compiled once at import from the current config
+SECURITY_RULES = security_rules()
+MINT_RULES = mint_rules()
+MARKET_RULES = market_rules()
+ACTIVITY_RULES = activity_rules()
+
+
+def check():
+    """
+    Run every compiled rule set through rejections() / first_rejection() and
+    evaluate_frame() on the same rows; returns the number of disagreeing rows
+    """
+    tricky = [None, float('nan'), 0, 1, -1, 0.95, 50, 1e9, True, False, '0.95', ' 50 ', '1e3', 'abc', '',
+              'inf', 'nan', np.int64(7), np.float64(0.3), [], {}]
+    mismatches = 0
+    for rules in (SECURITY_RULES, MINT_RULES, MARKET_RULES, ACTIVITY_RULES):
+        fields = sorted({rule.field for rule in rules.rules})
+        rows = [{}]
+        for field in fields:
+            rows.extend({field: value} for value in tricky)
+        # Mixed rows: every field at once, cycling through the tricky values
+        rows.extend({field: tricky[(i + j) % len(tricky)] for j, field in enumerate(fields)} for i in range(len(tricky)))
+
+        frame = pd.DataFrame.from_records(rows, columns=fields)
+        verdicts = rules.evaluate_frame(frame)
+        for i, row in enumerate(rows):
+            codes = [finding.code for finding in rules.rejections(row)]
+            first = rules.first_rejection(row)
+            if codes != verdicts['reject_reasons'].iloc[i] or (first.code if first else None) != verdicts['reject_reason'].iloc[i]:
+                cprint(f"❌ {rules.name}: {row} -> record {codes}, frame {verdicts['reject_reasons'].iloc[i]}", 'red')
+                mismatches += 1
+
+    cprint(f"🧪 Kali Intelligence: Record vs vectorized rule paths - {mismatches} mismatching rows", 'green' if not mismatches else 'red')
+    return mismatches
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        sys.exit(1 if check() else 0)
+    else:
+        print("Usage:")
+        print("  python security_rules.py check   # Record and DataFrame evaluation must agree on the same rows")
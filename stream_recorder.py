@@ -0,0 +1,92 @@
+# stream_recorder.py - Kali Speed Engine: Record & Replay for the Raydium Log Stream
+import asyncio
+import os
+import struct
+import time
+from termcolor import cprint
+from config import *
+
+# File layout: MAGIC, then one record per websocket frame:
+#   arrival time (f64 unix seconds), endpoint length (u16), frame length (u32),
+#   endpoint label bytes, raw frame bytes
+MAGIC = b"KALIREC1"
+RECORD_HEADER = struct.Struct('<dHI')
+
+
+class StreamRecorder:
+    """Append-only recorder for raw websocket frames with arrival timestamps"""
+
+    def __init__(self, path):
+        self.path = path
+        self.frames = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'ab')
+        if is_new:
+            self._file.write(MAGIC)
+
+    def write(self, endpoint, arrival, message):
+        """Append one frame (str or bytes) as received"""
+        payload = message.encode('utf-8') if isinstance(message, str) else message
+        endpoint_bytes = endpoint.encode('utf-8')
+        self._file.write(RECORD_HEADER.pack(arrival, len(endpoint_bytes), len(payload)))
+        self._file.write(endpoint_bytes)
+        self._file.write(payload)
+        self.frames += 1
+
+    def close(self):
+        try:
+            self._file.close()
+            cprint(f"💾 Kali Speed Engine: Recorded {self.frames} frames to {self.path}", 'cyan')
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Error closing recording: {e}", 'yellow')
+
+
+def read_recording(path):
+    """Yield (arrival, endpoint, frame_bytes) tuples from a recording file"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Kali stream recording")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return  # End of file (or a partially written last record)
+            arrival, endpoint_len, frame_len = RECORD_HEADER.unpack(header)
+            endpoint = f.read(endpoint_len).decode('utf-8')
+            frame = f.read(frame_len)
+            if len(frame) < frame_len:
+                return
+            yield arrival, endpoint, frame
+
+
+async def replay_recording(path, handle_message, fast=REPLAY_AS_FAST_AS_POSSIBLE, ready=None):
+    """
+    Feed a recording into handle_message(message, endpoint, arrival), either
+    with the original inter-frame timing or as fast as possible.
+    ready, if given, is awaited before every frame so a bounded consumer can
+    apply backpressure (e.g. PoolWorkQueue.wait_for_room) instead of dropping.
+    Returns (frames, elapsed_seconds).
+    """
+    frames = 0
+    start = time.perf_counter()
+    first_arrival = None
+
+    for arrival, endpoint, message in read_recording(path):
+        if not fast:
+            if first_arrival is None:
+                first_arrival = arrival
+            delay = (arrival - first_arrival) - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if ready is not None:
+            await ready()
+        # Let workers and background tasks run between frames
+        await asyncio.sleep(0)
+        try:
+            # Recorded arrival keeps per-endpoint race stats faithful to the original run
+            handle_message(message, endpoint, arrival)
+        except Exception as e:
+            cprint(f"⚠️ Kali Speed Engine: Replay frame error: {e}", 'yellow')
+        frames += 1
+
+    return frames, time.perf_counter() - start
@@ -0,0 +1,398 @@
+# token_vetting.py - Kali Intelligence: Concurrent Pre-Trade Token Vetting
+import asyncio
+import time
+from datetime import datetime
+from termcolor import cprint
+import nice_funcs as n
+from config import *
+from birdeye_client import AsyncBirdeyeClient
+from rpc_client import AsyncRPCClient
+from mint_decoder import fetch_mint
+from security_rules import SECURITY_RULES, MARKET_RULES, MINT_RULES
+from verdict_store import get_verdict_store
+from vetting_stats import VettingStage, get_vetting_stats
+from vetting_profiler import get_vetting_profiler
+
+
+class VettingContext:
+    """
+    Per-token fetch results shared by every vetting stage.
+
+    Each source is requested at most once: the first stage that needs it
+    starts the fetch, later stages await the same task.
+    """
+
+    def __init__(self, token_address, birdeye_client, max_retries=BIRDEYE_VETTING_MAX_RETRIES, rpc_client=None):
+        self.token_address = token_address
+        self.birdeye_client = birdeye_client
+        self.rpc_client = rpc_client
+        self.max_retries = max_retries
+        self.reasons = []  # Rejection codes, in the order stages reported them
+        self.stage_times = {}  # Stage name -> seconds until its verdict
+        self.fetches = {}  # Source -> {'seconds', 'attempts', 'status'}
+        self._tasks = {}
+
+    def _fetch(self, name, factory):
+        if name not in self._tasks:
+            trace = self.fetches.setdefault(name, {})
+
+            async def timed():
+                started = time.perf_counter()
+                try:
+                    return await factory(trace)
+                except asyncio.CancelledError:
+                    trace['cancelled'] = True  # Cut short by an earlier rejection, not a real fetch latency
+                    raise
+                finally:
+                    trace['seconds'] = time.perf_counter() - started
+
+            self._tasks[name] = asyncio.ensure_future(timed())
+        return self._tasks[name]
+
+    async def _fetch_mint(self, trace):
+        trace['attempts'] = 1
+        return await fetch_mint(self.rpc_client, self.token_address)
+
+    def mint(self):
+        """On-chain mint account -> (decoded mint, error message)"""
+        return self._fetch('mint', self._fetch_mint)
+
+    def security(self):
+        """token_security -> (data, error)"""
+        return self._fetch('security', lambda trace: self.birdeye_client.token_security(self.token_address, self.max_retries, trace=trace))
+
+    def overview(self):
+        """token_overview -> (data, error)"""
+        return self._fetch('overview', lambda trace: self.birdeye_client.token_overview(self.token_address, self.max_retries, trace=trace))
+
+    async def deployer(self):
+        """Creator address, read from the security payload instead of a second request"""
+        data, _ = await self.security()
+        if data:
+            return data.get('creatorAddress') or data.get('deployer')
+        return None
+
+    def prefetch(self, sources=('security', 'overview')):
+        """Start every independent fetch now so they run concurrently"""
+        for source in sources:
+            getattr(self, source)()
+
+    async def cancel(self):
+        """Cancel outstanding fetches and wait for them, so every trace is final before profiling"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def reject(self, code):
+        self.reasons.append(code)
+
+    def profile(self, verdict, total_seconds):
+        """Structured record for vetting_profiler.py"""
+        return {
+            'ts': time.time(),
+            'token': self.token_address,
+            'verdict': verdict,
+            'reason': self.reasons[0] if self.reasons else None,
+            'reasons': list(self.reasons),
+            'total_seconds': total_seconds,
+            'stages': dict(self.stage_times),
+            'fetches': {source: dict(trace) for source, trace in self.fetches.items()}
+        }
+
+    def snapshot(self):
+        """Raw data fetched so far (stored alongside the verdict)"""
+        snapshot = {}
+        for name, task in self._tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is None:
+                data, error = task.result()
+                if data and not error:
+                    snapshot[name] = data
+        return snapshot
+
+
+# === Rule stages: each prints its own verdict and returns True (pass) / False ===
+
+def _report(findings, context=None):
+    """Print warnings, then the first rejection; True if nothing rejected"""
+    rejected = None
+    for finding in findings:
+        if finding.action == 'warn':
+            cprint(f"   ⚠️ WARNING: {finding.message}", 'yellow')
+        elif rejected is None:
+            rejected = finding
+    if rejected:
+        cprint(f"   🚨 VETTING FAILED: {rejected.message}", 'red')
+        if context is not None:
+            context.reject(rejected.code)
+        return False
+    return True
+
+
+def security_rules_pass(security_data, context=None):
+    """Birdeye token_security filters, compiled from config in security_rules.py"""
+    if not _report(SECURITY_RULES.evaluate(security_data), context):
+        return False
+    cprint("   ✅ ALL SECURITY CHECKS PASSED", 'green')
+    return True
+
+
+def mint_rules_pass(mint_data, context=None):
+    """Authorities / program read straight from the mint account"""
+    if not _report(MINT_RULES.evaluate(mint_data), context):
+        return False
+    program = "Token-2022" if mint_data['isToken2022'] else "SPL Token"
+    cprint(f"   ✅ On-chain mint checks passed ({program}, {mint_data['decimals']} decimals)", 'green')
+    return True
+
+
+def market_rules_pass(overview_data, context=None):
+    """Liquidity / market cap bounds from token_overview"""
+    if not _report(MARKET_RULES.evaluate(overview_data), context):
+        return False
+    liquidity = overview_data.get('liquidity') or 0
+    market_cap = overview_data.get('mc') or 0
+    cprint(f"   ✅ Market checks passed (Liquidity: ${liquidity:,.0f}, MC: ${market_cap:,.0f})", 'green')
+    return True
+
+
+def _parse_creation_time(creation_time):
+    """Birdeye creation time (unix seconds or ISO string) -> unix seconds or None"""
+    if not isinstance(creation_time, str):
+        return creation_time
+    try:
+        return datetime.fromisoformat(creation_time.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        try:
+            return datetime.strptime(creation_time, "%Y-%m-%dT%H:%M:%S.%fZ").timestamp()
+        except ValueError:
+            return None
+
+
+def token_age_rules_pass(overview_data, context=None):
+    """Reject old tokens; a missing age is normal for speed engine detections"""
+    try:
+        liquidity = overview_data.get('liquidity', 0) or 0
+        market_cap = overview_data.get('mc', 0) or 0
+        creation_time = overview_data.get('creation_time') or overview_data.get('createdAt')
+        creation_timestamp = _parse_creation_time(creation_time) if creation_time else None
+
+        if creation_timestamp:
+            token_age_hours = (time.time() - creation_timestamp) / 3600
+            if token_age_hours > MAX_TOKEN_AGE_HOURS:
+                cprint(f"   🚨 VETTING FAILED: Token too old ({token_age_hours:.1f}h > {MAX_TOKEN_AGE_HOURS}h)", 'red')
+                if context is not None:
+                    context.reject('token_too_old')
+                return False
+            cprint(f"   ✅ Token age check passed: {token_age_hours:.1f}h old", 'green')
+            return True
+
+        # No usable age: $1M+ liquidity or market cap suggests an old token
+        if liquidity > 1000000 or market_cap > 1000000:
+            cprint(f"   🚨 VETTING FAILED: High liquidity/MC without age data suggests old token (Liq: ${liquidity:,.0f}, MC: ${market_cap:,.0f})", 'red')
+            if context is not None:
+                context.reject('old_token_no_age')
+            return False
+        cprint(f"   ✅ Token age check: No age data but low liquidity/MC - likely fresh token", 'green')
+    except Exception as age_error:
+        cprint(f"   ⚠️ Token age check error: {age_error} (proceeding anyway for new tokens)", 'yellow')
+    return True
+
+
+# === Stages: await the data they need from the shared context, then apply rules ===
+# (True = pass, False = reject, None = data not indexed yet - caller may defer)
+
+def _fetch_failed(error, context):
+    if error.retryable and context.max_retries <= 1:
+        cprint(f"   ⏳ {error} - not indexed yet", 'yellow')
+        return None
+    cprint(f"   🚨 VETTING FAILED: {error}", 'red')
+    context.reject('fetch_error')
+    return False
+
+
+async def _mint_stage(context):
+    """On-chain authorities; an RPC problem defers to the Birdeye checks"""
+    mint_data, error = await context.mint()
+    if error:
+        cprint(f"   ⚠️ On-chain mint check skipped: {error}", 'yellow')
+        return True
+    return mint_rules_pass(mint_data, context)
+
+
+async def _security_stage(context):
+    security_data, error = await context.security()
+    if error:
+        return _fetch_failed(error, context)
+    if not security_data:
+        cprint("   🚨 VETTING FAILED: No security data returned from Birdeye", 'red')
+        context.reject('no_data')
+        return False
+    return security_rules_pass(security_data, context)
+
+
+async def _market_stage(context):
+    overview_data, error = await context.overview()
+    if error:
+        return _fetch_failed(error, context)
+    if not overview_data:
+        cprint("   🚨 VETTING FAILED: No overview data returned from Birdeye", 'red')
+        context.reject('no_data')
+        return False
+    return market_rules_pass(overview_data, context) and token_age_rules_pass(overview_data, context)
+
+
+async def _deployer_stage(context):
+    deployer = await context.deployer()
+    if n.check_deployer_blacklist(deployer):
+        # check_deployer_blacklist already prints the reason
+        context.reject('blacklisted_deployer')
+        return False
+    if deployer:
+        cprint(f"   ✅ Deployer check passed: {deployer[-6:]}", 'green')
+    else:
+        cprint("   ⚠️ Could not verify deployer (proceeding anyway)", 'yellow')
+    return True
+
+
+# Declared order; vetting_stats reorders them from observed cost and selectivity
+VETTING_STAGES = (
+    VettingStage('mint', _mint_stage, ('mint',)),
+    VettingStage('security', _security_stage, ('security',)),
+    VettingStage('market', _market_stage, ('overview',)),
+    VettingStage('deployer', _deployer_stage, ('security',)),
+)
+
+
+async def _timed_stage(stage, context, stats):
+    started = time.perf_counter()
+    verdict = await stage.run(context)
+    elapsed = time.perf_counter() - started
+    context.stage_times[stage.name] = elapsed
+    stats.record_stage(stage.name, verdict, elapsed)
+    return verdict
+
+
+async def _run_stages(context, stats):
+    """
+    Gate stages one at a time, then the rest concurrently -> True / False / None (deferred).
+    A gate rejection means the remaining stages' data is never requested; only
+    stages much cheaper than the rest gate (see VettingStats.split_gate).
+    """
+    applicable = [
+        stage for stage in VETTING_STAGES
+        if stage.name != 'mint' or (context.rpc_client is not None and ONCHAIN_MINT_VETTING)
+    ]
+    ordered = stats.current_order(applicable)
+    gate, tail = stats.split_gate(ordered)
+    stages = []
+    deferred = False
+    try:
+        for stage in gate:
+            verdict = await _timed_stage(stage, context, stats)
+            if verdict is None:
+                deferred = True
+            elif not verdict:
+                return False
+
+        context.prefetch([source for stage in tail for source in stage.sources])
+        stages = [asyncio.ensure_future(_timed_stage(stage, context, stats)) for stage in tail]
+        for finished in asyncio.as_completed(stages):
+            verdict = await finished
+            if verdict is None:
+                deferred = True  # Keep going: a hard failure elsewhere still rejects outright
+            elif not verdict:
+                return False
+    except Exception as e:
+        cprint(f"   🚨 VETTING FAILED: Unexpected error: {e}", 'red')
+        context.reject('fetch_error')
+        return False
+    finally:
+        for stage in stages:
+            stage.cancel()
+        await asyncio.gather(*stages, return_exceptions=True)
+        await context.cancel()
+    return None if deferred else True
+
+
+async def vet_token(token_address, birdeye_client, defer=False, rpc_client=None, outcome=None, persist=True):
+    """
+    🧠 KALI INTELLIGENCE ENGINE: async pre-trade vetting.
+
+    Security and overview are fetched concurrently; each stage evaluates as
+    soon as its data arrives and the first failure cancels the rest, so the
+    worst case is the slowest fetch rather than the sum of all of them.
+
+    With an rpc_client the mint account is decoded first: freezable, mintable
+    or Token-2022 mints are rejected after one RPC round-trip, before any
+    Birdeye request (or Birdeye indexing delay).
+
+    defer=True makes a single Birdeye attempt per endpoint instead of
+    retrying in place; a token that is not indexed yet returns None so the
+    caller can park it (see revet_scheduler.py).
+
+    Verdicts are read from and written to the shared verdict store, so a
+    mint is fully vetted at most once per TTL across processes. Every call
+    appends a profile record (stage times, fetch retries, failing rule) to
+    VETTING_PROFILE_FILE; pass a dict as outcome to receive it as well.
+    persist=False (dry-run replays) skips the verdict store, the profile
+    file and the saved stage order.
+    Returns True if the token passes all checks, False if it fails one,
+    None if it was deferred.
+    """
+    started = time.perf_counter()
+    store = get_verdict_store() if VERDICT_STORE_ENABLED and persist else None
+    if store is not None:
+        cached = store.lookup(token_address, source='vetting')
+        if cached is not None:
+            age = time.time() - cached.decided_at
+            if cached.passed:
+                cprint(f"🗄️ Kali Intelligence: {token_address[-6:]} approved {age:.0f}s ago (cached verdict)", 'green')
+            else:
+                cprint(f"🗄️ Kali Intelligence: {token_address[-6:]} rejected {age:.0f}s ago: {cached.reason} (cached verdict)", 'red')
+            context = VettingContext(token_address, birdeye_client)
+            context.reasons = list(cached.reasons)
+            profile = context.profile('cached', time.perf_counter() - started)
+            if outcome is not None:
+                outcome.update(profile)
+            if VETTING_PROFILE_ENABLED:
+                await asyncio.to_thread(get_vetting_profiler().record, profile)
+            return cached.passed
+
+    cprint(f"🔬 Kali Intelligence: Vetting token {token_address[-6:]}", 'yellow', attrs=['bold'])
+    context = VettingContext(token_address, birdeye_client, max_retries=1 if defer else BIRDEYE_VETTING_MAX_RETRIES, rpc_client=rpc_client)
+    stats = get_vetting_stats()
+    result = await _run_stages(context, stats)
+    verdict = 'deferred' if result is None else ('pass' if result else 'reject')
+    profile = context.profile(verdict, time.perf_counter() - started)
+    cprint(f"   ⏱️ Vetting {verdict} in {profile['total_seconds']:.2f}s ({', '.join(f'{name} {seconds:.2f}s' for name, seconds in context.stage_times.items())})", 'cyan')
+    if outcome is not None:
+        outcome.update(profile)
+    if VETTING_PROFILE_ENABLED and persist:
+        await asyncio.to_thread(get_vetting_profiler().record, profile)
+
+    if result is not None and stats.record_vetting(context.reasons):
+        stats.reorder(VETTING_STAGES)
+        if persist:
+            await asyncio.to_thread(stats.save, stats.snapshot())
+
+    if result is None:
+        cprint(f"   ⏳ Token {token_address[-6:]} not fully indexed by Birdeye yet - deferring", 'yellow')
+        return None
+    if store is not None:
+        await asyncio.to_thread(store.record, token_address, result, context.reasons, 'vetting', context.snapshot())
+    if result:
+        cprint(f"   🎯 INTELLIGENCE VETTING PASSED: Token {token_address[-6:]} approved for trading!", 'white', 'on_green', attrs=['bold'])
+    return result
+
+
+def vet_token_sync(token_address, birdeye_api_key=None):
+    """Blocking entry point for synchronous callers (runs its own event loop)"""
+    async def run():
+        client = AsyncBirdeyeClient(birdeye_api_key)
+        rpc_client = AsyncRPCClient()
+        try:
+            return await vet_token(token_address, client, rpc_client=rpc_client)
+        finally:
+            await client.close()
+            await rpc_client.close()
+    return asyncio.run(run())
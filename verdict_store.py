@@ -0,0 +1,227 @@
+# verdict_store.py - Kali Intelligence: Persistent Vetting Verdict Store
+import json
+import sys
+import tempfile
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from termcolor import cprint
+from config import *
+
+# Stored outcome of a full vetting run for one mint
+Verdict = namedtuple('Verdict', ['mint', 'passed', 'reason', 'reason_class', 'reasons', 'source', 'snapshot', 'decided_at', 'expires_at'])
+
+# Rejection code -> reason class; the class picks the TTL in VERDICT_TTLS.
+#   permanent: properties a token never loses
+#   authority: authorities / taxes an owner can still renounce or change
+#   market:    liquidity, holders and activity, which move minute to minute
+#   transient: fetch problems - never stored
+REASON_CLASSES = {
+    'fake_token': 'permanent',
+    'honeypot': 'permanent',
+    'token_2022_program': 'permanent',
+    'transfer_fees': 'permanent',
+    'blacklisted_deployer': 'permanent',
+    'token_too_old': 'permanent',
+    'old_token_no_age': 'permanent',
+    'freezable': 'authority',
+    'mintable': 'authority',
+    'ownership_not_renounced': 'authority',
+    'mutable_metadata': 'authority',
+    'mutable_info': 'authority',
+    'buy_tax': 'authority',
+    'sell_tax': 'authority',
+    'fetch_error': 'transient',
+    'no_data': 'transient',
+}
+
+# Rejections in these classes hold for every caller. Market-class rejections
+# (liquidity, holders, activity) depend on the thresholds of the entry point
+# that made them, so like passes they only count for their own source.
+SHARED_REASON_CLASSES = ('permanent', 'authority')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    mint TEXT PRIMARY KEY,
+    passed INTEGER NOT NULL,
+    reason TEXT,
+    reason_class TEXT NOT NULL,
+    reasons TEXT NOT NULL,
+    source TEXT NOT NULL,
+    snapshot TEXT,
+    decided_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+_COLUMNS = "mint, passed, reason, reason_class, reasons, source, snapshot, decided_at, expires_at"
+
+
+def reason_class(code):
+    return REASON_CLASSES.get(code, 'market')
+
+
+def _applies(row, source):
+    """Whether a stored row (in _COLUMNS order) counts for a lookup from `source`"""
+    if source is None or row[5] == source:
+        return True
+    return not row[1] and row[3] in SHARED_REASON_CLASSES
+
+
+def _verdict(row):
+    return Verdict(row[0], bool(row[1]), row[2], row[3], json.loads(row[4]), row[5],
+                   json.loads(row[6]) if row[6] else None, row[7], row[8])
+
+
+class VerdictStore:
+    """
+    Mint -> last vetting verdict, shared by the speed engine, the scanner and
+    the hybrid poller through one SQLite file in WAL mode (concurrent readers,
+    one writer, safe across processes).
+
+    Each verdict expires after the TTL of its reason (VERDICT_REASON_TTLS)
+    or else its reason class, so a honeypot stays rejected for days while a
+    thin-liquidity rejection is retried after a few minutes.
+    """
+
+    def __init__(self, path=VERDICT_STORE_FILE, ttls=VERDICT_TTLS, reason_ttls=VERDICT_REASON_TTLS):
+        self.path = path
+        self.ttls = ttls
+        self.reason_ttls = reason_ttls
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, mint, source=None):
+        """
+        Unexpired verdict for a mint, or None.
+        Permanent / authority rejections apply to every caller; passes and
+        market rejections only count for the source that recorded them,
+        since each entry point applies its own thresholds.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM verdicts WHERE mint = ? AND expires_at > ?", (mint, time.time())
+            ).fetchone()
+        if row is None or not _applies(row, source):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _verdict(row)
+
+    def lookup_many(self, mints, source=None):
+        """mint -> Verdict for every mint with an unexpired verdict (same rules as lookup)"""
+        mints = list(dict.fromkeys(mints))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(mints), 500):  # Stay under SQLite's bound-parameter limit
+                chunk = mints[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM verdicts WHERE mint IN ({placeholders}) AND expires_at > ?", (*chunk, now)
+                ):
+                    if _applies(row, source):
+                        found[row[0]] = _verdict(row)
+        self.hits += len(found)
+        self.misses += len(mints) - len(found)
+        return found
+
+    def record(self, mint, passed, reasons=(), source='vetting', snapshot=None):
+        """Store a verdict; returns False when its class is not worth keeping (TTL 0)"""
+        reasons = list(reasons)
+        reason = None if passed else (reasons[0] if reasons else None)
+        klass = 'pass' if passed else reason_class(reason)
+        ttl = self.reason_ttls.get(reason, self.ttls.get(klass, 0))
+        if ttl <= 0:
+            return False
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (mint, int(passed), reason, klass, json.dumps(reasons), source,
+                     json.dumps(snapshot, default=str) if snapshot else None, now, now + ttl)
+                )
+            return True
+        except sqlite3.Error as e:
+            cprint(f"⚠️ Kali Intelligence: Could not store verdict for {mint[-6:]}: {e}", 'yellow')
+            return False
+
+    def purge_expired(self):
+        """Delete expired rows; returns how many were removed"""
+        with self._lock:
+            return self._conn.execute("DELETE FROM verdicts WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self):
+        with self._lock:
+            live = self._conn.execute("SELECT COUNT(*) FROM verdicts WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'live_verdicts': live,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Shared store for the whole process
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_verdict_store():
+    """Return the process-wide VerdictStore"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = VerdictStore()
+                _shared_store.purge_expired()
+    return _shared_store
+
+
+def check():
+    """Source scoping self-test on a throwaway database; returns the number of failures"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VerdictStore(os.path.join(tmp, 'verdicts.db'), ttls={'pass': 60, 'permanent': 60, 'authority': 60, 'market': 60}, reason_ttls={})
+        store.record('ScannerActivity', False, ['min_trades'], 'scanner')
+        store.record('ScannerHolders', False, ['top_holder_percent'], 'scanner')
+        store.record('ScannerHoneypot', False, ['honeypot'], 'scanner')
+        store.record('ScannerMintable', False, ['mintable'], 'scanner')
+        store.record('ScannerPass', True, [], 'scanner')
+        cases = [
+            ('ScannerActivity', 'vetting', False), ('ScannerActivity', 'scanner', True),
+            ('ScannerHolders', 'vetting', False), ('ScannerHoneypot', 'vetting', True),
+            ('ScannerMintable', 'vetting', True), ('ScannerPass', 'vetting', False),
+            ('ScannerPass', 'scanner', True),
+        ]
+        many = store.lookup_many([mint for mint, _, _ in cases], source='vetting')
+        failures = 0
+        for mint, source, expected in cases:
+            if (store.lookup(mint, source) is not None) != expected:
+                cprint(f"❌ lookup({mint}, {source}) should {'' if expected else 'not '}find a verdict", 'red')
+                failures += 1
+            if source == 'vetting' and (mint in many) != expected:
+                cprint(f"❌ lookup_many(..., {source}) disagrees with lookup for {mint}", 'red')
+                failures += 1
+        store.close()
+    cprint(f"🧪 Kali Intelligence: Verdict store scoping - {len(cases)} cases, {failures} failures", 'green' if not failures else 'red')
+    return failures
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        sys.exit(1 if check() else 0)
+    else:
+        print("Usage:")
+        print("  python verdict_store.py check   # Which stored verdicts count for which source")
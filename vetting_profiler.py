@@ -0,0 +1,133 @@
+# vetting_profiler.py - Kali Intelligence: Per-Stage Vetting Profiler
+import json
+import math
+import os
+import threading
+import time
+from termcolor import cprint
+from config import *
+
+# Rejection code -> category shown by `intelligence_manager.py stats`
+REASON_CATEGORIES = {
+    'blacklisted_deployer': 'deployer',
+    'min_liquidity': 'liquidity',
+    'max_market_cap': 'liquidity',
+    'token_too_old': 'age',
+    'old_token_no_age': 'age',
+    'fetch_error': 'data',
+    'no_data': 'data',
+}
+
+
+def reason_category(code):
+    """security / liquidity / deployer / age / data for a rejection code (unknown codes: other)"""
+    if not code or code == 'INTELLIGENCE_REJECTED':
+        return 'other'
+    return REASON_CATEGORIES.get(code, 'security')
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (q in 0..100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+class VettingProfiler:
+    """
+    Appends one JSON line per vetted token to VETTING_PROFILE_FILE:
+
+        {"ts", "token", "verdict", "reason", "reasons", "total_seconds",
+         "stages": {name: seconds}, "fetches": {source: {"seconds", "attempts", "status", "cancelled"}}}
+
+    verdict is pass / reject / deferred / cached. `intelligence_manager.py
+    profile` reads the file back and reports percentiles per stage.
+    """
+
+    def __init__(self, path=VETTING_PROFILE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        try:
+            line = json.dumps(record, default=str)
+            with self._lock:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path, 'a') as f:
+                    f.write(line + '\n')
+        except Exception as e:
+            cprint(f"⚠️ Kali Intelligence: Could not write vetting profile: {e}", 'yellow')
+
+    def load(self, hours=24):
+        """Records from the last `hours` hours (malformed lines are skipped)"""
+        records = []
+        if not os.path.exists(self.path):
+            return records
+        cutoff = time.time() - hours * 3600
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('ts', 0) >= cutoff:
+                    records.append(record)
+        return records
+
+    @staticmethod
+    def summarize(records):
+        """Percentiles per stage / fetch, verdict counts and failing rules"""
+        stage_times, fetch_times, fetch_attempts, totals = {}, {}, {}, []
+        verdicts, rules = {}, {}
+        for record in records:
+            verdict = record.get('verdict')
+            verdicts[verdict] = verdicts.get(verdict, 0) + 1
+            if verdict == 'reject':
+                rule = record.get('reason') or 'unknown'
+                rules[rule] = rules.get(rule, 0) + 1
+            if verdict == 'cached':
+                continue  # No stages ran
+            totals.append(record.get('total_seconds', 0.0))
+            for name, seconds in (record.get('stages') or {}).items():
+                stage_times.setdefault(name, []).append(seconds)
+            for source, fetch in (record.get('fetches') or {}).items():
+                if fetch.get('cancelled') or 'seconds' not in fetch:
+                    continue  # Cut short by an earlier rejection (or recorded before it finished)
+                fetch_times.setdefault(source, []).append(fetch.get('seconds', 0.0))
+                fetch_attempts.setdefault(source, []).append(fetch.get('attempts', 0))
+
+        def quantiles(values):
+            return {
+                'count': len(values),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'p99': percentile(values, 99),
+                'max': max(values) if values else 0.0
+            }
+
+        return {
+            'tokens': len(records),
+            'verdicts': verdicts,
+            'total': quantiles(totals),
+            'stages': {name: quantiles(values) for name, values in stage_times.items()},
+            'fetches': {
+                source: dict(quantiles(values),
+                             avg_attempts=sum(fetch_attempts[source]) / len(fetch_attempts[source]),
+                             max_attempts=max(fetch_attempts[source]))
+                for source, values in fetch_times.items()
+            },
+            'rules': dict(sorted(rules.items(), key=lambda item: -item[1]))
+        }
+
+
+# Shared profiler for the whole process
+_shared_profiler = None
+
+def get_vetting_profiler():
+    """Return the process-wide VettingProfiler"""
+    global _shared_profiler
+    if _shared_profiler is None:
+        _shared_profiler = VettingProfiler()
+    return _shared_profiler
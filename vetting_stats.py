@@ -0,0 +1,219 @@
+# vetting_stats.py - Kali Intelligence: Adaptive Vetting Stage Ordering
+import json
+import os
+import threading
+from collections import namedtuple
+from termcolor import cprint
+from config import *
+
+# One unit of the vetting pipeline: an async check over the shared context
+# and the data sources it needs (a source is only paid for once per token)
+VettingStage = namedtuple('VettingStage', ['name', 'run', 'sources'])
+
+
+class VettingStats:
+    """
+    Per-stage latency, API cost and rejection rate, plus per-rule rejection
+    counts, learned from every vetting run and persisted across restarts.
+
+    order() ranks stages greedily by
+        (marginal source cost + latency cost) / rejection probability
+    so cheap, selective checks run first; a stage whose data an earlier
+    stage already fetched costs nothing extra. expected_cost() scores an
+    order for the gate-then-concurrent pipeline used by token_vetting.py.
+    """
+
+    def __init__(self, path=VETTING_STATS_FILE, source_costs=VETTING_SOURCE_COSTS, latency_cost=VETTING_LATENCY_COST,
+                 gate_stages=VETTING_GATE_STAGES, gate_cost_ratio=VETTING_GATE_COST_RATIO, reorder_every=VETTING_REORDER_EVERY):
+        self.path = path
+        self.source_costs = source_costs
+        self.latency_cost = latency_cost
+        self.gate_stages = gate_stages
+        self.gate_cost_ratio = gate_cost_ratio
+        self.reorder_every = reorder_every
+        self.stages = {}  # name -> {'runs', 'rejects', 'deferred', 'latency'}
+        self.rules = {}  # rejection code -> count
+        self.vetted = 0
+        self.order_names = None  # Current adaptive order (None = declared order)
+        self.report = None
+        self._lock = threading.Lock()
+
+    # === Recording ===
+
+    def record_stage(self, name, verdict, latency):
+        with self._lock:
+            stage = self.stages.setdefault(name, {'runs': 0, 'rejects': 0, 'deferred': 0, 'latency': 0.0})
+            if verdict is None:
+                stage['deferred'] += 1
+                return
+            stage['runs'] += 1
+            stage['latency'] += latency
+            if not verdict:
+                stage['rejects'] += 1
+
+    def record_vetting(self, reasons):
+        """One finished vetting run; returns True when it is time to reorder"""
+        with self._lock:
+            for code in reasons:
+                self.rules[code] = self.rules.get(code, 0) + 1
+            self.vetted += 1
+            return self.reorder_every > 0 and self.vetted % self.reorder_every == 0
+
+    # === Estimates ===
+
+    def reject_rate(self, name):
+        """Rejections per run, smoothed so an unseen stage starts at 50%"""
+        stage = self.stages.get(name, {})
+        return (stage.get('rejects', 0) + 1) / (stage.get('runs', 0) + 2)
+
+    def latency(self, name):
+        stage = self.stages.get(name, {})
+        runs = stage.get('runs', 0)
+        return stage.get('latency', 0.0) / runs if runs else 0.0
+
+    def _source_cost(self, sources, paid):
+        return sum(self.source_costs.get(source, 0) for source in set(sources) - paid)
+
+    def order(self, stages):
+        """Stages sorted cheapest-and-most-selective first (declared order if adaptive ordering is off)"""
+        if not VETTING_ADAPTIVE_ORDER:
+            return list(stages)
+        remaining = list(stages)
+        ordered = []
+        paid = set()
+        while remaining:
+            def rank(stage):
+                cost = self._source_cost(stage.sources, paid) + self.latency_cost * self.latency(stage.name)
+                return cost / self.reject_rate(stage.name)
+            best = min(remaining, key=rank)  # min() keeps declared order on ties
+            remaining.remove(best)
+            ordered.append(best)
+            paid.update(best.sources)
+        return ordered
+
+    def split_gate(self, stages):
+        """
+        (gate, tail): up to gate_stages leading stages that run one at a time
+        before the rest fan out. A stage only gates when its data costs
+        VETTING_GATE_COST_RATIO times less than everything after it (e.g. one
+        RPC read ahead of two Birdeye calls); otherwise serializing it would
+        add its latency to every token for little saving, so all fan out.
+        """
+        stages = list(stages)
+        paid = set()
+        gate = 0
+        while gate < min(self.gate_stages, len(stages) - 1):
+            stage = stages[gate]
+            cost = self._source_cost(stage.sources, paid)
+            rest = self._source_cost([source for later in stages[gate + 1:] for source in later.sources], paid | set(stage.sources))
+            if cost * self.gate_cost_ratio > rest:
+                break
+            paid.update(stage.sources)
+            gate += 1
+        return stages[:gate], stages[gate:]
+
+    def expected_cost(self, stages):
+        """
+        (API cost units, seconds) expected per vetted token when the gate
+        stages (split_gate) run one after another and the rest run concurrently
+        """
+        gate, tail = self.split_gate(stages)
+        reach, paid, cost, latency = 1.0, set(), 0.0, 0.0
+        for stage in gate:
+            cost += reach * self._source_cost(stage.sources, paid)
+            latency += reach * self.latency(stage.name)
+            paid.update(stage.sources)
+            reach *= 1 - self.reject_rate(stage.name)
+        if tail:
+            cost += reach * self._source_cost([source for stage in tail for source in stage.sources], paid)
+            latency += reach * max(self.latency(stage.name) for stage in tail)
+        return cost, latency
+
+    def reorder(self, stages):
+        """Recompute the adaptive order and the before/after cost report"""
+        with self._lock:
+            declared = list(stages)
+            adaptive = self.order(declared)
+            before_cost, before_latency = self.expected_cost(declared)
+            after_cost, after_latency = self.expected_cost(adaptive)
+            self.order_names = [stage.name for stage in adaptive]
+            self.report = {
+                'vetted': self.vetted,
+                'declared_order': [stage.name for stage in declared],
+                'adaptive_order': self.order_names,
+                'expected_cost_before': before_cost,
+                'expected_cost_after': after_cost,
+                'expected_latency_before': before_latency,
+                'expected_latency_after': after_latency,
+                'stages': {
+                    stage.name: {
+                        'reject_rate': self.reject_rate(stage.name),
+                        'avg_latency': self.latency(stage.name),
+                        'source_cost': self._source_cost(stage.sources, set())
+                    } for stage in declared
+                }
+            }
+        cprint(f"🧮 Kali Intelligence: Stage order {' > '.join(self.order_names)} | "
+               f"expected cost {before_cost:.1f} -> {after_cost:.1f} units/token, "
+               f"latency {before_latency:.2f}s -> {after_latency:.2f}s", 'cyan')
+        return adaptive
+
+    def current_order(self, stages):
+        """Stages in the last computed order; stages it does not know go last in declared order"""
+        if not VETTING_ADAPTIVE_ORDER or not self.order_names:
+            return list(stages)
+        position = {name: i for i, name in enumerate(self.order_names)}
+        return sorted(stages, key=lambda stage: position.get(stage.name, len(position)))
+
+    # === Persistence ===
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'vetted': self.vetted,
+                'stages': {name: dict(stage) for name, stage in self.stages.items()},
+                'rules': dict(self.rules),
+                'order': self.order_names,
+                'report': self.report
+            }
+
+    def save(self, snapshot=None):
+        """Atomically write the statistics to disk"""
+        try:
+            snapshot = snapshot if snapshot is not None else self.snapshot()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_file = f"{self.path}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp_file, self.path)
+        except Exception as e:
+            cprint(f"⚠️ Kali Intelligence: Could not save vetting stats: {e}", 'yellow')
+
+    def load(self):
+        try:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.vetted = data.get('vetted', 0)
+            self.stages = data.get('stages', {})
+            self.rules = data.get('rules', {})
+            self.order_names = data.get('order')
+            self.report = data.get('report')
+        except Exception as e:
+            cprint(f"⚠️ Kali Intelligence: Could not load vetting stats: {e}", 'yellow')
+
+
+# Shared statistics for the whole process
+_shared_stats = None
+_shared_stats_lock = threading.Lock()
+
+def get_vetting_stats():
+    """Return the process-wide VettingStats, loading the last snapshot on first use"""
+    global _shared_stats
+    if _shared_stats is None:
+        with _shared_stats_lock:
+            if _shared_stats is None:
+                _shared_stats = VettingStats()
+                _shared_stats.load()
+    return _shared_stats
@@ -0,0 +1,143 @@
+# work_queue.py - Kali Speed Engine: Bounded Pool Work Queue With Backpressure
+import asyncio
+import time
+from collections import deque
+from termcolor import cprint
+from config import *
+
+
+class PoolWorkQueue:
+    """
+    Bounded async work queue feeding a fixed number of pool workers.
+
+    - Newest events are served first (LIFO): a fresh pool is worth more than
+      one that has been waiting through a launch wave.
+    - When the queue is full the oldest waiting event is dropped.
+    - Events older than max_age when a worker picks them up are shed.
+    """
+
+    def __init__(self, handler, workers=SPEED_ENGINE_WORKERS, max_depth=SPEED_ENGINE_QUEUE_MAX, max_age=SPEED_ENGINE_EVENT_MAX_AGE):
+        self.handler = handler  # async callable taking one PoolCreationEvent
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_age = max_age
+        self._items = deque()  # (event, enqueued_at)
+        self._available = None
+        self._progress = None  # Set whenever a worker takes or finishes an event
+        self._tasks = []
+        self.running = 0  # Events a worker is handling right now
+
+        # Metrics
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped_overflow = 0
+        self.shed_stale = 0
+        self.peak_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def start(self):
+        """Spawn the worker tasks (must be called from the running loop)"""
+        self._available = asyncio.Semaphore(0)
+        self._progress = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        cprint(f"👷 Kali Speed Engine: {self.workers} pool workers started (queue limit {self.max_depth})", 'cyan')
+
+    async def stop(self):
+        """Cancel all workers"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, event):
+        """Queue an event without blocking; sheds the oldest entry when full"""
+        if len(self._items) >= self.max_depth:
+            dropped_event, _ = self._items.popleft()
+            self.dropped_overflow += 1
+            cprint(f"⚠️ Kali Speed Engine: Queue full, dropping oldest event {dropped_event.signature[:8]}...", 'yellow')
+
+        self._items.append((event, time.time()))
+        self.enqueued += 1
+        self.peak_depth = max(self.peak_depth, len(self._items))
+        self._available.release()
+
+    def depth(self):
+        return len(self._items)
+
+    def idle(self):
+        """Nothing queued and no handler running"""
+        return not self._items and self.running == 0
+
+    async def _wait_progress(self):
+        self._progress.clear()
+        await self._progress.wait()
+
+    async def wait_for_room(self):
+        """Backpressure for producers that can wait (replays): block while the queue is full"""
+        while len(self._items) >= self.max_depth:
+            await self._wait_progress()
+
+    async def wait_idle(self):
+        """Block until every queued event has been handled"""
+        while not self.idle():
+            await self._wait_progress()
+
+    def _is_stale(self, event, now):
+        detected_at = getattr(event, 'detected_at', None)
+        if getattr(event, 'stale', False):
+            # Backfilled after an outage: detected_at is the block time
+            if not BACKFILL_ACT_ON_STALE:
+                return True
+            return detected_at is not None and now - detected_at > BACKFILL_EVENT_MAX_AGE
+        return detected_at is not None and now - detected_at > self.max_age
+
+    async def _worker(self, worker_id):
+        while True:
+            await self._available.acquire()
+            if not self._items:
+                # The entry this permit was issued for was dropped on overflow
+                continue
+
+            event, enqueued_at = self._items.pop()
+            self._progress.set()
+            now = time.time()
+            wait = now - enqueued_at
+            self.last_wait = wait
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+            if self._is_stale(event, now):
+                self.shed_stale += 1
+                cprint(f"⏭️ Kali Speed Engine: Shedding stale event {event.signature[:8]}... ({now - event.detected_at:.1f}s old)", 'yellow')
+                continue
+
+            self.running += 1
+            try:
+                await self.handler(event)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                cprint(f"❌ Kali Speed Engine: Worker {worker_id} error: {e}", 'red')
+            finally:
+                self.running -= 1
+                self._progress.set()
+
+    def stats(self):
+        """Queue depth and wait-time metrics"""
+        dequeued = self.processed + self.failed + self.shed_stale
+        return {
+            'depth': len(self._items),
+            'running': self.running,
+            'peak_depth': self.peak_depth,
+            'enqueued': self.enqueued,
+            'processed': self.processed,
+            'failed': self.failed,
+            'dropped_overflow': self.dropped_overflow,
+            'shed_stale': self.shed_stale,
+            'avg_wait': self.total_wait / dequeued if dequeued else 0.0,
+            'max_wait': self.max_wait,
+            'last_wait': self.last_wait
+        }